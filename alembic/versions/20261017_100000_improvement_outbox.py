@@ -0,0 +1,43 @@
+"""
+Add transactional outbox for improvement jobs
+
+Revision ID: 20261017_100000
+Revises: 20250903_200500
+Create Date: 2026-10-17 10:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql as psql
+
+revision = "20261017_100000"
+down_revision = "20250903_200500"
+branch_labels = None
+depends_on = None
+
+
+def _uuid_type():
+    if op.get_bind().dialect.name == "postgresql":
+        return psql.UUID(as_uuid=True)
+    return sa.CHAR(length=36)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outboxmessage",
+        sa.Column("id", _uuid_type(), nullable=False),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("improvement_id", _uuid_type(), nullable=False),
+        sa.Column("task_id", sa.String(length=100), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["improvement_id"], ["resumeimprovement.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_outbox_created", "outboxmessage", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_created", table_name="outboxmessage")
+    op.drop_table("outboxmessage")
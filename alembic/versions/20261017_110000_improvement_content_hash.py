@@ -0,0 +1,97 @@
+"""
+Add content_hash to improvements with a partial unique index for dedup
+
+Revision ID: 20261017_110000
+Revises: 20261017_100000
+Create Date: 2026-10-17 11:00:00
+"""
+
+import hashlib
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261017_110000"
+down_revision = "20261017_100000"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+ACTIVE = ("queued", "processing")
+
+improvements = sa.table(
+    "resumeimprovement",
+    sa.column("id"),
+    sa.column("resume_id"),
+    sa.column("status", sa.String),
+    sa.column("old_content", sa.Text),
+    sa.column("content_hash", sa.String),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+)
+
+
+def _backfill() -> None:
+    """Hash old_content in keyset-ordered batches.
+
+    Only the oldest active job per resume/content keeps its hash. Active
+    duplicates created while dedup was disabled keep NULL, so the unique index
+    can be built.
+    """
+    bind = op.get_bind()
+    seen_active = set()
+    last = None
+    while True:
+        q = (
+            sa.select(
+                improvements.c.id,
+                improvements.c.resume_id,
+                improvements.c.status,
+                improvements.c.old_content,
+                improvements.c.created_at,
+            )
+            .order_by(improvements.c.created_at, improvements.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last is not None:
+            q = q.where(sa.tuple_(improvements.c.created_at, improvements.c.id) > last)
+        rows = bind.execute(q).all()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            digest = hashlib.sha256(row.old_content.encode("utf-8")).hexdigest()
+            if row.status in ACTIVE:
+                key = (str(row.resume_id), digest)
+                if key in seen_active:
+                    continue
+                seen_active.add(key)
+            updates.append({"b_id": row.id, "b_hash": digest})
+        if updates:
+            bind.execute(
+                improvements.update()
+                .where(improvements.c.id == sa.bindparam("b_id"))
+                .values(content_hash=sa.bindparam("b_hash")),
+                updates,
+            )
+        last = (rows[-1].created_at, rows[-1].id)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "resumeimprovement", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+    _backfill()
+    where = sa.text("status IN ('queued', 'processing')")
+    op.create_index(
+        "uq_improvements_active_content",
+        "resumeimprovement",
+        ["resume_id", "content_hash"],
+        unique=True,
+        postgresql_where=where,
+        sqlite_where=where,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_improvements_active_content", table_name="resumeimprovement")
+    op.drop_column("resumeimprovement", "content_hash")
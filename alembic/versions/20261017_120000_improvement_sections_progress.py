@@ -0,0 +1,25 @@
+"""
+Add section progress counters to improvements
+
+Revision ID: 20261017_120000
+Revises: 20261017_110000
+Create Date: 2026-10-17 12:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261017_120000"
+down_revision = "20261017_110000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("resumeimprovement", sa.Column("sections_total", sa.Integer(), nullable=True))
+    op.add_column("resumeimprovement", sa.Column("sections_done", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("resumeimprovement", "sections_done")
+    op.drop_column("resumeimprovement", "sections_total")
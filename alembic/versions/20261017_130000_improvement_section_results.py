@@ -0,0 +1,23 @@
+"""
+Add per-section result memo to improvements
+
+Revision ID: 20261017_130000
+Revises: 20261017_120000
+Create Date: 2026-10-17 13:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261017_130000"
+down_revision = "20261017_120000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("resumeimprovement", sa.Column("section_results", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("resumeimprovement", "section_results")
@@ -0,0 +1,26 @@
+"""
+Add superseded improvement status
+
+Revision ID: 20261017_140000
+Revises: 20261017_130000
+Create Date: 2026-10-17 14:00:00
+"""
+
+from alembic import op
+
+revision = "20261017_140000"
+down_revision = "20261017_130000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The initial migration created a native enum on PostgreSQL; other backends store VARCHAR
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE improvement_status ADD VALUE IF NOT EXISTS 'superseded'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop enum values; move rows back to a pre-existing status instead
+    op.execute("UPDATE resumeimprovement SET status = 'failed' WHERE status = 'superseded'")
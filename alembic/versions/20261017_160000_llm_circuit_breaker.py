@@ -0,0 +1,31 @@
+"""
+Add shared circuit breaker state
+
+Revision ID: 20261017_160000
+Revises: 20261017_150000
+Create Date: 2026-10-17 16:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261017_160000"
+down_revision = "20261017_150000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "circuitbreakerstate",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("failures", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("open_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("probe_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("circuitbreakerstate")
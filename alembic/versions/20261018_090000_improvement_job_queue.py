@@ -0,0 +1,39 @@
+"""
+Add lease and attempt columns for the database job queue
+
+Revision ID: 20261018_090000
+Revises: 20261017_160000
+Create Date: 2026-10-18 09:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20261018_090000"
+down_revision = "20261017_160000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "resumeimprovement", sa.Column("lease_until", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "resumeimprovement",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    where = sa.text("status IN ('queued', 'processing')")
+    op.create_index(
+        "ix_improvements_runnable",
+        "resumeimprovement",
+        ["created_at"],
+        postgresql_where=where,
+        sqlite_where=where,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_improvements_runnable", table_name="resumeimprovement")
+    op.drop_column("resumeimprovement", "attempts")
+    op.drop_column("resumeimprovement", "lease_until")
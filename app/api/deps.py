@@ -3,14 +3,18 @@ from __future__ import annotations
 """Reusable FastAPI dependencies (auth, UoW, etc.)."""
 
 import logging
-from typing import Optional
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
 
 from fastapi import Depends, Header, HTTPException, status
 
+from app.core.auth_cache import CurrentUser, auth_cache
+from app.core.config import settings
 from app.core.jwt import decode_token
 from app.middleware.request_id import set_user_id
-from app.models import User
 from app.uow import UnitOfWork, get_uow
+from app.utils.pagination import decode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -31,37 +35,72 @@ def get_authorization_token(authorization: Optional[str] = Header(default=None))
     return parts[1]
 
 
-async def get_current_user(
-    uow: UnitOfWork = Depends(get_uow), token: str = Depends(get_authorization_token)
-) -> User:
-    """Resolve the current authenticated user from a JWT access token.
+def _unauthorized(message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail={"code": "unauthorized", "message": message},
+    )
 
-    Returns the `User` instance or raises 401 if token is invalid or user not found.
-    Also stores `user_id` in logging context for structured logs.
-    """
+
+def _verify_access_token(token: str) -> str:
+    """Return the subject of a valid access token, verifying its signature at most once."""
+    sub = auth_cache.get_subject(token)
+    if sub is not None:
+        return sub
     try:
         payload = decode_token(token)
         sub = payload.get("sub")
         ttype = payload.get("type")
         if not sub or ttype != "access":
             raise ValueError("invalid token claims")
+        uuid.UUID(str(sub))
     except Exception:
         logger.warning("Invalid or expired token")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={"code": "unauthorized", "message": "Invalid or expired token"},
-        )
+        raise _unauthorized("Invalid or expired token")
+    auth_cache.put_subject(token, sub, payload["exp"])
+    return sub
 
-    user = await uow.users.get_by_id(sub)
-    if not user:
-        logger.warning("User not found for token", extra={"user_id": sub})
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={"code": "unauthorized", "message": "User not found"},
-        )
+
+async def get_current_user(
+    uow: UnitOfWork = Depends(get_uow), token: str = Depends(get_authorization_token)
+) -> CurrentUser:
+    """Resolve the current authenticated user from a JWT access token.
+
+    Returns the caller's `CurrentUser` identity or raises 401 if the token is
+    invalid or the user does not exist. Verified tokens and identities are
+    served from `auth_cache`. With ``AUTH_STATELESS`` the token claims are
+    trusted and the database is never queried. Also stores `user_id` in the
+    logging context for structured logs.
+    """
+    sub = _verify_access_token(token)
+
+    user = auth_cache.get_user(sub)
+    if user is None:
+        if settings.AUTH_STATELESS:
+            user = CurrentUser(id=uuid.UUID(sub))
+        else:
+            db_user = await uow.users.get_by_id(sub)
+            if not db_user:
+                logger.warning("User not found for token", extra={"user_id": sub})
+                raise _unauthorized("User not found")
+            user = CurrentUser(id=db_user.id)
+        auth_cache.put_user(user)
     # propagate user id to logging context
     try:
         set_user_id(str(user.id))
     except Exception:
         pass
     return user
+
+
+def parse_cursor_param(cursor: Optional[str]) -> Optional[Tuple[datetime, uuid.UUID]]:
+    """Decode an opaque keyset cursor query parameter or raise 400."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "invalid_cursor", "message": "Invalid pagination cursor"},
+        )
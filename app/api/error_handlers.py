@@ -39,7 +39,9 @@ def install_error_handlers(app: FastAPI) -> None:
             )
         except Exception:
             pass
-        return JSONResponse(status_code=exc.status_code, content=payload)
+        return JSONResponse(
+            status_code=exc.status_code, content=payload, headers=getattr(exc, "headers", None)
+        )
 
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(
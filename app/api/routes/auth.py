@@ -6,13 +6,32 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.core.config import settings
 from app.core.jwt import create_access_token
-from app.core.security import hash_password, verify_password
+from app.core.security import PasswordHasherBusy, hash_password_async, verify_password_async
 from app.schemas import ErrorResponse, LoginRequest, RegisterRequest, TokenResponse, UserOut
 from app.uow import UnitOfWork, get_uow
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 logger = logging.getLogger(__name__)
 
+_BUSY_RESPONSE = {
+    "model": ErrorResponse,
+    "description": "Password hashing is overloaded, retry later",
+    "content": {
+        "application/json": {
+            "example": {"error": {"code": "too_many_requests", "message": "Server is busy"}}
+        }
+    },
+}
+
+
+def _busy() -> HTTPException:
+    logger.warning("Password hashing queue is full; request shed")
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={"code": "too_many_requests", "message": "Server is busy, retry later"},
+        headers={"Retry-After": "1"},
+    )
+
 
 @router.post(
     "/register",
@@ -21,6 +40,7 @@ logger = logging.getLogger(__name__)
     summary="Register a new user",
     description="Create a new user account with an email and password.",
     responses={
+        429: _BUSY_RESPONSE,
         409: {
             "model": ErrorResponse,
             "description": "Email is already taken",
@@ -29,7 +49,7 @@ logger = logging.getLogger(__name__)
                     "example": {"error": {"code": "conflict", "message": "Email is already taken"}}
                 }
             },
-        }
+        },
     },
 )
 async def register(payload: RegisterRequest, uow: UnitOfWork = Depends(get_uow)):
@@ -42,9 +62,11 @@ async def register(payload: RegisterRequest, uow: UnitOfWork = Depends(get_uow))
             detail={"code": "conflict", "message": "Email is already taken"},
         )
 
-    user = await uow.users.create(
-        email=payload.email, password_hash=hash_password(payload.password)
-    )
+    try:
+        password_hash = await hash_password_async(payload.password)
+    except PasswordHasherBusy:
+        raise _busy()
+    user = await uow.users.create(email=payload.email, password_hash=password_hash)
     await uow.commit()
     logger.info("User registered", extra={"user_id": str(user.id), "email": user.email})
     return UserOut(id=str(user.id), email=user.email, created_at=user.created_at)
@@ -56,6 +78,7 @@ async def register(payload: RegisterRequest, uow: UnitOfWork = Depends(get_uow))
     summary="Login and get access token",
     description="Authenticate with email and password and receive a JWT access token.",
     responses={
+        429: _BUSY_RESPONSE,
         401: {
             "model": ErrorResponse,
             "description": "Invalid credentials",
@@ -64,18 +87,29 @@ async def register(payload: RegisterRequest, uow: UnitOfWork = Depends(get_uow))
                     "example": {"error": {"code": "unauthorized", "message": "Invalid credentials"}}
                 }
             },
-        }
+        },
     },
 )
 async def login(payload: LoginRequest, uow: UnitOfWork = Depends(get_uow)):
     """Authenticate user and return a bearer token."""
     user = await uow.users.get_by_email(payload.email)
-    if not user or not verify_password(payload.password, user.password_hash):
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_password_async(payload.password, user.password_hash)
+        except PasswordHasherBusy:
+            raise _busy()
+    if not valid:
         logger.warning("Login failed", extra={"email": payload.email})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={"code": "unauthorized", "message": "Invalid credentials"},
         )
+    if new_hash:
+        # Stored hash uses an outdated scheme or cost: upgrade it transparently
+        user.password_hash = new_hash
+        await uow.commit()
+        logger.info("Password hash upgraded", extra={"user_id": str(user.id)})
 
     token = create_access_token(subject=str(user.id), expires_in=settings.ACCESS_TOKEN_TTL)
     logger.info("Login success", extra={"user_id": str(user.id), "email": user.email})
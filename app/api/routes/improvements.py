@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import uuid
+from typing import AsyncIterator, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import get_current_user
-from app.celery_app.tasks import improve_resume_task
+from app.api.deps import get_current_user, parse_cursor_param
+from app.celery_app.db_queue import embedded_worker
+from app.celery_app.outbox import outbox_relay
+from app.core.auth_cache import CurrentUser
 from app.core.config import settings
-from app.models import User
+from app.db.notifications import improvement_status_hub, notify_improvement_status
+from app.models import ImprovementStatus
+from app.repositories.outbox import OUTBOX_KIND_ENQUEUE, OUTBOX_KIND_REVOKE
 from app.schemas import (
     ErrorResponse,
+    ImprovementCancelledResponse,
     ImprovementListItem,
     ImprovementListResponse,
     ImprovementOut,
@@ -18,6 +28,8 @@ from app.schemas import (
 from app.uow import UnitOfWork, get_uow
 from app.utils.pagination import parse_pagination
 
+TERMINAL_STATUSES = frozenset({"done", "failed", "superseded", "cancelled"})
+
 router = APIRouter(prefix="/resume", tags=["improvements"])
 alt_router = APIRouter(tags=["improvements"])  # for /improvements/{id}
 logger = logging.getLogger(__name__)
@@ -28,57 +40,103 @@ logger = logging.getLogger(__name__)
     response_model=ImprovementQueuedResponse,
     status_code=status.HTTP_202_ACCEPTED,
     summary="Enqueue resume improvement",
-    description="Queue an asynchronous improvement job for the given resume.",
+    description=(
+        "Queue an asynchronous improvement job for the given resume. Older improvements of "
+        "the resume that are still queued become `superseded` and are never processed."
+    ),
     responses={
         404: {"model": ErrorResponse, "description": "Resume not found"},
         409: {"model": ErrorResponse, "description": "Duplicate improvement in progress"},
     },
 )
 async def enqueue_improvement(
-    resume_id: str, uow: UnitOfWork = Depends(get_uow), user: User = Depends(get_current_user)
+    resume_id: str,
+    uow: UnitOfWork = Depends(get_uow),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    resume = await uow.resumes.get_owned(resume_id, str(user.id))
-    if not resume:
-        logger.warning("Resume not found for improvement enqueue", extra={"resume_id": resume_id})
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={"code": "not_found", "message": "Resume not found"},
-        )
-
-    # Optional idempotency: reject duplicate queued/processing improvement for same content
-    if settings.IMPROVEMENT_DEDUP_ENABLED:
-        dup = await uow.improvements.find_active_duplicate(str(resume.id), resume.content)
-        if dup:
+    # Ownership check, dedup guard and insert (with the pre-generated task id) in one statement
+    uses_broker = settings.IMPROVEMENT_BACKEND == "celery"
+    task_id = str(uuid.uuid4()) if uses_broker else None
+    dedup = settings.IMPROVEMENT_DEDUP_ENABLED
+    improvement_id = await uow.improvements.enqueue_owned(
+        resume_id, str(user.id), task_id, dedup=dedup
+    )
+    if improvement_id is None:
+        await uow.rollback()
+        if not await uow.resumes.is_owned(resume_id, str(user.id)):
             logger.warning(
-                "Duplicate improvement detected",
-                extra={"resume_id": str(resume.id), "improvement_id": str(dup.id)},
+                "Resume not found for improvement enqueue", extra={"resume_id": resume_id}
             )
             raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "code": "duplicate",
-                    "message": "Improvement already queued or processing for this content",
-                },
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"code": "not_found", "message": "Resume not found"},
             )
+        # Same content already queued or processing (unique active-content index)
+        logger.warning("Duplicate improvement rejected", extra={"resume_id": resume_id})
+        raise _duplicate()
 
-    improvement = await uow.improvements.create_queued(
-        resume_id=str(resume.id), old_content=resume.content
-    )
-    await uow.commit()
-
-    async_result = improve_resume_task.delay(str(improvement.id))
-    await uow.improvements.set_task_id(improvement, async_result.id)
+    if settings.IMPROVEMENT_SUPERSEDE_ENABLED:
+        await _supersede_queued(uow, resume_id, keep=str(improvement_id))
+    if uses_broker:
+        # Job and its outbox message commit atomically; the relay publishes to the broker.
+        await uow.outbox.add(OUTBOX_KIND_ENQUEUE, str(improvement_id), task_id)
+    else:
+        # The row is the queue; the notification wakes idle job queue workers on commit
+        await notify_improvement_status(uow.session, str(improvement_id), ImprovementStatus.queued)
     await uow.commit()
+    if uses_broker:
+        await _relay_outbox()
+    elif settings.IMPROVEMENT_BACKEND == "embedded":
+        embedded_worker.notify()
     logger.info(
         "Improvement enqueued",
         extra={
-            "resume_id": str(resume.id),
-            "improvement_id": str(improvement.id),
-            "task_id": async_result.id,
+            "resume_id": resume_id,
+            "improvement_id": str(improvement_id),
+            "task_id": task_id,
         },
     )
 
-    return {"improvement_id": str(improvement.id), "status": improvement.status.value}
+    return {"improvement_id": str(improvement_id), "status": ImprovementStatus.queued.value}
+
+
+async def _supersede_queued(uow: UnitOfWork, resume_id: str, keep: str) -> None:
+    """Supersede older still-queued jobs of the resume and queue revokes of their tasks."""
+    for row in await uow.improvements.supersede_queued(resume_id, keep=keep):
+        if row.task_id:
+            await uow.outbox.add(OUTBOX_KIND_REVOKE, str(row.id), row.task_id)
+        await notify_improvement_status(uow.session, str(row.id), ImprovementStatus.superseded)
+        logger.info(
+            "Improvement superseded",
+            extra={"resume_id": resume_id, "improvement_id": str(row.id)},
+        )
+
+
+async def _relay_outbox() -> None:
+    """Hand just-committed outbox messages to the relay.
+
+    In eager mode there is no relay loop, so the batch is published inline and
+    the job runs within the request. The messages are already committed, so a
+    publish error is logged and the rows stay in the outbox for a later drain.
+    """
+    if not settings.CELERY_TASK_ALWAYS_EAGER:
+        outbox_relay.notify()
+        return
+    try:
+        await outbox_relay.drain_once()
+    except Exception:
+        logger.exception("Inline outbox relay failed; messages stay in the outbox")
+        outbox_relay.notify()
+
+
+def _duplicate() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "code": "duplicate",
+            "message": "Improvement already queued or processing for this content",
+        },
+    )
 
 
 @router.get(
@@ -89,7 +147,9 @@ async def enqueue_improvement(
     responses={404: {"model": ErrorResponse, "description": "Improvement not found"}},
 )
 async def get_improvement(
-    improvement_id: str, uow: UnitOfWork = Depends(get_uow), user: User = Depends(get_current_user)
+    improvement_id: str,
+    uow: UnitOfWork = Depends(get_uow),
+    user: CurrentUser = Depends(get_current_user),
 ):
     return await _get_improvement_impl(improvement_id, uow, user)
 
@@ -98,12 +158,16 @@ async def get_improvement(
     "/improvements/{improvement_id}", response_model=ImprovementOut, include_in_schema=False
 )
 async def get_improvement_no_prefix(
-    improvement_id: str, uow: UnitOfWork = Depends(get_uow), user: User = Depends(get_current_user)
+    improvement_id: str,
+    uow: UnitOfWork = Depends(get_uow),
+    user: CurrentUser = Depends(get_current_user),
 ):
     return await _get_improvement_impl(improvement_id, uow, user)
 
 
-async def _get_improvement_impl(improvement_id: str, uow: UnitOfWork, user: User) -> ImprovementOut:
+async def _get_improvement_impl(
+    improvement_id: str, uow: UnitOfWork, user: CurrentUser
+) -> ImprovementOut:
     imp = await uow.improvements.get_owned(improvement_id, str(user.id))
     if not imp:
         logger.warning(
@@ -125,21 +189,187 @@ async def _get_improvement_impl(improvement_id: str, uow: UnitOfWork, user: User
         created_at=imp.created_at,
         started_at=imp.started_at,
         finished_at=imp.finished_at,
+        sections_total=imp.sections_total,
+        sections_done=imp.sections_done,
     )
 
 
+@router.post(
+    "/improvements/{improvement_id}/cancel",
+    response_model=ImprovementCancelledResponse,
+    summary="Cancel improvement",
+    description=(
+        "Cancel a queued or processing improvement. Its Celery task is revoked and a "
+        "worker already running it aborts the LLM call."
+    ),
+    responses={
+        404: {"model": ErrorResponse, "description": "Improvement not found"},
+        409: {"model": ErrorResponse, "description": "Improvement already finished"},
+    },
+)
+async def cancel_improvement(
+    improvement_id: str,
+    uow: UnitOfWork = Depends(get_uow),
+    user: CurrentUser = Depends(get_current_user),
+):
+    return await _cancel_improvement_impl(improvement_id, uow, user)
+
+
+@alt_router.post(
+    "/improvements/{improvement_id}/cancel",
+    response_model=ImprovementCancelledResponse,
+    include_in_schema=False,
+)
+async def cancel_improvement_no_prefix(
+    improvement_id: str,
+    uow: UnitOfWork = Depends(get_uow),
+    user: CurrentUser = Depends(get_current_user),
+):
+    return await _cancel_improvement_impl(improvement_id, uow, user)
+
+
+async def _cancel_improvement_impl(
+    improvement_id: str, uow: UnitOfWork, user: CurrentUser
+) -> ImprovementCancelledResponse:
+    row = await uow.improvements.cancel_owned(improvement_id, str(user.id))
+    if row is None:
+        if not await uow.improvements.is_owned(improvement_id, str(user.id)):
+            logger.warning(
+                "Improvement not found for cancel",
+                extra={"improvement_id": improvement_id, "user_id": str(user.id)},
+            )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"code": "not_found", "message": "Improvement not found"},
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"code": "not_cancellable", "message": "Improvement already finished"},
+        )
+    if row.task_id:
+        await uow.outbox.add(OUTBOX_KIND_REVOKE, str(row.id), row.task_id)
+    # Delivered on commit; a worker running the job aborts its LLM call on this event
+    await notify_improvement_status(uow.session, str(row.id), ImprovementStatus.cancelled)
+    await uow.commit()
+    if settings.IMPROVEMENT_BACKEND == "celery":
+        await _relay_outbox()
+    logger.info(
+        "Improvement cancelled",
+        extra={"improvement_id": improvement_id, "task_id": row.task_id},
+    )
+    return ImprovementCancelledResponse(
+        improvement_id=str(row.id), status=ImprovementStatus.cancelled.value
+    )
+
+
+@router.get(
+    "/improvements/{improvement_id}/events",
+    summary="Stream improvement status",
+    description=(
+        "Server-Sent Events stream of status transitions "
+        "(queued → processing → done/failed/cancelled, or queued → superseded/cancelled). "
+        "The first event carries the current status; the stream ends on a terminal status."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "SSE stream"},
+        404: {"model": ErrorResponse, "description": "Improvement not found"},
+    },
+)
+async def stream_improvement_events(
+    improvement_id: str,
+    uow: UnitOfWork = Depends(get_uow),
+    user: CurrentUser = Depends(get_current_user),
+):
+    return await _stream_improvement_events_impl(improvement_id, uow, user)
+
+
+@alt_router.get("/improvements/{improvement_id}/events", include_in_schema=False)
+async def stream_improvement_events_no_prefix(
+    improvement_id: str,
+    uow: UnitOfWork = Depends(get_uow),
+    user: CurrentUser = Depends(get_current_user),
+):
+    return await _stream_improvement_events_impl(improvement_id, uow, user)
+
+
+async def _stream_improvement_events_impl(
+    improvement_id: str, uow: UnitOfWork, user: CurrentUser
+) -> StreamingResponse:
+    if not await uow.improvements.is_owned(improvement_id, str(user.id)):
+        logger.warning(
+            "Improvement not found for events",
+            extra={"improvement_id": improvement_id, "user_id": str(user.id)},
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "not_found", "message": "Improvement not found"},
+        )
+    # End the read transaction so the stream does not pin a pooled DB connection
+    await uow.rollback()
+    return StreamingResponse(
+        _improvement_events(improvement_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _improvement_events(improvement_id: str) -> AsyncIterator[str]:
+    """Yield SSE frames for status changes until a terminal status is reached."""
+    queue = improvement_status_hub.subscribe(improvement_id)
+    try:
+        # Snapshot once the feed listens so a transition in between is not lost
+        await improvement_status_hub.wait_ready(settings.IMPROVEMENT_EVENTS_HEARTBEAT)
+        event = await improvement_status_hub.snapshot(improvement_id)
+        if event is None:
+            return
+        last_status = event["status"]
+        yield _sse_frame(event)
+        while last_status not in TERMINAL_STATUSES:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=settings.IMPROVEMENT_EVENTS_HEARTBEAT
+                )
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event["status"] == last_status:
+                continue
+            last_status = event["status"]
+            yield _sse_frame(event)
+    finally:
+        improvement_status_hub.unsubscribe(improvement_id, queue)
+
+
+def _sse_frame(event: dict) -> str:
+    return f"event: status\ndata: {json.dumps(event)}\n\n"
+
+
 @router.get(
     "/{resume_id}/improvements",
     response_model=ImprovementListResponse,
     summary="List improvements for resume",
-    description="List improvement attempts for a resume with pagination.",
-    responses={404: {"model": ErrorResponse, "description": "Resume not found"}},
+    description=(
+        "List improvement attempts for a resume, newest first. Pass `cursor` (the "
+        "previous page's `next_cursor`) for keyset pagination; `offset` is kept for "
+        "compatibility."
+    ),
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid cursor"},
+        404: {"model": ErrorResponse, "description": "Resume not found"},
+    },
 )
 async def list_improvements(
     resume_id: str,
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
     limit: int = Query(20, ge=1, le=100, description="Max items to return (1-100)"),
     offset: int = Query(0, ge=0, description="Items to skip for pagination"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque keyset cursor (`next_cursor` of the previous page)"
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Count exact total (default: yes with offset, no with cursor)"
+    ),
     uow: UnitOfWork = Depends(get_uow),
 ):
     resume = await uow.resumes.get_owned(resume_id, str(user.id))
@@ -149,11 +379,21 @@ async def list_improvements(
             detail={"code": "not_found", "message": "Resume not found"},
         )
     limit, offset = parse_pagination(limit, offset)
-    rows, total = await uow.improvements.list_for_resume(str(resume.id), limit, offset)
+    after = parse_cursor_param(cursor)
+    with_total = include_total if include_total is not None else after is None
+    page = await uow.improvements.list_for_resume(
+        str(resume.id), limit, offset=offset, cursor=after, with_total=with_total
+    )
     items = [
         ImprovementListItem(
             id=str(r.id), status=r.status.value, applied=r.applied, created_at=r.created_at
         )
-        for r in rows
+        for r in page.items
     ]
-    return {"items": items, "total": total, "limit": limit, "offset": offset}
+    return {
+        "items": items,
+        "total": page.total,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": page.next_cursor,
+    }
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import logging
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from app.api.deps import get_current_user
-from app.models import User
+from app.api.deps import get_current_user, parse_cursor_param
+from app.core.auth_cache import CurrentUser
 from app.schemas import (
     ErrorResponse,
     ResumeCreate,
@@ -34,7 +35,7 @@ logger = logging.getLogger(__name__)
 async def create_resume(
     payload: ResumeCreate,
     uow: UnitOfWork = Depends(get_uow),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
     resume = await uow.resumes.create(
         user_id=str(user.id), title=payload.title, content=payload.content
@@ -54,23 +55,44 @@ async def create_resume(
     "",
     response_model=ResumeListResponse,
     summary="List resumes",
-    description="List resumes owned by the authenticated user with pagination.",
+    description=(
+        "List resumes owned by the authenticated user, newest first. Pass `cursor` "
+        "(the previous page's `next_cursor`) for keyset pagination; `offset` is kept "
+        "for compatibility."
+    ),
+    responses={400: {"model": ErrorResponse, "description": "Invalid cursor"}},
 )
 async def list_resumes(
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
     limit: int = Query(20, ge=1, le=100, description="Max items to return (1-100)"),
     offset: int = Query(0, ge=0, description="Items to skip for pagination"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque keyset cursor (`next_cursor` of the previous page)"
+    ),
+    include_total: Optional[bool] = Query(
+        None, description="Count exact total (default: yes with offset, no with cursor)"
+    ),
     uow: UnitOfWork = Depends(get_uow),
 ):
     limit, offset = parse_pagination(limit, offset)
-    rows, total = await uow.resumes.list_owned(user_id=str(user.id), limit=limit, offset=offset)
+    after = parse_cursor_param(cursor)
+    with_total = include_total if include_total is not None else after is None
+    page = await uow.resumes.list_owned(
+        user_id=str(user.id), limit=limit, offset=offset, cursor=after, with_total=with_total
+    )
     items = [
         ResumeListItem(
             id=str(r.id), title=r.title, created_at=r.created_at, updated_at=r.updated_at
         )
-        for r in rows
+        for r in page.items
     ]
-    return {"items": items, "total": total, "limit": limit, "offset": offset}
+    return {
+        "items": items,
+        "total": page.total,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": page.next_cursor,
+    }
 
 
 @router.get(
@@ -81,7 +103,9 @@ async def list_resumes(
     responses={404: {"model": ErrorResponse, "description": "Resume not found"}},
 )
 async def get_resume(
-    resume_id: str, uow: UnitOfWork = Depends(get_uow), user: User = Depends(get_current_user)
+    resume_id: str,
+    uow: UnitOfWork = Depends(get_uow),
+    user: CurrentUser = Depends(get_current_user),
 ):
     resume = await uow.resumes.get_owned(resume_id, str(user.id))
     if not resume:
@@ -112,10 +136,12 @@ async def update_resume(
     resume_id: str,
     payload: ResumeUpdate,
     uow: UnitOfWork = Depends(get_uow),
-    user: User = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    resume = await uow.resumes.get_owned(resume_id, str(user.id))
-    if not resume:
+    row = await uow.resumes.update_owned(
+        resume_id, str(user.id), title=payload.title, content=payload.content
+    )
+    if not row:
         logger.warning(
             "Resume not found for update", extra={"resume_id": resume_id, "user_id": str(user.id)}
         )
@@ -123,15 +149,14 @@ async def update_resume(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"code": "not_found", "message": "Resume not found"},
         )
-    resume = await uow.resumes.update(resume, title=payload.title, content=payload.content)
     await uow.commit()
-    logger.info("Resume updated", extra={"user_id": str(user.id), "resume_id": str(resume.id)})
+    logger.info("Resume updated", extra={"user_id": str(user.id), "resume_id": str(row.id)})
     return ResumeOut(
-        id=str(resume.id),
-        title=resume.title,
-        content=resume.content,
-        created_at=resume.created_at,
-        updated_at=resume.updated_at,
+        id=str(row.id),
+        title=payload.title,
+        content=payload.content,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
     )
 
 
@@ -143,10 +168,11 @@ async def update_resume(
     responses={404: {"model": ErrorResponse, "description": "Resume not found"}},
 )
 async def delete_resume(
-    resume_id: str, uow: UnitOfWork = Depends(get_uow), user: User = Depends(get_current_user)
+    resume_id: str,
+    uow: UnitOfWork = Depends(get_uow),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    resume = await uow.resumes.get_owned(resume_id, str(user.id))
-    if not resume:
+    if not await uow.resumes.delete_owned(resume_id, str(user.id)):
         logger.warning(
             "Resume not found for delete", extra={"resume_id": resume_id, "user_id": str(user.id)}
         )
@@ -154,7 +180,6 @@ async def delete_resume(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"code": "not_found", "message": "Resume not found"},
         )
-    await uow.resumes.delete(resume)
     await uow.commit()
     logger.info("Resume deleted", extra={"user_id": str(user.id), "resume_id": resume_id})
     return None
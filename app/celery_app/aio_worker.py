@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+"""Asyncio-native consumer for the improvement queue.
+
+The Celery prefork pool blocks one process per in-flight improvement while the
+coroutine waits on the LLM. This runtime consumes ``improve.q`` directly with
+kombu and runs up to ``WORKER_ASYNC_CONCURRENCY`` improvement coroutines at
+once on the per-process background event loop, so LLM-bound throughput scales
+with the in-flight limit instead of the process count.
+
+Messages keep Celery's wire format and late-ack semantics: a message is acked
+only after its coroutine finished (successfully, retried or marked failed), so
+a crashed process hands its unacked jobs back to the broker.
+
+Run with ``python -m app.celery_app.aio_worker``.
+"""
+
+import asyncio
+import logging
+import queue
+import signal
+import socket
+import threading
+from datetime import datetime, timezone
+
+from kombu import Connection
+from kombu.message import Message
+
+from app.celery_app.retry_policy import decide_retry, is_transient
+from app.celery_app.tasks import (
+    _ensure_background_loop,
+    _improve_resume_task_async,
+    _mark_improvement_failed,
+    improve_resume_task,
+)
+from app.celery_app.worker import celery_app
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Messages waiting for their retry ETA do not hold a concurrency slot, so let the
+# broker deliver a few more than we can run at once.
+PREFETCH_MULTIPLIER = 2
+
+
+class AsyncImprovementWorker:
+    """Consume ``improve.q`` and run improvements concurrently on one event loop."""
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        connection: Connection | None = None,
+        poll_interval: float = 0.2,
+    ):
+        self.concurrency = concurrency or settings.WORKER_ASYNC_CONCURRENCY
+        self.poll_interval = poll_interval
+        self._connection = connection
+        self._completed: queue.SimpleQueue[tuple[Message, bool]] = queue.SimpleQueue()
+        self._stopping = threading.Event()
+        self._inflight = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._slots = asyncio.Semaphore(self.concurrency)
+
+    @property
+    def inflight(self) -> int:
+        """Number of received messages that are not acked yet."""
+        return self._inflight
+
+    def stop(self) -> None:
+        """Request a warm shutdown: stop consuming and wait for in-flight jobs."""
+        self._stopping.set()
+
+    def run(self) -> None:
+        """Consume messages until `stop()` is called, then drain in-flight jobs."""
+        self._loop = _ensure_background_loop()
+        conn = self._connection or celery_app.connection_for_read()
+        task_queue = celery_app.amqp.queues[celery_app.conf.task_default_queue]
+        logger.info(
+            "Async worker started",
+            extra={"queue": task_queue.name, "concurrency": self.concurrency},
+        )
+        try:
+            with conn.Consumer(
+                [task_queue], callbacks=[self._on_message], accept=["json"]
+            ) as consumer:
+                consumer.qos(prefetch_count=self.concurrency * PREFETCH_MULTIPLIER)
+                while not self._stopping.is_set():
+                    try:
+                        conn.drain_events(timeout=self.poll_interval)
+                    except socket.timeout:
+                        pass
+                    self._ack_completed()
+                consumer.cancel()
+                while self._inflight:
+                    self._ack_completed(block=True)
+        finally:
+            if self._connection is None:
+                conn.release()
+        logger.info("Async worker stopped")
+
+    def _on_message(self, body, message: Message) -> None:
+        headers = message.headers or {}
+        task_name = headers.get("task")
+        if task_name != improve_resume_task.name:
+            logger.warning("Unknown task rejected", extra={"task": task_name})
+            message.reject()
+            return
+        args = body[0] if isinstance(body, (list, tuple)) and body else []
+        if not args:
+            logger.warning("Malformed improvement message rejected", extra={"task": task_name})
+            message.reject()
+            return
+
+        self._inflight += 1
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_job(
+                improvement_id=str(args[0]),
+                task_id=headers.get("id"),
+                retries=int(headers.get("retries") or 0),
+                eta=headers.get("eta"),
+            ),
+            self._loop,
+        )
+        # Acks must happen on the consumer thread; hand the message back to it.
+        future.add_done_callback(
+            lambda f: self._completed.put((message, not f.cancelled() and f.exception() is None))
+        )
+
+    def _ack_completed(self, block: bool = False) -> None:
+        while True:
+            try:
+                message, handled = self._completed.get(block=block, timeout=self.poll_interval)
+            except queue.Empty:
+                return
+            if handled:
+                message.ack()
+            else:
+                # Neither finished nor rescheduled (e.g. broker/DB down): let another worker retry.
+                message.requeue()
+            self._inflight -= 1
+            block = False
+
+    async def _run_job(
+        self, improvement_id: str, task_id: str | None, retries: int, eta: str | None
+    ) -> None:
+        """Run one improvement under the in-flight limit, mirroring the task's retry policy."""
+        delay = _seconds_until(eta)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        async with self._slots:
+            logger.info(
+                "Async task received",
+                extra={"task": improve_resume_task.name, "improvement_id": improvement_id},
+            )
+            try:
+                # Same budget as the Celery soft time limit, enforced on the loop
+                async with asyncio.timeout(celery_app.conf.task_soft_time_limit):
+                    await _improve_resume_task_async(improvement_id)
+            except Exception as e:  # noqa: BLE001
+                decision = decide_retry(e, retries, improve_resume_task.max_retries)
+                if decision is None:
+                    logger.exception(
+                        "Async task failed, marking as failed",
+                        extra={
+                            "task": improve_resume_task.name,
+                            "improvement_id": improvement_id,
+                            "retries": retries,
+                            "transient": is_transient(e),
+                        },
+                    )
+                    await _mark_improvement_failed(improvement_id, str(e))
+                    return
+                # Publishing is blocking I/O; keep it off the event loop.
+                await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    lambda: improve_resume_task.apply_async(
+                        args=[improvement_id],
+                        task_id=task_id,
+                        retries=decision.retries,
+                        countdown=decision.countdown,
+                    ),
+                )
+                logger.warning(
+                    "Async task scheduled for retry",
+                    extra={
+                        "improvement_id": improvement_id,
+                        "retries": decision.retries,
+                        "countdown": decision.countdown,
+                    },
+                )
+                return
+            logger.info(
+                "Async task completed",
+                extra={"task": improve_resume_task.name, "improvement_id": improvement_id},
+            )
+
+
+def _seconds_until(eta: str | None) -> float:
+    """Return seconds left until an ISO-8601 Celery ETA, or 0 if absent/past."""
+    if not eta:
+        return 0.0
+    try:
+        when = datetime.fromisoformat(eta)
+    except ValueError:
+        return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(tz=timezone.utc)).total_seconds())
+
+
+def main() -> None:
+    """Entrypoint: run the async worker until SIGINT/SIGTERM."""
+    worker = AsyncImprovementWorker()
+
+    def _shutdown(signum, _frame):
+        logger.info("Async worker shutting down", extra={"signal": signum})
+        worker.stop()
+
+    signal.signal(signal.SIGINT, _shutdown)
+    signal.signal(signal.SIGTERM, _shutdown)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["AsyncImprovementWorker"]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+"""Circuit breaker around the LLM backend, shared by all workers through the DB.
+
+After ``LLM_BREAKER_FAILURE_THRESHOLD`` consecutive transient failures the
+breaker opens: jobs raise `CircuitOpen` before touching the backend and are
+parked (rescheduled without spending their retry budget). Once
+``LLM_BREAKER_COOLDOWN`` has passed the breaker is half-open. A single worker
+takes the probe lease, and its call decides whether the breaker closes or
+opens again. Everybody else stays parked until then.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models._types import utcnow
+from app.uow import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpen(Exception):
+    """The backend is considered down; retry after `retry_after` seconds."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class BreakerPermit:
+    """Permission to make one call; `probe` is set for the half-open trial call."""
+
+    probe: bool = False
+    failures: int = 0
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker whose state lives in the ``circuitbreakerstate`` table."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        cooldown: float,
+        probe_timeout: float,
+        enabled: bool = True,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.probe_timeout = probe_timeout
+        self.enabled = enabled
+
+    async def acquire(self) -> BreakerPermit:
+        """Return a permit for one call, or raise `CircuitOpen` while the backend is down."""
+        if not self.enabled:
+            return BreakerPermit()
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            state = await uow.circuit_breakers.get(self.name)
+            if state is None or state.open_until is None:
+                return BreakerPermit(failures=state.failures if state else 0)
+            now = utcnow()
+            open_until = _aware(state.open_until)
+            if open_until > now:
+                raise CircuitOpen(self.name, (open_until - now).total_seconds())
+            if not await uow.circuit_breakers.claim_probe(
+                self.name, now, now + timedelta(seconds=self.probe_timeout)
+            ):
+                # Another worker is probing; its lease bounds how long that takes
+                probe_until = _aware(state.probe_until) if state.probe_until else now
+                raise CircuitOpen(self.name, max((probe_until - now).total_seconds(), 1.0))
+            await uow.commit()
+        logger.info("Circuit half-open; probing", extra={"breaker": self.name})
+        return BreakerPermit(probe=True, failures=state.failures)
+
+    async def record_success(self, permit: BreakerPermit) -> None:
+        """Close the breaker after a successful probe or a failure streak; no-op otherwise."""
+        if not self.enabled or (not permit.probe and permit.failures == 0):
+            return
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            await uow.circuit_breakers.reset(self.name)
+            await uow.commit()
+        if permit.probe:
+            logger.info("Circuit closed", extra={"breaker": self.name})
+
+    async def record_failure(self, permit: BreakerPermit) -> None:
+        """Count a transient failure; a failed probe re-opens the breaker for another cooldown."""
+        if not self.enabled:
+            return
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            await uow.circuit_breakers.record_failure(
+                self.name,
+                self.failure_threshold,
+                utcnow() + timedelta(seconds=self.cooldown),
+                probe=permit.probe,
+            )
+            await uow.commit()
+        if permit.probe or permit.failures + 1 >= self.failure_threshold:
+            logger.warning(
+                "Circuit open",
+                extra={"breaker": self.name, "cooldown": self.cooldown, "probe": permit.probe},
+            )
+
+    async def release(self, permit: BreakerPermit) -> None:
+        """Give up a probe lease without a verdict (e.g. the job was cancelled)."""
+        if not self.enabled or not permit.probe:
+            return
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            await uow.circuit_breakers.release_probe(self.name)
+            await uow.commit()
+
+
+def _aware(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; stored values are always UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+llm_breaker = CircuitBreaker(
+    "llm",
+    failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+    cooldown=settings.LLM_BREAKER_COOLDOWN,
+    probe_timeout=settings.LLM_BREAKER_PROBE_TIMEOUT,
+    enabled=settings.LLM_BREAKER_ENABLED,
+)
+
+
+__all__ = ["BreakerPermit", "CircuitBreaker", "CircuitOpen", "llm_breaker"]
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+"""Database job queue: run improvements without a broker.
+
+With ``IMPROVEMENT_BACKEND=dbqueue`` the ``resumeimprovement`` rows are the
+queue. Workers lease batches of runnable rows with ``SELECT ... FOR UPDATE
+SKIP LOCKED`` (see `ImprovementRepository.claim_batch`) and run them through
+the same pipeline as the Celery task, up to ``WORKER_ASYNC_CONCURRENCY`` at
+once on one event loop. Claims are fair across users: the user with the fewest
+jobs running or ahead in line goes first, and ``DBQUEUE_USER_CONCURRENCY``
+optionally caps how many jobs of one user run at once across all workers.
+
+A lease works as a visibility timeout: until ``lease_until`` no other worker
+claims the row. Leases of running jobs are extended every third of
+``DBQUEUE_LEASE``, so the jobs of a dead worker reappear once their lease runs
+out. A retry hides the row for its backoff delay the same way. On PostgreSQL,
+idle workers are woken by the ``queued`` status notification of a new job;
+otherwise they poll every ``DBQUEUE_POLL_INTERVAL`` seconds.
+
+Run with ``python -m app.celery_app.db_queue``, or embedded in the API process
+with ``IMPROVEMENT_BACKEND=embedded`` (`embedded_worker`, started from the app
+lifespan).
+"""
+
+import asyncio
+import json
+import logging
+import signal
+from typing import Dict, List, Optional
+
+from sqlalchemy import Row
+
+from app.celery_app.retry_policy import decide_retry, is_transient
+from app.celery_app.tasks import (
+    _improve_resume_task_async,
+    _mark_improvement_failed,
+    improve_resume_task,
+)
+from app.celery_app.worker import celery_app
+from app.core.config import settings
+from app.db.notifications import listen_improvement_status
+from app.db.session import AsyncSessionLocal, engine
+from app.llm import close_llm_client
+from app.models import ImprovementStatus
+from app.uow import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+
+class DBQueueWorker:
+    """Lease queued improvements from the database and run them concurrently on one loop."""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        lease: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        fair: Optional[bool] = None,
+        per_user_limit: Optional[int] = None,
+    ):
+        self.concurrency = concurrency or settings.WORKER_ASYNC_CONCURRENCY
+        self.batch_size = batch_size or settings.DBQUEUE_BATCH_SIZE
+        self.lease = lease or settings.DBQUEUE_LEASE
+        self.poll_interval = poll_interval or settings.DBQUEUE_POLL_INTERVAL
+        self.fair = settings.DBQUEUE_FAIR if fair is None else fair
+        self.per_user_limit = (
+            settings.DBQUEUE_USER_CONCURRENCY if per_user_limit is None else per_user_limit
+        )
+        self._jobs: Dict[str, asyncio.Task] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def inflight(self) -> int:
+        """Number of claimed jobs that are still running."""
+        return len(self._jobs)
+
+    def notify(self) -> None:
+        """Wake the claim loop, e.g. after a job was queued or a slot was freed."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stop(self) -> None:
+        """Request a warm shutdown: stop claiming and let `run` wait for in-flight jobs."""
+        self._stopping = True
+        self.notify()
+
+    async def claim(self, limit: int) -> List[Row]:
+        """Lease up to `limit` runnable jobs in one short transaction."""
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            rows = await uow.improvements.claim_batch(
+                limit, self.lease, fair=self.fair, per_user_limit=self.per_user_limit
+            )
+            await uow.commit()
+        return rows
+
+    async def run_once(self) -> int:
+        """Claim one batch and run it to completion; return how many jobs ran."""
+        rows = await self.claim(min(self.batch_size, self.concurrency))
+        await asyncio.gather(*(self._run_job(str(row.id), row.attempts) for row in rows))
+        return len(rows)
+
+    async def run(self) -> None:
+        """Claim and run jobs until `stop()` is called, then drain in-flight jobs."""
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        heartbeat = asyncio.create_task(self._heartbeat(), name="dbqueue-heartbeat")
+        listener = None
+        if engine.dialect.name == "postgresql":
+            listener = asyncio.create_task(self._listen(), name="dbqueue-listener")
+        logger.info(
+            "Job queue worker started",
+            extra={"concurrency": self.concurrency, "batch_size": self.batch_size},
+        )
+        try:
+            while not self._stopping:
+                self._wakeup.clear()
+                wanted = min(self.concurrency - len(self._jobs), self.batch_size)
+                claimed = 0
+                if wanted > 0:
+                    try:
+                        rows = await self.claim(wanted)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception:
+                        logger.exception("Job queue claim failed")
+                        rows = []
+                    for row in rows:
+                        self._spawn(str(row.id), row.attempts)
+                    claimed = len(rows)
+                if claimed and claimed == wanted:
+                    continue  # a full batch: more jobs are probably waiting
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+            if self._jobs:
+                await asyncio.wait(list(self._jobs.values()))
+        finally:
+            heartbeat.cancel()
+            if listener is not None:
+                listener.cancel()
+            await self._abandon()
+        logger.info("Job queue worker stopped")
+
+    def start(self) -> None:
+        """Run the worker as a task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="dbqueue-worker")
+
+    async def close(self, grace: Optional[float] = None) -> None:
+        """Stop a worker started with `start()`.
+
+        In-flight jobs get up to `grace` seconds (no limit when None) to
+        finish. Jobs still running after that are cancelled and their leases
+        released, so the next worker to start picks them up right away.
+        """
+        if self._task is None:
+            return
+        self.stop()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=grace)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _spawn(self, improvement_id: str, attempts: int) -> None:
+        job = asyncio.create_task(self._run_job(improvement_id, attempts))
+        self._jobs[improvement_id] = job
+
+        def _done(task: asyncio.Task) -> None:
+            self._jobs.pop(improvement_id, None)
+            if not task.cancelled() and task.exception() is not None:
+                # Neither finished nor rescheduled (e.g. DB down): the lease expiry retries it
+                logger.error(
+                    "Job queue job crashed",
+                    extra={"improvement_id": improvement_id, "error": str(task.exception())},
+                )
+            self.notify()
+
+        job.add_done_callback(_done)
+
+    async def _abandon(self) -> None:
+        """Cancel jobs that are still running and return them to the queue."""
+        jobs = dict(self._jobs)
+        if not jobs:
+            return
+        for job in jobs.values():
+            job.cancel()
+        await asyncio.wait(list(jobs.values()))
+        try:
+            async with AsyncSessionLocal() as session:
+                uow = UnitOfWork(session)
+                await uow.improvements.release_leases(list(jobs))
+                await uow.commit()
+        except Exception:
+            logger.exception("Releasing job queue leases failed; they expire on their own")
+        logger.warning("Job queue jobs interrupted", extra={"count": len(jobs)})
+
+    async def _run_job(self, improvement_id: str, attempts: int) -> None:
+        """Run one leased job, mirroring the Celery task's retry policy."""
+        retries = attempts - 1
+        max_retries = improve_resume_task.max_retries
+        if retries > max_retries:
+            # Claimed again after its worker died each time: stop handing it out
+            await _mark_improvement_failed(improvement_id, f"Gave up after {attempts} attempts")
+            return
+        logger.info(
+            "Job queue job claimed",
+            extra={"improvement_id": improvement_id, "attempts": attempts},
+        )
+        try:
+            # Same budget as the Celery soft time limit, enforced on the loop
+            async with asyncio.timeout(celery_app.conf.task_soft_time_limit):
+                await _improve_resume_task_async(improvement_id, attempts)
+        except Exception as e:  # noqa: BLE001
+            decision = decide_retry(e, retries, max_retries)
+            if decision is None:
+                logger.exception(
+                    "Job queue job failed, marking as failed",
+                    extra={
+                        "improvement_id": improvement_id,
+                        "retries": retries,
+                        "transient": is_transient(e),
+                    },
+                )
+                await _mark_improvement_failed(improvement_id, str(e))
+                return
+            # The next claim adds one, so a parked job (same retries) keeps its budget
+            async with AsyncSessionLocal() as session:
+                uow = UnitOfWork(session)
+                await uow.improvements.schedule_retry(
+                    improvement_id, decision.countdown, decision.retries
+                )
+                await uow.commit()
+            logger.warning(
+                "Job queue job scheduled for retry",
+                extra={
+                    "improvement_id": improvement_id,
+                    "retries": decision.retries,
+                    "countdown": decision.countdown,
+                },
+            )
+            return
+        logger.info("Job queue job completed", extra={"improvement_id": improvement_id})
+
+    async def _heartbeat(self) -> None:
+        """Keep the leases of running jobs alive."""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            if not self._jobs:
+                continue
+            try:
+                async with AsyncSessionLocal() as session:
+                    uow = UnitOfWork(session)
+                    await uow.improvements.extend_leases(list(self._jobs), self.lease)
+                    await uow.commit()
+            except Exception:
+                logger.exception("Job queue lease extension failed")
+
+    async def _listen(self) -> None:
+        """Wake up on ``queued`` status notifications (PostgreSQL)."""
+
+        def _on_payload(payload: str) -> None:
+            try:
+                event = json.loads(payload)
+            except ValueError:
+                return
+            if event.get("status") == ImprovementStatus.queued.value:
+                self.notify()
+
+        while True:
+            try:
+                # (Re)listening may have missed notifications: claim once to catch up
+                await listen_improvement_status(_on_payload, self.notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job queue listener failed; restarting")
+                await asyncio.sleep(self.poll_interval)
+
+
+embedded_worker = DBQueueWorker(concurrency=settings.IMPROVEMENT_EMBEDDED_CONCURRENCY)
+
+
+def main() -> None:
+    """Entrypoint: run the job queue worker until SIGINT/SIGTERM."""
+    worker = DBQueueWorker()
+
+    async def _run() -> None:
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, worker.stop)
+        try:
+            await worker.run()
+        finally:
+            await close_llm_client()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["DBQueueWorker", "embedded_worker"]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+"""Outbox relay: publish improvement jobs recorded by the API to the broker.
+
+The API writes an `OutboxMessage` in the same transaction as the queued
+improvement and never talks to the broker itself. The relay drains the outbox
+in batches, publishing each batch over a single pooled broker connection, and
+deletes rows only after the broker confirmed them (at-least-once delivery).
+
+Besides enqueues, the outbox carries revokes of superseded jobs.
+
+The relay runs inside the API process (started from the app lifespan) and can
+also be run standalone with ``python -m app.celery_app.outbox``.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional
+
+from app.celery_app.tasks import improve_resume_task
+from app.celery_app.worker import celery_app
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import OutboxMessage
+from app.repositories.outbox import OUTBOX_KIND_ENQUEUE, OUTBOX_KIND_REVOKE
+from app.uow import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """Background loop draining the outbox table into the broker."""
+
+    def __init__(self, batch_size: Optional[int] = None, poll_interval: Optional[float] = None):
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.OUTBOX_POLL_INTERVAL
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        """Wake the relay after a commit so new messages go out without waiting a poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def drain_once(self) -> int:
+        """Publish and delete one batch of pending messages; return how many were sent."""
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            try:
+                messages = await uow.outbox.claim_batch(self.batch_size)
+                if not messages:
+                    await uow.rollback()
+                    return 0
+                await asyncio.to_thread(_publish_batch, messages)
+                await uow.outbox.delete_many([m.id for m in messages])
+                await uow.commit()
+            except Exception:
+                await uow.rollback()
+                raise
+        logger.info("Outbox batch published", extra={"count": len(messages)})
+        return len(messages)
+
+    async def run(self) -> None:
+        """Drain until empty, then sleep until notified or the poll interval elapses."""
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                while await self.drain_once() >= self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Outbox relay iteration failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        """Start the relay loop as a task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="outbox-relay")
+
+    async def stop(self) -> None:
+        """Cancel the relay loop and wait for it to exit."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def _publish_batch(messages: List[OutboxMessage]) -> None:
+    """Publish messages over one pooled producer connection (blocking)."""
+    with celery_app.producer_or_acquire() as producer:
+        for message in messages:
+            if message.kind == OUTBOX_KIND_ENQUEUE:
+                improve_resume_task.apply_async(
+                    args=[str(message.improvement_id)],
+                    task_id=message.task_id,
+                    producer=producer,
+                )
+            elif message.kind == OUTBOX_KIND_REVOKE:
+                if celery_app.conf.task_always_eager:
+                    # Eager tasks run inline and there is no broker to broadcast to;
+                    # a job still running sees the cancelled status in the DB instead
+                    continue
+                # Prefork workers drop revoked tasks on receipt; the asyncio worker
+                # checks the job status in the DB instead
+                celery_app.control.revoke(message.task_id, connection=producer.connection)
+            else:
+                logger.warning(
+                    "Unknown outbox message kind skipped",
+                    extra={"kind": message.kind, "outbox_id": str(message.id)},
+                )
+
+
+outbox_relay = OutboxRelay()
+
+
+async def _main() -> None:
+    relay = OutboxRelay()
+    logger.info("Outbox relay started", extra={"batch_size": relay.batch_size})
+    await relay.run()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
+
+
+__all__ = ["OutboxRelay", "outbox_relay"]
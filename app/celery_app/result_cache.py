@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+"""Content-addressed cache of improvement results.
+
+Keys are a hash of the model, prompt version and the original text, so an
+improvement of text that was already improved (a reverted edit, a cloned
+resume) can be finalized without calling the LLM. Backends:
+
+- ``memory``: in-process LRU with TTL (per worker process);
+- ``sqlite``: on-disk store in WAL mode with memory-mapped reads, shared by all
+  worker processes on the host;
+- ``none``: caching disabled.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.utils.hashing import content_hash
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCacheBackend(ABC):
+    """Key/value storage for improved texts."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return cached value or None if missing/expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Store value under key, evicting old entries as needed."""
+
+
+class NullBackend(ResultCacheBackend):
+    """Backend that never stores anything."""
+
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        return None
+
+
+class MemoryLRUBackend(ResultCacheBackend):
+    """In-process LRU backend with TTL and a bound on the number of entries."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._cache: TTLCache[str] = TTLCache(max_entries=max_entries, ttl=ttl)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self._cache.set(key, value)
+
+
+class SQLiteBackend(ResultCacheBackend):
+    """On-disk backend shared across processes through a single SQLite file.
+
+    WAL mode lets readers proceed while another process writes; reads go
+    through a memory map. Expired rows are purged and the table is trimmed to
+    `max_entries` (least recently used first) on writes.
+
+    Reads are read-only: access times are collected in memory and written in
+    one batch on the next `set`, or on a read once `TOUCH_INTERVAL` seconds
+    passed or `TOUCH_BATCH` keys piled up, so a hit costs no write transaction.
+    """
+
+    MMAP_SIZE = 256 * 1024 * 1024
+    TOUCH_INTERVAL = 30.0
+    TOUCH_BATCH = 256
+
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._flushed_at = time.monotonic()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={self.MMAP_SIZE}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS improvement_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_improvement_cache_accessed"
+            " ON improvement_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM improvement_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = now
+            if (
+                len(self._touched) >= self.TOUCH_BATCH
+                or time.monotonic() - self._flushed_at >= self.TOUCH_INTERVAL
+            ):
+                self._flush_touched()
+                self._conn.commit()
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._flush_touched()  # so the LRU trim below sees recent reads
+            self._conn.execute(
+                "INSERT OR REPLACE INTO improvement_cache (key, value, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now),
+            )
+            self._conn.execute("DELETE FROM improvement_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM improvement_cache WHERE key IN ("
+                " SELECT key FROM improvement_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
+
+    def _flush_touched(self) -> None:
+        """Write pending access times; the caller holds the lock and commits."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE improvement_cache SET accessed_at = ? WHERE key = ?",
+                [(at, key) for key, at in self._touched.items()],
+            )
+            self._touched.clear()
+        self._flushed_at = time.monotonic()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class ImprovementResultCache:
+    """Async facade computing content-addressed keys and counting hits/misses."""
+
+    def __init__(self, backend: ResultCacheBackend, model: str, prompt_version: str):
+        self.backend = backend
+        self.model = model
+        self.prompt_version = prompt_version
+        self.stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return not isinstance(self.backend, NullBackend)
+
+    def key_for(self, old_content: str) -> str:
+        """Return cache key for the original text under the current model/prompt."""
+        return content_hash(self.model, self.prompt_version, old_content)
+
+    async def get(self, old_content: str) -> Optional[str]:
+        """Return cached improved text for `old_content`, counting the lookup."""
+        if not self.enabled:
+            return None
+        value = await asyncio.to_thread(self.backend.get, self.key_for(old_content))
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def put(self, old_content: str, new_content: str) -> None:
+        """Store improved text for `old_content`."""
+        if not self.enabled:
+            return
+        await asyncio.to_thread(self.backend.set, self.key_for(old_content), new_content)
+
+    async def get_sections(self, old_content: str) -> Optional[Dict[str, Optional[str]]]:
+        """Return the section memo stored with the cached result for `old_content`."""
+        if not self.enabled:
+            return None
+        value = await asyncio.to_thread(self.backend.get, self._sections_key(old_content))
+        return json.loads(value) if value is not None else None
+
+    async def put_sections(self, old_content: str, sections: Dict[str, Optional[str]]) -> None:
+        """Store the section memo of a sectioned result, so a cache hit can reuse it."""
+        if not self.enabled:
+            return
+        await asyncio.to_thread(
+            self.backend.set, self._sections_key(old_content), json.dumps(sections)
+        )
+
+    def _sections_key(self, old_content: str) -> str:
+        return content_hash(self.model, self.prompt_version, "sections", old_content)
+
+
+def build_backend(kind: str) -> ResultCacheBackend:
+    """Create a cache backend by name using the configured size/TTL limits."""
+    if kind == "memory":
+        return MemoryLRUBackend(
+            max_entries=settings.IMPROVEMENT_CACHE_MAX_ENTRIES, ttl=settings.IMPROVEMENT_CACHE_TTL
+        )
+    if kind == "sqlite":
+        return SQLiteBackend(
+            path=settings.IMPROVEMENT_CACHE_PATH,
+            max_entries=settings.IMPROVEMENT_CACHE_MAX_ENTRIES,
+            ttl=settings.IMPROVEMENT_CACHE_TTL,
+        )
+    return NullBackend()
+
+
+@lru_cache
+def get_result_cache() -> ImprovementResultCache:
+    """Return the process-wide improvement result cache configured from settings."""
+    return ImprovementResultCache(
+        backend=build_backend(settings.IMPROVEMENT_CACHE_BACKEND),
+        model=settings.LLM_MODEL,
+        prompt_version=settings.LLM_PROMPT_VERSION,
+    )
+
+
+__all__ = [
+    "ImprovementResultCache",
+    "ResultCacheBackend",
+    "MemoryLRUBackend",
+    "SQLiteBackend",
+    "NullBackend",
+    "get_result_cache",
+]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+"""Retry policy for improvement jobs.
+
+Errors are classified before retrying. Transient ones (timeouts, lost
+connections, an unavailable backend) are retried with exponential backoff and
+jitter. Anything else, such as bad input or a bug, is permanent and fails on
+the first attempt instead of burning the whole retry budget. A job stopped by
+the open circuit breaker is parked: it is rescheduled for when the breaker
+can let a call through, and keeps its retry budget.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.utils.time import get_exponential_backoff_interval
+from kombu.exceptions import OperationalError as BrokerError
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from app.celery_app.circuit_breaker import CircuitOpen
+from app.llm import LLMUnavailableError
+
+RETRY_BACKOFF_MAX = 600  # seconds
+
+
+class TransientImprovementError(Exception):
+    """A failure worth retrying, e.g. the LLM backend is overloaded or unreachable."""
+
+
+_TRANSIENT = (
+    TransientImprovementError,
+    LLMUnavailableError,
+    CircuitOpen,
+    TimeoutError,
+    ConnectionError,
+    SoftTimeLimitExceeded,
+    OperationalError,
+    InterfaceError,
+    BrokerError,
+)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Return True if a later attempt may succeed where this one failed."""
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return True
+    return isinstance(exc, _TRANSIENT)
+
+
+@dataclass(frozen=True)
+class RetryDecision:
+    """When to run the next attempt and the retry counter it carries."""
+
+    countdown: float
+    retries: int
+
+
+def decide_retry(
+    exc: BaseException, retries: int, max_retries: int, can_park: bool = True
+) -> Optional[RetryDecision]:
+    """Return how to retry a failed attempt, or None if the job should fail now.
+
+    `can_park=False` (eager mode, where countdowns are ignored) makes an open
+    circuit spend the retry budget like any transient error instead of spinning.
+    """
+    if isinstance(exc, CircuitOpen) and can_park:
+        # Spread parked jobs so they do not all return at the same instant
+        return RetryDecision(exc.retry_after + random.uniform(0, 1), retries)
+    if not is_transient(exc) or retries >= max_retries:
+        return None
+    countdown = get_exponential_backoff_interval(
+        factor=1, retries=retries, maximum=RETRY_BACKOFF_MAX, full_jitter=True
+    )
+    if isinstance(exc, LLMUnavailableError) and exc.retry_after:
+        # Honour the backend's Retry-After when it asks for a longer pause
+        countdown = max(countdown, exc.retry_after)
+    return RetryDecision(countdown, retries + 1)
+
+
+__all__ = ["RetryDecision", "TransientImprovementError", "decide_retry", "is_transient"]
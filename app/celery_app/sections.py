@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+"""Section-level improvement: split a resume, improve sections concurrently, reassemble.
+
+A resume is cut into sections at Markdown headings and blank-line blocks. Each
+section keeps the whitespace that followed it, so joining the sections gives
+back the original text byte for byte. Small neighbouring blocks are merged up
+to ``min_chars`` so a resume full of one-line bullets does not turn into
+hundreds of LLM calls.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+# A blank-line run, the line break right before a Markdown heading, or trailing whitespace
+_BOUNDARY = re.compile(r"\n[ \t]*\n\s*|\n(?=#{1,6}[ \t])|\s+\Z")
+_HEADING = re.compile(r"#{1,6}[ \t]")
+
+
+@dataclass(frozen=True)
+class Section:
+    """One block of a resume: text to improve plus the separator that followed it."""
+
+    body: str
+    separator: str = ""
+
+
+def split_sections(text: str, min_chars: int = 0) -> List[Section]:
+    """Split `text` into ordered sections; ``join_sections`` of the result is `text`.
+
+    Blocks shorter than `min_chars` are merged into the following block unless
+    that block starts with a heading.
+    """
+    raw: List[Section] = []
+    pos = 0
+    for m in _BOUNDARY.finditer(text):
+        if m.start() > pos:
+            raw.append(Section(text[pos : m.start()], m.group()))
+        elif raw:
+            raw[-1] = Section(raw[-1].body, raw[-1].separator + m.group())
+        else:
+            raw.append(Section("", m.group()))  # leading whitespace
+        pos = m.end()
+    if pos < len(text) or not raw:
+        raw.append(Section(text[pos:], ""))
+
+    merged: List[Section] = []
+    for section in raw:
+        if merged and len(merged[-1].body) < min_chars and not _HEADING.match(section.body):
+            prev = merged[-1]
+            merged[-1] = Section(prev.body + prev.separator + section.body, section.separator)
+        else:
+            merged.append(section)
+    return merged
+
+
+def join_sections(bodies: List[str], sections: List[Section]) -> str:
+    """Reassemble improved bodies in order with the original separators."""
+    return "".join(body + s.separator for body, s in zip(bodies, sections))
+
+
+async def improve_sections(
+    sections: List[Section],
+    improve: Callable[[str], Awaitable[str]],
+    concurrency: int,
+    on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> List[str]:
+    """Improve section bodies concurrently (at most `concurrency` at once), keeping order.
+
+    `on_progress` is awaited with the number of finished sections after each one.
+    Whitespace-only sections are passed through without a call.
+    """
+    sem = asyncio.Semaphore(concurrency)
+    done = 0
+    progress_lock = asyncio.Lock()
+
+    async def _one(section: Section) -> str:
+        nonlocal done
+        if not section.body.strip():
+            result = section.body
+        else:
+            async with sem:
+                result = await improve(section.body)
+        if on_progress is not None:
+            async with progress_lock:
+                done += 1
+                await on_progress(done)
+        return result
+
+    return list(await asyncio.gather(*(_one(s) for s in sections)))
+
+
+__all__ = ["Section", "improve_sections", "join_sections", "split_sections"]
@@ -7,29 +7,32 @@ database logic on a dedicated background event loop.
 """
 
 import asyncio
+import contextlib
 import logging
 import threading
-from datetime import datetime, timezone
+import weakref
+from typing import Awaitable, Dict, Optional, Tuple, TypeVar
 
 from celery.exceptions import SoftTimeLimitExceeded
-from sqlalchemy.orm.exc import StaleDataError
 
+from app.celery_app.circuit_breaker import CircuitOpen, llm_breaker
+from app.celery_app.result_cache import get_result_cache
+from app.celery_app.retry_policy import decide_retry, is_transient
+from app.celery_app.sections import improve_sections, join_sections, split_sections
 from app.celery_app.worker import celery_app
+from app.core.config import settings
+from app.db.notifications import ImprovementStatusHub, notify_improvement_status
 from app.db.session import AsyncSessionLocal
+from app.llm import get_llm_client
 from app.models import ImprovementStatus
 from app.uow import UnitOfWork
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-@celery_app.task(
-    name="improve_resume_task",
-    bind=True,
-    autoretry_for=(Exception,),
-    retry_backoff=True,
-    retry_jitter=True,
-    retry_kwargs={"max_retries": 3},
-)
+
+@celery_app.task(name="improve_resume_task", bind=True, max_retries=3)
 def improve_resume_task(self, improvement_id: str):
     """Improve resume content asynchronously.
 
@@ -38,8 +41,10 @@ def improve_resume_task(self, improvement_id: str):
 
     Notes:
         The function delegates to an async implementation and blocks until completion
-        on a persistent background event loop. Retries are handled by Celery; on
-        final failure, the improvement is marked as failed in the DB.
+        on a persistent background event loop. Failures go through `decide_retry`:
+        transient errors are retried with backoff, permanent ones fail at once, and
+        jobs stopped by the open LLM circuit are parked without spending retries.
+        On final failure, the improvement is marked as failed in the DB.
     """
     try:
         logger.info(
@@ -52,128 +57,371 @@ def improve_resume_task(self, improvement_id: str):
             extra={"task": "improve_resume_task", "improvement_id": improvement_id},
         )
     except Exception as e:  # noqa: BLE001
-        # If retries exhausted, mark failed in DB, otherwise propagate for retry
-        if getattr(self.request, "retries", 0) >= getattr(self, "max_retries", 3):
+        retries = self.request.retries
+        decision = decide_retry(e, retries, self.max_retries, can_park=not self.request.is_eager)
+        if decision is None:
             logger.exception(
                 "Celery task failed, marking as failed",
                 extra={
                     "task": "improve_resume_task",
                     "improvement_id": improvement_id,
-                    "retries": getattr(self.request, "retries", 0),
+                    "retries": retries,
+                    "transient": is_transient(e),
                 },
             )
             _run_async(_mark_improvement_failed(improvement_id, str(e)))
-        raise
+            raise
+        logger.warning(
+            "Celery task scheduled for retry",
+            extra={
+                "task": "improve_resume_task",
+                "improvement_id": improvement_id,
+                "retries": decision.retries,
+                "countdown": decision.countdown,
+            },
+        )
+        if decision.retries == retries:
+            # Parked behind the open circuit: same message again later, retry budget kept
+            self.apply_async(
+                args=[improvement_id],
+                task_id=self.request.id,
+                retries=retries,
+                countdown=decision.countdown,
+            )
+            return
+        raise self.retry(exc=e, countdown=decision.countdown)
 
 
-async def _improve_resume_task_async(improvement_id: str):
+async def _improve_resume_task_async(improvement_id: str, attempt: Optional[int] = None):
     """Async implementation of resume improvement pipeline.
 
     Flow:
-    - Load improvement; exit if it was deleted.
-    - Mark as processing and commit.
-    - Call mocked LLM to get improved text.
-    - Update resume content and mark improvement as done.
-    - If records were concurrently deleted, exit quietly.
+    - Claim the job with a conditional UPDATE (queued -> processing, leased for the
+      task time limit) that returns the text; exit if it was deleted, superseded,
+      cancelled or finished, or if another delivery is still running it. The
+      database job queue passes the `attempt` it leased the job for.
+    - On a result cache hit, finalize in the same transaction.
+    - Otherwise commit the claim and call the LLM (concurrently per section for
+      long resumes); cache the result.
+    - Finalize: conditional UPDATEs mark the improvement done (only if still
+      processing) and apply the text to the resume, in one transaction.
+
+    No row is loaded into the ORM, so a concurrent cancel, supersede or delete
+    simply makes the guarded UPDATE match nothing. Each stage (load, LLM call,
+    finalize) has its own deadline enforced on the event loop; an expired stage
+    raises `ImprovementStageTimeout` so Celery retries.
     """
     async with AsyncSessionLocal() as session:
         uow = UnitOfWork(session)
         try:
-            # Load improvement; if gone, nothing to do
-            imp = await uow.improvements.get_by_id(improvement_id)
-            if not imp:
-                logger.warning("Improvement not found", extra={"improvement_id": improvement_id})
-                return
-
-            # Mark as processing
-            try:
-                imp.status = ImprovementStatus.processing
-                imp.started_at = datetime.now(tz=timezone.utc)
-                await uow.session.flush()
-                await uow.commit()
-            except StaleDataError:
-                await uow.rollback()
-                logger.info(
-                    "Improvement gone before processing",
-                    extra={"improvement_id": improvement_id},
-                )
-                return
-
-            # Mocked LLM call (sleep + echo with [Improved])
-            new_content = await _mock_llm_improve(imp.old_content)
-
-            # Finalize: if resume or improvement disappeared, exit quietly
-            imp = await uow.improvements.get_by_id(improvement_id)
-            if not imp:
-                logger.info(
-                    "Improvement deleted during processing",
-                    extra={"improvement_id": improvement_id},
+            async with _deadline("load", settings.IMPROVEMENT_DB_TIMEOUT, improvement_id):
+                claimed = await uow.improvements.start_processing(
+                    improvement_id, celery_app.conf.task_time_limit, attempt
                 )
-                return
-
-            resume = await uow.resumes.get_by_id(str(imp.resume_id))
-            if not resume:
-                logger.info(
-                    "Resume deleted; skipping apply",
-                    extra={"improvement_id": improvement_id},
-                )
-                return
-
-            try:
-                imp.new_content = new_content
-                imp.status = ImprovementStatus.done
-                imp.applied = True
-                imp.finished_at = datetime.now(tz=timezone.utc)
-                resume.content = new_content
-                await uow.session.flush()
-                await uow.commit()
-            except StaleDataError:
-                await uow.rollback()
-                logger.info(
-                    "Record removed before finalize",
-                    extra={"improvement_id": improvement_id},
-                )
-                return
-
+                if claimed is None:
+                    # Obsolete, or running elsewhere: no LLM work for this delivery
+                    await uow.rollback()
+                    logger.info(
+                        "Improvement gone or no longer runnable",
+                        extra={"improvement_id": improvement_id},
+                    )
+                    return
+                resume_id, old_content = claimed
+
+                cache = get_result_cache()
+                section_results = None
+                new_content = await cache.get(old_content)
+                if new_content is not None:
+                    # Same text was already improved with this model/prompt: skip the LLM,
+                    # keeping its section memo for the next incremental run
+                    section_results = await cache.get_sections(old_content)
+                    logger.info(
+                        "Improvement cache hit",
+                        extra={
+                            "improvement_id": improvement_id,
+                            "cache_hits": cache.stats.hits,
+                            "cache_misses": cache.stats.misses,
+                        },
+                    )
+                else:
+                    await notify_improvement_status(
+                        uow.session, improvement_id, ImprovementStatus.processing
+                    )
+                    # Read before committing so no transaction stays open during the LLM call
+                    previous = await uow.improvements.last_section_results(str(resume_id))
+                    await uow.commit()
+                    # Raises CircuitOpen while the LLM backend is down; the job is requeued.
+                    # Acquired after the commit: on SQLite a probe write would wait on the claim.
+                    permit = await llm_breaker.acquire()
+
+            if new_content is None:
+                # LLM call (see app.llm), per section for long resumes;
+                # aborted as soon as the improvement is cancelled
+                try:
+                    async with _deadline("llm", settings.IMPROVEMENT_LLM_TIMEOUT, improvement_id):
+                        new_content, section_results = await _run_cancellable(
+                            improvement_id,
+                            _improve_content(improvement_id, old_content, previous),
+                        )
+                except ImprovementCancelled:
+                    await llm_breaker.release(permit)
+                    logger.info(
+                        "Improvement cancelled; LLM call aborted",
+                        extra={"improvement_id": improvement_id},
+                    )
+                    return
+                except Exception as e:
+                    if is_transient(e):
+                        await llm_breaker.record_failure(permit)
+                    else:
+                        await llm_breaker.release(permit)
+                    raise
+                await llm_breaker.record_success(permit)
+                await cache.put(old_content, new_content)
+                if section_results:
+                    await cache.put_sections(old_content, section_results)
+
+            async with _deadline("finalize", settings.IMPROVEMENT_DB_TIMEOUT, improvement_id):
+                await _finalize(uow, improvement_id, new_content, section_results)
+        except CircuitOpen as e:
+            await uow.rollback()
+            await _requeue(uow, improvement_id)
             logger.info(
-                "Improvement applied",
-                extra={
-                    "improvement_id": improvement_id,
-                    "resume_id": str(imp.resume_id),
-                    "status": imp.status.value,
-                },
+                "LLM circuit open; job parked",
+                extra={"improvement_id": improvement_id, "retry_after": e.retry_after},
             )
+            raise
         except SoftTimeLimitExceeded:
             # Let Celery retry or escalate; wrapper will mark failed on last retry
             await uow.rollback()
             logger.warning("Soft time limit exceeded", extra={"improvement_id": improvement_id})
+            await _release_claim(uow, improvement_id)
             raise
         except Exception:
             # Let Celery retry or escalate; wrapper will mark failed on last retry
             await uow.rollback()
             logger.exception("Error during improvement", extra={"improvement_id": improvement_id})
+            await _release_claim(uow, improvement_id)
             raise
 
 
-async def _mock_llm_improve(text: str, delay_seconds: float = 3.0) -> str:
-    """Mock LLM call: wait `delay_seconds` and return improved text.
+async def _finalize(
+    uow: UnitOfWork,
+    improvement_id: str,
+    new_content: str,
+    section_results: Optional[Dict[str, Optional[str]]],
+) -> None:
+    """Mark the improvement done and apply the improved text to the resume in one transaction.
+
+    Exits quietly, changing nothing, if the improvement was deleted, cancelled
+    or superseded meanwhile, or if its resume is gone.
+    """
+    resume_id = await uow.improvements.complete(improvement_id, new_content, section_results)
+    if resume_id is None:
+        await uow.rollback()
+        logger.info(
+            "Improvement gone or cancelled before finalize",
+            extra={"improvement_id": improvement_id},
+        )
+        return
+
+    if not await uow.resumes.set_content(str(resume_id), new_content):
+        await uow.rollback()
+        logger.info("Resume deleted; skipping apply", extra={"improvement_id": improvement_id})
+        return
+
+    await notify_improvement_status(uow.session, improvement_id, ImprovementStatus.done)
+    await uow.commit()
+    logger.info(
+        "Improvement applied",
+        extra={
+            "improvement_id": improvement_id,
+            "resume_id": str(resume_id),
+            "status": ImprovementStatus.done.value,
+        },
+    )
+
+
+async def _requeue(uow: UnitOfWork, improvement_id: str) -> None:
+    """Show a parked job as queued again until its next attempt claims it."""
+    if await uow.improvements.requeue(improvement_id):
+        await notify_improvement_status(uow.session, improvement_id, ImprovementStatus.queued)
+    await uow.commit()
+
+
+async def _release_claim(uow: UnitOfWork, improvement_id: str) -> None:
+    """Put a failed job back to queued so its retry can claim it again."""
+    try:
+        await _requeue(uow, improvement_id)
+    except Exception:
+        # The lease still runs out, after which a redelivery can claim the job
+        await uow.rollback()
+        logger.exception(
+            "Releasing the improvement claim failed", extra={"improvement_id": improvement_id}
+        )
+
+
+class ImprovementStageTimeout(TimeoutError):
+    """A pipeline stage (load, LLM call, finalize) ran past its deadline."""
+
+    def __init__(self, stage: str, seconds: float):
+        super().__init__(f"Improvement stage '{stage}' timed out after {seconds:g}s")
+        self.stage = stage
+        self.seconds = seconds
+
 
-    Keeps task structure stable for easy future swap to a real client.
+@contextlib.asynccontextmanager
+async def _deadline(stage: str, seconds: float, improvement_id: str):
+    """Cancel the enclosed awaits after `seconds` and raise `ImprovementStageTimeout`."""
+    try:
+        async with asyncio.timeout(seconds):
+            yield
+    except TimeoutError:
+        logger.warning(
+            "Improvement stage timed out",
+            extra={"improvement_id": improvement_id, "stage": stage, "timeout": seconds},
+        )
+        raise ImprovementStageTimeout(stage, seconds) from None
+
+
+class ImprovementCancelled(Exception):
+    """The improvement was cancelled while a worker was running it."""
+
+
+# The hub's feed task lives on one event loop, so keep one hub per loop
+_status_hubs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ImprovementStatusHub]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_status_hub() -> ImprovementStatusHub:
+    """Status hub shared by all jobs running on the current event loop."""
+    loop = asyncio.get_running_loop()
+    hub = _status_hubs.get(loop)
+    if hub is None:
+        hub = _status_hubs[loop] = ImprovementStatusHub()
+    return hub
+
+
+async def _run_cancellable(improvement_id: str, coro: Awaitable[T]) -> T:
+    """Await `coro`, cancelling it as soon as the improvement is cancelled.
+
+    Cancellation arrives as a status event: a LISTEN notification on
+    PostgreSQL, or a poll every ``IMPROVEMENT_EVENTS_POLL_INTERVAL`` elsewhere.
+    The in-flight LLM call is cancelled at its next await, so the worker slot
+    is freed right away instead of at the task time limit.
+    """
+    hub = _get_status_hub()
+    events = hub.subscribe(improvement_id)
+    work = asyncio.ensure_future(coro)
+
+    async def _wait_cancelled() -> None:
+        # Snapshot once the feed listens so a cancel committed in between is not missed
+        await hub.wait_ready(settings.IMPROVEMENT_EVENTS_HEARTBEAT)
+        event = await hub.snapshot(improvement_id)
+        while event is not None and event["status"] != ImprovementStatus.cancelled.value:
+            event = await events.get()
+
+    watcher = asyncio.ensure_future(_wait_cancelled())
+    try:
+        await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if work.done():
+            return work.result()
+        if watcher.exception() is not None:
+            logger.warning(
+                "Cancellation watcher failed; finishing without it",
+                extra={"improvement_id": improvement_id, "error": str(watcher.exception())},
+            )
+            return await work
+        work.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await work
+        raise ImprovementCancelled(improvement_id)
+    finally:
+        watcher.cancel()
+        work.cancel()
+        hub.unsubscribe(improvement_id, events)
+        await asyncio.wait({watcher})  # let the cancelled watcher unwind before the loop moves on
+
+
+async def _improve_content(
+    improvement_id: str, text: str, previous: Optional[Dict[str, Optional[str]]] = None
+) -> Tuple[str, Optional[Dict[str, Optional[str]]]]:
+    """Improve `text` in one LLM call, or section by section when it is long.
+
+    Sections are improved concurrently, so latency follows the slowest section
+    rather than the document size. Progress is stored on the improvement.
+
+    Re-improvement is incremental. `previous` is the section memo of the
+    resume's last done improvement, and sections found in it are reused
+    without an LLM call. Other sections are looked up in the result cache
+    first. Returns the improved text and the memo to store (None for a
+    single-call run).
     """
-    await asyncio.sleep(delay_seconds)
-    return f"{text} [Improved]"
+    sections = []
+    if previous or len(text) > settings.IMPROVEMENT_SECTION_THRESHOLD:
+        sections = split_sections(text, settings.IMPROVEMENT_SECTION_MIN_CHARS)
+    if len(sections) < 2:
+        return await _llm_improve(text), None
+
+    cache = get_result_cache()
+    previous = previous or {}
+    reused = 0
+
+    async def _improve_section(body: str) -> str:
+        nonlocal reused
+        key = cache.key_for(body)
+        if key in previous:
+            reused += 1
+            return body if previous[key] is None else previous[key]
+        improved = await cache.get(body)
+        if improved is None:
+            improved = await _llm_improve(body)
+            await cache.put(body, improved)
+        return improved
+
+    async def _progress(done: int) -> None:
+        await _record_sections_progress(improvement_id, done)
+
+    await _record_sections_progress(improvement_id, 0, total=len(sections))
+    bodies = await improve_sections(
+        sections, _improve_section, settings.IMPROVEMENT_SECTION_CONCURRENCY, _progress
+    )
+
+    # Memo for the next run: input section -> output, and output -> itself (null),
+    # since the next run sees the improved text as its input
+    memo: Dict[str, Optional[str]] = {}
+    for section, improved in zip(sections, bodies):
+        memo[cache.key_for(section.body)] = None if improved == section.body else improved
+        memo.setdefault(cache.key_for(improved), None)
+    logger.info(
+        "Sections improved",
+        extra={"improvement_id": improvement_id, "sections": len(sections), "reused": reused},
+    )
+    return join_sections(bodies, sections), memo
+
+
+async def _record_sections_progress(improvement_id: str, done: int, total: int | None = None):
+    """Persist section progress in its own short transaction."""
+    async with AsyncSessionLocal() as session:
+        uow = UnitOfWork(session)
+        await uow.improvements.set_sections_progress(improvement_id, done, total)
+        await uow.commit()
+
+
+async def _llm_improve(text: str) -> str:
+    """Improve one text with this process's LLM client (see `app.llm`)."""
+    return await get_llm_client().improve(text)
 
 
 async def _mark_improvement_failed(improvement_id: str, error: str):
-    """Mark an improvement as failed and persist error message."""
+    """Mark a queued or processing improvement as failed and persist the error message."""
     async with AsyncSessionLocal() as session:
         uow = UnitOfWork(session)
-        imp = await uow.improvements.get_by_id(improvement_id)
-        if imp:
-            imp.status = ImprovementStatus.failed
-            imp.error = error
-            imp.finished_at = datetime.now(tz=timezone.utc)
-            await uow.session.flush()
+        if await uow.improvements.mark_failed(improvement_id, error):
+            await notify_improvement_status(
+                uow.session, improvement_id, ImprovementStatus.failed, error
+            )
             await uow.commit()
             logger.info(
                 "Marked improvement as failed",
@@ -207,10 +455,35 @@ def _ensure_background_loop() -> asyncio.AbstractEventLoop:
 
 
 def _run_async(coro):
-    """Run an async coroutine on the background loop and wait for result."""
+    """Run an async coroutine on the background loop and wait for result.
+
+    If waiting is interrupted (``SoftTimeLimitExceeded`` is raised in this
+    thread by Celery), the coroutine is cancelled and given up to
+    ``IMPROVEMENT_CANCEL_GRACE`` seconds to release its DB connection and LLM
+    call before the exception propagates, so a retry never runs next to a
+    zombie of the previous attempt.
+    """
     loop = _ensure_background_loop()
-    future = asyncio.run_coroutine_threadsafe(coro, loop)
-    return future.result()
+    finished = threading.Event()
+
+    async def _tracked():
+        try:
+            return await coro
+        finally:
+            finished.set()
+
+    future = asyncio.run_coroutine_threadsafe(_tracked(), loop)
+    try:
+        return future.result()
+    except BaseException:
+        if not future.done():
+            future.cancel()
+            if not finished.wait(settings.IMPROVEMENT_CANCEL_GRACE):
+                logger.error(
+                    "Cancelled coroutine did not stop within grace period",
+                    extra={"grace": settings.IMPROVEMENT_CANCEL_GRACE},
+                )
+        raise
 
 
 __all__ = ["improve_resume_task"]
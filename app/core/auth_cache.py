@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+"""Process-local cache for the authentication fast path.
+
+`get_current_user` runs on every authenticated request. Two bounded TTL caches
+let it skip work that is repeated for every request made with the same token:
+
+- verified token -> subject. Entries never outlive the token's ``exp``.
+- user id -> minimal identity (`CurrentUser`). This removes the ``SELECT user``.
+
+A user deleted through the ORM is evicted right away by a mapper event, and
+`UserRepository.delete` evicts explicitly since Core deletes skip that event.
+Only this process is notified: other API processes, and any raw SQL that
+removes users, rely on ``AUTH_CACHE_TTL`` alone, so a deleted user keeps access
+there for at most that many seconds. The cached identity holds nothing but the
+id, so other changes to a user row never make it stale.
+"""
+
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models import User
+from app.utils.ttl_cache import TTLCache
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Identity of the authenticated caller; all that routes need from `User`."""
+
+    id: uuid.UUID
+
+
+class AuthCache:
+    """Bounded token and identity caches; disabled when ``ttl`` is 0."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.ttl = ttl
+        self._tokens: TTLCache[str] = TTLCache(max_entries, ttl)
+        self._users: TTLCache[CurrentUser] = TTLCache(max_entries, ttl)
+
+    def get_subject(self, token: str) -> Optional[str]:
+        """Return the subject of an already verified, unexpired token."""
+        return self._tokens.get(token) if self.ttl > 0 else None
+
+    def put_subject(self, token: str, subject: str, expires_at: int) -> None:
+        """Remember a verified token until its ``exp`` or the cache TTL, whichever is first."""
+        ttl = min(self.ttl, expires_at - time.time())
+        if ttl > 0:
+            self._tokens.set(token, subject, ttl=ttl)
+
+    def get_user(self, user_id: str) -> Optional[CurrentUser]:
+        """Return the cached identity for a user id."""
+        return self._users.get(user_id) if self.ttl > 0 else None
+
+    def put_user(self, user: CurrentUser) -> None:
+        """Cache the identity of a user loaded from the database."""
+        if self.ttl > 0:
+            self._users.set(str(user.id), user)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Forget a user's identity; their tokens then fail the DB lookup."""
+        self._users.pop(str(user_id))
+
+    def clear(self) -> None:
+        """Drop all cached tokens and identities."""
+        self._tokens.clear()
+        self._users.clear()
+
+
+auth_cache = AuthCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_deleted_user(_mapper, _connection, target: User) -> None:
+    auth_cache.invalidate_user(str(target.id))
+
+
+__all__ = ["AuthCache", "CurrentUser", "auth_cache"]
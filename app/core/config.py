@@ -3,7 +3,7 @@ from __future__ import annotations
 """Application configuration via environment variables (.env)."""
 
 from functools import lru_cache
-from typing import List
+from typing import List, Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,16 +28,109 @@ class Settings(BaseSettings):
     SYNC_DATABASE_URL: str | None = Field(default=None)
     JWT_SECRET: str
     ACCESS_TOKEN_TTL: int = Field(default=3600, ge=300, le=24 * 3600)
+    # Auth fast path: cache verified tokens and user identities (0 disables the cache);
+    # stateless mode trusts token claims and never loads the user from the DB
+    AUTH_CACHE_TTL: float = Field(default=60.0, ge=0)
+    AUTH_CACHE_MAX_ENTRIES: int = Field(default=10_000, ge=1)
+    AUTH_STATELESS: bool = Field(default=False)
+    # Password hashing: scheme and cost; outdated hashes are upgraded on login
+    PASSWORD_HASH_SCHEME: Literal["bcrypt", "argon2"] = Field(default="bcrypt")
+    BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=31)
+    ARGON2_TIME_COST: int = Field(default=2, ge=1)
+    ARGON2_MEMORY_COST: int = Field(default=19_456, ge=8)  # KiB
+    ARGON2_PARALLELISM: int = Field(default=1, ge=1)
+    # Hashing thread pool size (0 hashes inline) and how many calls may wait before 429
+    PASSWORD_HASH_WORKERS: int = Field(default=4, ge=0, le=64)
+    PASSWORD_HASH_QUEUE_LIMIT: int = Field(default=32, ge=0)
     # Messaging (RabbitMQ)
     RABBITMQ_URL: str
     # Optional: prevent duplicate improvements for same resume/content
     IMPROVEMENT_DEDUP_ENABLED: bool = Field(default=True)
+    # A new improve request supersedes the resume's still-queued improvements
+    IMPROVEMENT_SUPERSEDE_ENABLED: bool = Field(default=True)
     LOG_LEVEL: str = Field(default="INFO")
     CORS_ORIGINS: List[str]
 
     # Celery/testing
     CELERY_TASK_ALWAYS_EAGER: bool = Field(default=False)
 
+    # LLM identity; part of the improvement cache key
+    LLM_MODEL: str = Field(default="mock")
+    LLM_PROMPT_VERSION: str = Field(default="v1")
+    # LLM client (app/llm): in-process mock or HTTP service with a keep-alive connection pool
+    LLM_BACKEND: Literal["mock", "http"] = Field(default="mock")
+    LLM_BASE_URL: str = Field(default="http://localhost:8089")
+    LLM_API_KEY: Optional[str] = Field(default=None)
+    LLM_MOCK_DELAY: float = Field(default=3.0, ge=0)
+    # Calls in flight per worker process, pooled connections, and HTTP timeouts (seconds)
+    LLM_MAX_CONCURRENCY: int = Field(default=32, ge=1, le=1000)
+    LLM_MAX_CONNECTIONS: int = Field(default=32, ge=1, le=1000)
+    # The connection pool is split into this many independent pools (cheaper per request)
+    LLM_POOL_SHARDS: int = Field(default=8, ge=1, le=1000)
+    LLM_KEEPALIVE_EXPIRY: float = Field(default=30.0, ge=0)
+    LLM_CONNECT_TIMEOUT: float = Field(default=2.0, gt=0)
+    LLM_READ_TIMEOUT: float = Field(default=30.0, gt=0)
+    # Hedging: a call slower than the PERCENTILE latency of recent calls gets a second request
+    # (to HEDGE_BASE_URL if set); at most BUDGET of all calls are hedged
+    LLM_HEDGE_ENABLED: bool = Field(default=False)
+    LLM_HEDGE_PERCENTILE: float = Field(default=0.95, gt=0, lt=1)
+    LLM_HEDGE_BUDGET: float = Field(default=0.05, ge=0, le=1)
+    LLM_HEDGE_MIN_SAMPLES: int = Field(default=20, ge=1)
+    LLM_HEDGE_BASE_URL: Optional[str] = Field(default=None)
+    # Circuit breaker around the LLM backend, shared by workers through the DB: opens after
+    # FAILURE_THRESHOLD consecutive transient failures, parks jobs for COOLDOWN seconds, then one
+    # worker probes (PROBE_TIMEOUT bounds its lease)
+    LLM_BREAKER_ENABLED: bool = Field(default=True)
+    LLM_BREAKER_FAILURE_THRESHOLD: int = Field(default=5, ge=1)
+    LLM_BREAKER_COOLDOWN: float = Field(default=30.0, gt=0)
+    LLM_BREAKER_PROBE_TIMEOUT: float = Field(default=60.0, gt=0)
+    # Improvement result cache (content-addressed, see app/celery_app/result_cache.py)
+    IMPROVEMENT_CACHE_BACKEND: Literal["none", "memory", "sqlite"] = Field(default="memory")
+    IMPROVEMENT_CACHE_PATH: str = Field(default="./improvement_cache.sqlite3")
+    IMPROVEMENT_CACHE_TTL: int = Field(default=7 * 24 * 3600, ge=1)
+    IMPROVEMENT_CACHE_MAX_ENTRIES: int = Field(default=10_000, ge=1)
+
+    # Section-level improvement: resumes longer than the threshold are split at headings and
+    # blank lines (blocks merged up to MIN_CHARS) and sections are improved concurrently
+    IMPROVEMENT_SECTION_THRESHOLD: int = Field(default=4000, ge=0)
+    IMPROVEMENT_SECTION_MIN_CHARS: int = Field(default=800, ge=0)
+    IMPROVEMENT_SECTION_CONCURRENCY: int = Field(default=8, ge=1, le=100)
+
+    # Per-stage deadlines of the improvement pipeline, enforced on the event loop (seconds).
+    # DB_TIMEOUT covers load and finalize; keep DB_TIMEOUT * 2 + LLM_TIMEOUT under the Celery
+    # soft time limit (50s). CANCEL_GRACE bounds the wait for a cancelled run to clean up.
+    IMPROVEMENT_DB_TIMEOUT: float = Field(default=5.0, gt=0)
+    IMPROVEMENT_LLM_TIMEOUT: float = Field(default=35.0, gt=0)
+    IMPROVEMENT_CANCEL_GRACE: float = Field(default=5.0, gt=0)
+
+    # Transactional outbox relay (publishes queued improvements to the broker)
+    OUTBOX_RELAY_ENABLED: bool = Field(default=True)
+    OUTBOX_BATCH_SIZE: int = Field(default=100, ge=1, le=10_000)
+    OUTBOX_POLL_INTERVAL: float = Field(default=1.0, gt=0)
+
+    # Improvement status stream (SSE): polling interval for non-Postgres DBs, heartbeat period
+    IMPROVEMENT_EVENTS_POLL_INTERVAL: float = Field(default=1.0, gt=0)
+    IMPROVEMENT_EVENTS_HEARTBEAT: float = Field(default=15.0, gt=0)
+
+    # Asyncio worker runtime: max improvement coroutines in flight per process
+    WORKER_ASYNC_CONCURRENCY: int = Field(default=32, ge=1, le=1000)
+
+    # Execution backend: Celery over RabbitMQ; workers leasing the improvement rows straight
+    # from Postgres with FOR UPDATE SKIP LOCKED (python -m app.celery_app.db_queue); or the same
+    # queue run by the API process itself (embedded, for single-node installs)
+    IMPROVEMENT_BACKEND: Literal["celery", "dbqueue", "embedded"] = Field(default="celery")
+    # dbqueue: rows leased per claim, lease length (visibility timeout, s), idle poll interval
+    DBQUEUE_BATCH_SIZE: int = Field(default=16, ge=1, le=1000)
+    DBQUEUE_LEASE: float = Field(default=120.0, gt=0)
+    DBQUEUE_POLL_INTERVAL: float = Field(default=1.0, gt=0)
+    # Fair scheduling: users take turns instead of strict FIFO; optional cap on a user's running
+    # improvements across all workers (0: no cap)
+    DBQUEUE_FAIR: bool = Field(default=True)
+    DBQUEUE_USER_CONCURRENCY: int = Field(default=0, ge=0)
+    # embedded: improvements in flight in the API process; shutdown wait before jobs are requeued
+    IMPROVEMENT_EMBEDDED_CONCURRENCY: int = Field(default=4, ge=1, le=1000)
+    IMPROVEMENT_EMBEDDED_SHUTDOWN_GRACE: float = Field(default=10.0, ge=0)
+
     # API base path
     API_PREFIX: str = Field(default="/api/v1")
 
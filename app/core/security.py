@@ -1,8 +1,49 @@
 from __future__ import annotations
 
+"""Password hashing.
+
+Hashing is deliberately slow, so the async API never hashes on the event loop:
+`hash_password_async` and `verify_password_async` run on a small bounded
+thread pool (bcrypt and argon2 release the GIL). When more than
+``PASSWORD_HASH_QUEUE_LIMIT`` calls are waiting, new ones fail fast with
+`PasswordHasherBusy` so a login storm is shed instead of queueing forever.
+
+The scheme and its cost are configurable. Hashes made with another scheme or a
+lower cost are still accepted and are upgraded on the next successful login.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+def build_crypt_context(
+    scheme: Optional[str] = None, bcrypt_rounds: Optional[int] = None
+) -> CryptContext:
+    """Create a passlib context; hashes with other schemes or lower bcrypt cost need update."""
+    scheme = scheme or settings.PASSWORD_HASH_SCHEME
+    rounds = bcrypt_rounds or settings.BCRYPT_ROUNDS
+    return CryptContext(
+        schemes=[scheme] + [s for s in ("bcrypt", "argon2") if s != scheme],
+        default=scheme,
+        deprecated="auto",
+        bcrypt__rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        argon2__type="ID",
+        argon2__time_cost=settings.ARGON2_TIME_COST,
+        argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+        argon2__parallelism=settings.ARGON2_PARALLELISM,
+    )
+
+
+pwd_context = build_crypt_context()
 
 
 def hash_password(password: str) -> str:
@@ -11,3 +52,80 @@ def hash_password(password: str) -> str:
 
 def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
+
+
+def verify_and_update_password(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also return a new hash if the stored one uses outdated parameters."""
+    return pwd_context.verify_and_update(password, password_hash)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashing calls are already waiting for the pool."""
+
+
+class PasswordHasher:
+    """Runs password hashing off the event loop on a bounded thread pool.
+
+    ``workers=0`` hashes inline on the caller's thread (the old behaviour).
+    The pool is started on first use and stopped by `shutdown` (app lifespan).
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Run a hashing function on the pool, or raise `PasswordHasherBusy` when saturated."""
+        if self.workers <= 0:
+            return fn(*args)
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                raise PasswordHasherBusy()
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="pwhash"
+                )
+            executor = self._executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        """Stop the pool threads once queued calls have finished."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_LIMIT)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bounded pool."""
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password on the bounded pool; see `verify_and_update_password`."""
+    return await password_hasher.run(verify_and_update_password, password, password_hash)
+
+
+__all__ = [
+    "PasswordHasher",
+    "PasswordHasherBusy",
+    "build_crypt_context",
+    "hash_password",
+    "hash_password_async",
+    "password_hasher",
+    "pwd_context",
+    "verify_and_update_password",
+    "verify_password",
+    "verify_password_async",
+]
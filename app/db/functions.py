@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+"""Portable SQL functions.
+
+`sha256_hex` hashes text inside the database, so a statement can derive
+`content_hash` from a column without reading the text back first. PostgreSQL
+uses its built-in ``sha256``; SQLite gets a user-defined function registered
+on every new connection.
+"""
+
+import hashlib
+
+from sqlalchemy import String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import GenericFunction
+
+
+class sha256_hex(GenericFunction):  # noqa: N801 - SQL function naming
+    """Hex SHA-256 of a text's UTF-8 bytes; same value as ``content_hash(text)``."""
+
+    type = String(64)
+    inherit_cache = True
+
+
+@compiles(sha256_hex, "postgresql")
+def _sha256_hex_postgresql(element, compiler, **kw) -> str:
+    return "encode(sha256(convert_to(%s, 'UTF8')), 'hex')" % compiler.process(element.clauses, **kw)
+
+
+def _sha256_hex(value):
+    if value is None:
+        return None
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def register_sqlite_functions(dbapi_connection, _connection_record) -> None:
+    """Engine ``connect`` listener adding the functions SQLite lacks."""
+    dbapi_connection.create_function("sha256_hex", 1, _sha256_hex, deterministic=True)
+
+
+__all__ = ["register_sqlite_functions", "sha256_hex"]
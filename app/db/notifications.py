@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+"""Improvement status notifications: emit from the worker, fan out in the API.
+
+On PostgreSQL the worker publishes status transitions with ``pg_notify`` in the
+same transaction as the state change, so listeners only see committed states.
+The API keeps one LISTEN connection per process and fans events out to every
+subscribed client. Other databases fall back to one polling query per
+interval covering all watched improvements.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Callable, Dict, List, Optional, Set
+
+from sqlalchemy import Row, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.models import ImprovementStatus, ResumeImprovement
+
+logger = logging.getLogger(__name__)
+
+IMPROVEMENT_STATUS_CHANNEL = "improvement_status"
+
+
+async def notify_improvement_status(
+    session: AsyncSession,
+    improvement_id: str,
+    status: ImprovementStatus,
+    error: Optional[str] = None,
+) -> None:
+    """Queue a status notification, delivered when the session's transaction commits."""
+    if session.bind.dialect.name != "postgresql":
+        return
+    payload = {"id": str(improvement_id), "status": status.value}
+    if error:
+        payload["error"] = error[:1000]  # NOTIFY payloads are limited to 8000 bytes
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": IMPROVEMENT_STATUS_CHANNEL, "payload": json.dumps(payload)},
+    )
+
+
+async def listen_improvement_status(
+    on_payload: Callable[[str], None], on_listening: Optional[Callable[[], None]] = None
+) -> None:
+    """Call `on_payload` with every raw status notification (PostgreSQL only).
+
+    `on_listening` is called once the LISTEN is registered. Runs until
+    cancelled; raises ``ConnectionError`` when the LISTEN connection is lost,
+    because notifications would otherwise just stop arriving.
+    """
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        driver_conn = raw.driver_connection
+        lost = asyncio.get_running_loop().create_future()
+
+        def _on_notify(_conn, _pid, _channel, payload: str) -> None:
+            on_payload(payload)
+
+        def _on_terminate(_conn) -> None:
+            if not lost.done():
+                lost.set_exception(ConnectionError("LISTEN connection lost"))
+
+        driver_conn.add_termination_listener(_on_terminate)
+        try:
+            await driver_conn.add_listener(IMPROVEMENT_STATUS_CHANNEL, _on_notify)
+            if on_listening is not None:
+                on_listening()
+            await lost
+        finally:
+            driver_conn.remove_termination_listener(_on_terminate)
+            if not driver_conn.is_closed():
+                await driver_conn.remove_listener(IMPROVEMENT_STATUS_CHANNEL, _on_notify)
+
+
+class ImprovementStatusHub:
+    """In-process fan-out of improvement status events to many subscribers.
+
+    A single background task feeds the hub: a LISTEN connection on PostgreSQL
+    or a batched polling query elsewhere. It runs only while there are
+    subscribers.
+    """
+
+    def __init__(self, poll_interval: Optional[float] = None):
+        self.poll_interval = poll_interval or settings.IMPROVEMENT_EVENTS_POLL_INTERVAL
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._last_polled: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._resync: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    def subscribe(self, improvement_id: str) -> asyncio.Queue:
+        """Register a subscriber queue receiving events for one improvement."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(str(improvement_id), set()).add(queue)
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="improvement-status-hub")
+        return queue
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the feed delivers events; False if it is not up after `timeout`.
+
+        Subscribers snapshot the current status after this, so a transition
+        committed before the LISTEN is registered is not lost.
+        """
+        if self._ready is None:
+            return False
+        if self._ready.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def unsubscribe(self, improvement_id: str, queue: asyncio.Queue) -> None:
+        """Remove a subscriber; stop the feed when nobody is listening."""
+        key = str(improvement_id)
+        queues = self._subscribers.get(key)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[key]
+                self._last_polled.pop(key, None)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def publish(self, event: dict) -> None:
+        """Deliver an event (``{"id", "status", ...}``) to subscribers of that improvement."""
+        for queue in self._subscribers.get(str(event.get("id")), ()):
+            queue.put_nowait(event)
+
+    async def snapshot(self, improvement_id: str) -> Optional[dict]:
+        """Return the current status event for an improvement straight from the DB."""
+        async with AsyncSessionLocal() as session:
+            res = await session.execute(
+                select(ResumeImprovement.status, ResumeImprovement.error).where(
+                    ResumeImprovement.id == improvement_id
+                )
+            )
+            row = res.one_or_none()
+        if row is None:
+            return None
+        return _event(improvement_id, row.status, row.error)
+
+    async def close(self) -> None:
+        """Stop the feed task (app shutdown)."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        ready = self._ready
+        restarted = False
+        while True:
+            try:
+                if engine.dialect.name == "postgresql":
+                    await self._listen(ready, restarted)
+                else:
+                    ready.set()  # the first poll reports the current status anyway
+                    await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Improvement status feed failed; restarting")
+                ready.clear()
+                restarted = True
+                await asyncio.sleep(self.poll_interval)
+
+    async def _listen(self, ready: asyncio.Event, restarted: bool) -> None:
+        def _on_notify(payload: str) -> None:
+            try:
+                self.publish(json.loads(payload))
+            except ValueError:
+                logger.warning("Malformed status notification", extra={"payload": payload})
+
+        def _on_listening() -> None:
+            ready.set()
+            if restarted:
+                # Notifications sent while the feed was down are lost: re-read the states
+                self._resync = asyncio.create_task(self._publish_current(list(self._subscribers)))
+
+        try:
+            await listen_improvement_status(_on_notify, _on_listening)
+        finally:
+            if self._resync is not None:
+                self._resync.cancel()
+                self._resync = None
+
+    async def _publish_current(self, ids: List[str]) -> None:
+        """Publish the current status of `ids` to their subscribers."""
+        for row in await self._fetch(ids):
+            self.publish(_event(str(row.id), row.status, row.error))
+
+    async def _fetch(self, ids: List[str]) -> List[Row]:
+        if not ids:
+            return []
+        async with AsyncSessionLocal() as session:
+            res = await session.execute(
+                select(
+                    ResumeImprovement.id, ResumeImprovement.status, ResumeImprovement.error
+                ).where(ResumeImprovement.id.in_(ids))
+            )
+            return list(res.all())
+
+    async def _poll(self) -> None:
+        while True:
+            for row in await self._fetch(list(self._subscribers)):
+                key = str(row.id)
+                if self._last_polled.get(key) != row.status.value:
+                    self._last_polled[key] = row.status.value
+                    self.publish(_event(key, row.status, row.error))
+            await asyncio.sleep(self.poll_interval)
+
+
+def _event(improvement_id: str, status: ImprovementStatus, error: Optional[str]) -> dict:
+    event = {"id": str(improvement_id), "status": status.value}
+    if error:
+        event["error"] = error
+    return event
+
+
+improvement_status_hub = ImprovementStatusHub()
+
+
+__all__ = [
+    "IMPROVEMENT_STATUS_CHANNEL",
+    "ImprovementStatusHub",
+    "improvement_status_hub",
+    "listen_improvement_status",
+    "notify_improvement_status",
+]
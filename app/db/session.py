@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
+from app.db.functions import register_sqlite_functions
 
 engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True, future=True)
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", register_sqlite_functions)
 AsyncSessionLocal = async_sessionmaker(
     bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=AsyncSession
 )
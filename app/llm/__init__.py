@@ -0,0 +1,27 @@
+"""LLM client layer used by the improvement worker.
+
+`get_llm_client()` returns the configured backend (``LLM_BACKEND``): the
+in-process mock or `HTTPLLMClient` with a pooled keep-alive connection pool,
+optionally wrapped in `HedgedLLMClient` to cut tail latency.
+`app.llm.stub_server` is a local HTTP stub for load tests.
+"""
+
+from .base import LLMClient, LLMError, LLMRequestError, LLMUnavailableError
+from .factory import build_llm_client, close_llm_client, get_llm_client
+from .hedged import HedgedLLMClient, HedgeStats
+from .http_client import HTTPLLMClient
+from .mock import MockLLMClient
+
+__all__ = [
+    "LLMClient",
+    "LLMError",
+    "LLMRequestError",
+    "LLMUnavailableError",
+    "HTTPLLMClient",
+    "HedgedLLMClient",
+    "HedgeStats",
+    "MockLLMClient",
+    "build_llm_client",
+    "close_llm_client",
+    "get_llm_client",
+]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+"""LLM client interface and errors."""
+
+import asyncio
+from abc import ABC, abstractmethod
+
+
+class LLMError(Exception):
+    """Base class for LLM backend failures."""
+
+
+class LLMUnavailableError(LLMError):
+    """The backend is overloaded, failing or unreachable; a later attempt may succeed."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMRequestError(LLMError):
+    """The backend rejected the request itself; retrying the same input will not help."""
+
+
+class LLMClient(ABC):
+    """Improves resume text through some LLM backend.
+
+    At most `max_concurrency` calls are in flight per client; callers beyond
+    that wait for a slot, so one worker process never floods the backend.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def improve(self, text: str) -> str:
+        """Return the improved version of `text`."""
+        async with self._slots:
+            return await self._improve(text)
+
+    @abstractmethod
+    async def _improve(self, text: str) -> str:
+        """Backend-specific call, made while holding a concurrency slot."""
+
+    async def aclose(self) -> None:
+        """Release pooled connections."""
+        return None
+
+
+__all__ = ["LLMClient", "LLMError", "LLMRequestError", "LLMUnavailableError"]
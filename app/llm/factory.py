@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+"""Builds the configured LLM client, one per event loop."""
+
+import asyncio
+import weakref
+
+from app.core.config import settings
+from app.llm.base import LLMClient
+from app.llm.hedged import HedgedLLMClient
+from app.llm.http_client import HTTPLLMClient
+from app.llm.mock import MockLLMClient
+
+# Connection pools and semaphores belong to one event loop, so keep one client per loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def build_llm_client() -> LLMClient:
+    """Create a client for ``LLM_BACKEND`` from settings, hedged if ``LLM_HEDGE_ENABLED``."""
+    client = _build_backend(settings.LLM_BASE_URL)
+    if not settings.LLM_HEDGE_ENABLED:
+        return client
+    alternate = None
+    if settings.LLM_HEDGE_BASE_URL and settings.LLM_BACKEND == "http":
+        alternate = _build_backend(settings.LLM_HEDGE_BASE_URL)
+    return HedgedLLMClient(
+        client,
+        percentile=settings.LLM_HEDGE_PERCENTILE,
+        budget=settings.LLM_HEDGE_BUDGET,
+        min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+        alternate=alternate,
+    )
+
+
+def _build_backend(base_url: str) -> LLMClient:
+    if settings.LLM_BACKEND == "http":
+        return HTTPLLMClient(
+            base_url=base_url,
+            model=settings.LLM_MODEL,
+            prompt_version=settings.LLM_PROMPT_VERSION,
+            api_key=settings.LLM_API_KEY,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            pool_shards=settings.LLM_POOL_SHARDS,
+            connect_timeout=settings.LLM_CONNECT_TIMEOUT,
+            read_timeout=settings.LLM_READ_TIMEOUT,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+        )
+    return MockLLMClient(
+        delay=settings.LLM_MOCK_DELAY, max_concurrency=settings.LLM_MAX_CONCURRENCY
+    )
+
+
+def get_llm_client() -> LLMClient:
+    """Client shared by all calls on the current event loop (one per worker process)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = build_llm_client()
+    return client
+
+
+async def close_llm_client() -> None:
+    """Close the current loop's client, if one was created."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+__all__ = ["build_llm_client", "close_llm_client", "get_llm_client"]
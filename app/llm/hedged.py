@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+"""Hedged LLM requests.
+
+A call that has not answered within the ``LLM_HEDGE_PERCENTILE`` latency of
+recent calls gets a second, identical request, sent to the alternate endpoint
+if one is configured. Whichever answers first wins and the other is cancelled.
+Hedging is capped by a token bucket: each call earns ``LLM_HEDGE_BUDGET``
+tokens and a hedge spends one, so at most that fraction of calls is hedged,
+even when the backend slows down as a whole.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+from app.llm.base import LLMClient
+
+logger = logging.getLogger(__name__)
+
+LATENCY_WINDOW = 1000  # recent call latencies the percentile is computed over
+RECOMPUTE_EVERY = 50  # calls between percentile recomputations
+MAX_BURST = 10  # hedge tokens that can be saved up
+STATS_LOG_EVERY = 1000  # calls between hedge counter log lines
+
+
+@dataclass
+class HedgeStats:
+    """Counters of a hedged client."""
+
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedged / self.calls if self.calls else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """Share of hedges where the second request answered first."""
+        return self.hedge_wins / self.hedged if self.hedged else 0.0
+
+
+class HedgedLLMClient(LLMClient):
+    """Wraps a client and races a second request against slow calls.
+
+    Calls share the primary's in-flight limit; a hedge also takes a slot in the
+    client it is sent to, like any other call.
+    """
+
+    def __init__(
+        self,
+        primary: LLMClient,
+        percentile: float,
+        budget: float,
+        min_samples: int,
+        alternate: Optional[LLMClient] = None,
+    ):
+        super().__init__(primary.max_concurrency)
+        self.primary = primary
+        self.alternate = alternate or primary
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.stats = HedgeStats()
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._threshold: Optional[float] = None
+        self._tokens = 0.0
+
+    async def _improve(self, text: str) -> str:
+        started = time.monotonic()
+        self.stats.calls += 1
+        self._tokens = min(self._tokens + self.budget, MAX_BURST)
+        first = asyncio.ensure_future(self.primary.improve(text))
+        second: Optional[asyncio.Future] = None
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait({first}, timeout=delay)
+                if not done and self._tokens >= 1:
+                    self._tokens -= 1
+                    self.stats.hedged += 1
+                    second = asyncio.ensure_future(self.alternate.improve(text))
+            result = await self._first_success(first, second)
+        finally:
+            for task in (first, second):
+                if task is not None and not task.done():
+                    task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await task
+        self._record(time.monotonic() - started)
+        return result
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        if self._threshold is None:
+            ordered = sorted(self._latencies)
+            self._threshold = ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+        return self._threshold
+
+    async def _first_success(self, first: asyncio.Future, second: Optional[asyncio.Future]) -> str:
+        """Return the first successful answer; raise the primary's error if both fail."""
+        if second is None:
+            return await first
+        pending = {first, second}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        self.stats.hedge_wins += 1
+                    return task.result()
+        return first.result()  # both failed: raises the primary's error
+
+    def _record(self, latency: float) -> None:
+        self._latencies.append(latency)
+        if self.stats.calls % RECOMPUTE_EVERY == 0:
+            self._threshold = None
+        if self.stats.calls % STATS_LOG_EVERY == 0:
+            logger.info(
+                "LLM hedge stats",
+                extra={
+                    "calls": self.stats.calls,
+                    "hedge_rate": round(self.stats.hedge_rate, 4),
+                    "win_rate": round(self.stats.win_rate, 4),
+                    "hedge_delay": self._threshold,
+                },
+            )
+
+    async def aclose(self) -> None:
+        await self.primary.aclose()
+        if self.alternate is not self.primary:
+            await self.alternate.aclose()
+
+
+__all__ = ["HedgeStats", "HedgedLLMClient"]
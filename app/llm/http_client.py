@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+"""HTTP backend over pooled keep-alive connections.
+
+Protocol: ``POST {base_url}/v1/improve`` with ``{"text", "model",
+"prompt_version"}`` returns ``{"text": "..."}``. 429 and 5xx responses,
+timeouts and transport errors raise `LLMUnavailableError` (retried). Other 4xx
+responses and malformed bodies raise `LLMRequestError` (permanent).
+"""
+
+from typing import Optional
+
+import httpx
+
+from app.llm.base import LLMClient, LLMRequestError, LLMUnavailableError
+
+
+class HTTPLLMClient(LLMClient):
+    """Calls a remote LLM service over pooled keep-alive connections.
+
+    Connections are reused across calls, so steady-state load pays no TCP/TLS
+    handshakes. The pool is split into `pool_shards` independent
+    `httpx.AsyncClient` instances and each call goes to the least busy one:
+    httpcore scans every connection against every waiting request, so one
+    large pool spends more CPU per request than small ones.
+    `max_keepalive_connections=0` disables reuse (only useful for measuring
+    what pooling buys).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        prompt_version: str,
+        max_concurrency: int,
+        max_connections: int,
+        connect_timeout: float,
+        read_timeout: float,
+        keepalive_expiry: float = 30.0,
+        pool_shards: int = 1,
+        max_keepalive_connections: Optional[int] = None,
+        api_key: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        super().__init__(max_concurrency)
+        self.model = model
+        self.prompt_version = prompt_version
+        pool_shards = max(1, min(pool_shards, max_connections))
+        per_shard = max_connections // pool_shards
+        if max_keepalive_connections is None:
+            max_keepalive_connections = per_shard
+        self._shards = [
+            httpx.AsyncClient(
+                base_url=base_url,
+                headers={"Authorization": f"Bearer {api_key}"} if api_key else None,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=per_shard,
+                    max_keepalive_connections=min(max_keepalive_connections, per_shard),
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                transport=transport,
+            )
+            for _ in range(pool_shards)
+        ]
+        self._inflight = [0] * pool_shards
+
+    async def _improve(self, text: str) -> str:
+        payload = {"text": text, "model": self.model, "prompt_version": self.prompt_version}
+        shard = min(range(len(self._shards)), key=self._inflight.__getitem__)
+        self._inflight[shard] += 1
+        try:
+            response = await self._shards[shard].post("/v1/improve", json=payload)
+        except httpx.TimeoutException as e:
+            raise LLMUnavailableError(f"LLM request timed out: {e!r}") from e
+        except httpx.TransportError as e:
+            raise LLMUnavailableError(f"LLM backend unreachable: {e!r}") from e
+        finally:
+            self._inflight[shard] -= 1
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise LLMUnavailableError(
+                f"LLM backend returned {response.status_code}",
+                retry_after=_retry_after(response),
+            )
+        if response.status_code >= 400:
+            raise LLMRequestError(f"LLM backend rejected request: {response.status_code}")
+        try:
+            improved = response.json()["text"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise LLMRequestError("Malformed LLM response") from e
+        if not isinstance(improved, str):
+            raise LLMRequestError("Malformed LLM response")
+        return improved
+
+    async def aclose(self) -> None:
+        for client in self._shards:
+            await client.aclose()
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+__all__ = ["HTTPLLMClient"]
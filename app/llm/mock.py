@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+"""In-process mock backend: waits, then echoes the text with an ``[Improved]`` mark."""
+
+import asyncio
+
+from app.llm.base import LLMClient
+
+
+class MockLLMClient(LLMClient):
+    """Mock backend used in development and tests; no network involved."""
+
+    def __init__(self, delay: float, max_concurrency: int):
+        super().__init__(max_concurrency)
+        self.delay = delay
+
+    async def _improve(self, text: str) -> str:
+        await asyncio.sleep(self.delay)
+        return f"{text} [Improved]"
+
+
+__all__ = ["MockLLMClient"]
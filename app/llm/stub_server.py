@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+"""Local stub of the LLM service for load tests.
+
+Speaks the `HTTPLLMClient` protocol. Latency is log-normal around a median,
+and a configurable share of requests fails with 500, is throttled with 429,
+or hangs past the client's read timeout. ``GET /stats`` reports requests,
+outcomes and how many distinct client connections were seen, which shows
+whether the client reuses connections.
+
+Run with::
+
+    python -m app.llm.stub_server --port 8089 --latency-ms 800 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import contextlib
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+@dataclass
+class StubConfig:
+    """Latency and failure distribution of the stub."""
+
+    latency_ms: float = 800.0  # median
+    latency_sigma: float = 0.4  # log-normal shape; 0 gives a fixed latency
+    error_rate: float = 0.0  # share of 500 responses
+    throttle_rate: float = 0.0  # share of 429 responses
+    hang_rate: float = 0.0  # share of requests that sleep `hang_seconds` first
+    hang_seconds: float = 120.0
+    seed: Optional[int] = None
+
+
+def create_stub_app(config: StubConfig) -> Starlette:
+    """Build the stub ASGI app."""
+    rng = random.Random(config.seed)
+    stats: Counter = Counter()
+    connections: set = set()
+
+    async def improve(request: Request) -> JSONResponse:
+        body = await request.json()
+        stats["requests"] += 1
+        if request.client is not None:
+            connections.add((request.client.host, request.client.port))
+
+        roll = rng.random()
+        if roll < config.hang_rate:
+            stats["hung"] += 1
+            await asyncio.sleep(config.hang_seconds)
+        delay = config.latency_ms / 1000 * rng.lognormvariate(0, config.latency_sigma)
+        await asyncio.sleep(delay)
+        roll -= config.hang_rate
+        if 0 <= roll < config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"error": "stub failure"}, status_code=500)
+        roll -= config.error_rate
+        if 0 <= roll < config.throttle_rate:
+            stats["throttled"] += 1
+            return JSONResponse(
+                {"error": "slow down"}, status_code=429, headers={"Retry-After": "1"}
+            )
+        stats["ok"] += 1
+        return JSONResponse({"text": f"{body['text']} [Improved]"})
+
+    async def get_stats(request: Request) -> JSONResponse:
+        return JSONResponse({**stats, "connections": len(connections)})
+
+    async def reset_stats(request: Request) -> JSONResponse:
+        stats.clear()
+        connections.clear()
+        return JSONResponse({})
+
+    return Starlette(
+        routes=[
+            Route("/v1/improve", improve, methods=["POST"]),
+            Route("/stats", get_stats, methods=["GET"]),
+            Route("/stats", reset_stats, methods=["DELETE"]),
+        ]
+    )
+
+
+@contextlib.contextmanager
+def running_stub(config: StubConfig, host: str = "127.0.0.1") -> Iterator[str]:
+    """Serve the stub on a free port in a background thread; yields its base URL."""
+    import uvicorn  # noqa: WPS433
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_stub_app(config), host=host, port=0, log_level="warning", lifespan="off"
+        )
+    )
+    thread = threading.Thread(target=server.run, name="llm-stub", daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("LLM stub server failed to start")
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+def main() -> None:
+    import uvicorn  # noqa: WPS433
+
+    parser = argparse.ArgumentParser(description="Local LLM stub server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=StubConfig.latency_ms)
+    parser.add_argument("--latency-sigma", type=float, default=StubConfig.latency_sigma)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=StubConfig.hang_seconds)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        seed=args.seed,
+    )
+    uvicorn.run(create_stub_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["StubConfig", "create_stub_app", "running_stub"]
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.error_handlers import install_error_handlers
@@ -10,7 +12,12 @@ from app.api.routes import auth as auth_routes
 from app.api.routes import health as health_routes
 from app.api.routes import improvements as improvements_routes
 from app.api.routes import resume as resume_routes
+from app.celery_app.db_queue import embedded_worker
+from app.celery_app.outbox import outbox_relay
 from app.core.config import settings
+from app.core.security import password_hasher
+from app.db.notifications import improvement_status_hub
+from app.llm import close_llm_client
 from app.logging_config import setup_logging
 from app.middleware.request_id import RequestIDMiddleware
 
@@ -33,6 +40,34 @@ tags_metadata = [
     },
 ]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run background services (outbox relay, embedded worker, status hub, hashing pool)."""
+    # Eager mode relays inline from the request handler instead
+    relay_enabled = (
+        settings.OUTBOX_RELAY_ENABLED
+        and not settings.CELERY_TASK_ALWAYS_EAGER
+        and settings.IMPROVEMENT_BACKEND == "celery"
+    )
+    embedded = settings.IMPROVEMENT_BACKEND == "embedded"
+    if relay_enabled:
+        outbox_relay.start()
+    if embedded:
+        embedded_worker.start()
+    try:
+        yield
+    finally:
+        if embedded:
+            await embedded_worker.close(settings.IMPROVEMENT_EMBEDDED_SHUTDOWN_GRACE)
+            await close_llm_client()
+        if relay_enabled:
+            await outbox_relay.stop()
+        await improvement_status_hub.close()
+        # Waits for in-flight hashes off the event loop, so other shutdown work keeps running
+        await asyncio.to_thread(password_hasher.shutdown)
+
+
 app = FastAPI(
     title="ResumeLab API",
     version="1.0.0",
@@ -50,6 +85,7 @@ app = FastAPI(
         "возвращён в ответе и попадёт в логи."
     ),
     openapi_tags=tags_metadata,
+    lifespan=lifespan,
     contact={
         "name": "ResumeLab",
         "url": "https://example.com",
@@ -81,13 +117,6 @@ app.add_middleware(
 install_error_handlers(app)
 
 
-@app.middleware("http")
-async def inject_user_id(request: Request, call_next):
-    # user id is set within route dependencies where available
-    response = await call_next(request)
-    return response
-
-
 app.include_router(auth_routes.router, prefix=settings.API_PREFIX)
 app.include_router(resume_routes.router, prefix=settings.API_PREFIX)
 app.include_router(improvements_routes.router, prefix=settings.API_PREFIX)
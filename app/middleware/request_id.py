@@ -4,27 +4,51 @@ from __future__ import annotations
 
 import contextvars
 import uuid
-from typing import Callable
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 request_id_ctx: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
 user_id_ctx: contextvars.ContextVar[str] = contextvars.ContextVar("user_id", default="-")
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Attach `X-Request-ID` to requests and response; expose it to logs via ContextVar."""
+class RequestIDMiddleware:
+    """Attach `X-Request-ID` to requests and response; expose it to logs via ContextVar.
 
-    async def dispatch(self, request: Request, call_next: Callable):  # type: ignore[override]
-        req_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
-        token = request_id_ctx.set(req_id)
+    A plain ASGI middleware: it only wraps ``send`` to add the header to the
+    response start message, so streaming responses pass through untouched and
+    no extra task is spawned per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        req_id = _header(scope, b"x-request-id") or str(uuid.uuid4())
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = req_id
+            await send(message)
+
+        req_token = request_id_ctx.set(req_id)
+        user_token = user_id_ctx.set("-")  # set by get_current_user once authenticated
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_request_id)
         finally:
-            request_id_ctx.reset(token)
-        response.headers["X-Request-ID"] = req_id
-        return response
+            user_id_ctx.reset(user_token)
+            request_id_ctx.reset(req_token)
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
 
 
 def get_request_id() -> str:
@@ -1,4 +1,6 @@
+from .circuit_breaker import CircuitBreakerState
 from .improvement import ImprovementStatus, ResumeImprovement
+from .outbox import OutboxMessage
 from .resume import Resume
 from .user import User
 
@@ -7,4 +9,6 @@ __all__ = [
     "Resume",
     "ResumeImprovement",
     "ImprovementStatus",
+    "OutboxMessage",
+    "CircuitBreakerState",
 ]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime, timezone
 from typing import Any
 
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
@@ -34,3 +35,13 @@ class GUID(TypeDecorator):
         if isinstance(value, uuid.UUID):
             return value
         return uuid.UUID(str(value))
+
+
+def utcnow() -> datetime:
+    """Timezone-aware current UTC time with microseconds.
+
+    Used as a client-side default for keyset-paginated `created_at` columns:
+    SQLite's CURRENT_TIMESTAMP has one-second resolution and a different text
+    format than bound datetimes, which breaks ``(created_at, id)`` cursors.
+    """
+    return datetime.now(tz=timezone.utc)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.db.base import Base
+from app.models._types import utcnow
+
+
+class CircuitBreakerState(Base):
+    """Shared state of a circuit breaker guarding an external backend, one row per backend.
+
+    Closed while `open_until` is NULL, open until `open_until`, then half-open:
+    one worker holds the probe lease (`probe_until`) and its call decides.
+    """
+
+    name = Column(String(64), primary_key=True)
+    failures = Column(Integer, nullable=False, default=0)
+    open_until = Column(DateTime(timezone=True), nullable=True)
+    probe_until = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=False)
@@ -3,11 +3,24 @@ from __future__ import annotations
 import enum
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, String, Text, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    text,
+)
+from sqlalchemy.orm import deferred, relationship
 
 from app.db.base import Base
-from app.models._types import GUID
+from app.models._types import GUID, utcnow
 
 
 class ImprovementStatus(str, enum.Enum):
@@ -15,6 +28,13 @@ class ImprovementStatus(str, enum.Enum):
     processing = "processing"
     done = "done"
     failed = "failed"
+    # Replaced by a newer improve request for the same resume before a worker picked it up
+    superseded = "superseded"
+    # Cancelled by the user; a running worker aborts its LLM call
+    cancelled = "cancelled"
+
+
+_ACTIVE_STATUSES_SQL = "status IN ('queued', 'processing')"
 
 
 class ResumeImprovement(Base):
@@ -26,13 +46,28 @@ class ResumeImprovement(Base):
     status = Column(
         Enum(ImprovementStatus, name="improvement_status", native_enum=False), nullable=False
     )
-    old_content = Column(Text, nullable=False)
-    new_content = Column(Text, nullable=True)
+    # Full resume bodies: deferred as one group, loaded only by detail/worker queries
+    old_content = deferred(Column(Text, nullable=False), group="content")
+    new_content = deferred(Column(Text, nullable=True), group="content")
+    # SHA-256 of old_content for the dedup check; NULL when dedup is disabled
+    content_hash = Column(String(64), nullable=True)
     error = Column(Text, nullable=True)
     applied = Column(Boolean, nullable=False, default=False, server_default="false")
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
+    )
     started_at = Column(DateTime(timezone=True), nullable=True)
+    # Progress of section-level improvement; NULL when the resume is improved in one call
+    sections_total = Column(Integer, nullable=True)
+    sections_done = Column(Integer, nullable=True)
+    # Section memo for incremental re-improvement: section hash -> improved text
+    # (null: the section is already improved output and is reused verbatim)
+    section_results = deferred(Column(JSON(none_as_null=True), nullable=True), group="content")
     finished_at = Column(DateTime(timezone=True), nullable=True)
+    # Database job queue (IMPROVEMENT_BACKEND=dbqueue): the row is invisible to claimers
+    # until lease_until, and attempts counts claims (retries + 1)
+    lease_until = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Use explicit back_populates and rely on DB-level ON DELETE CASCADE.
     # passive_deletes is configured on the parent side (Resume.improvements).
@@ -41,4 +76,23 @@ class ResumeImprovement(Base):
     __table_args__ = (
         Index("ix_improvements_resume_created", "resume_id", "created_at"),
         Index("ix_improvements_status", "status"),
+        # Claim scan of the database job queue: active jobs, oldest first
+        Index(
+            "ix_improvements_runnable",
+            "created_at",
+            postgresql_where=text(_ACTIVE_STATUSES_SQL),
+            sqlite_where=text(_ACTIVE_STATUSES_SQL),
+        ),
+        # At most one active job per resume/content: dedup is an index probe and
+        # concurrent duplicate enqueues are rejected by the database
+        Index(
+            "uq_improvements_active_content",
+            "resume_id",
+            "content_hash",
+            unique=True,
+            postgresql_where=text(_ACTIVE_STATUSES_SQL),
+            sqlite_where=text(_ACTIVE_STATUSES_SQL),
+        ),
     )
+    # Read server-generated columns back with INSERT/UPDATE ... RETURNING, not a SELECT
+    __mapper_args__ = {"eager_defaults": True}
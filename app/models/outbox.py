@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, func
+
+from app.db.base import Base
+from app.models._types import GUID
+
+
+class OutboxMessage(Base):
+    """Broker message recorded in the same transaction as the state change it announces.
+
+    Rows are published and deleted by the outbox relay (`app/celery_app/outbox.py`).
+    """
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    kind = Column(String(32), nullable=False)
+    improvement_id = Column(
+        GUID, ForeignKey("resumeimprovement.id", ondelete="CASCADE"), nullable=False
+    )
+    task_id = Column(String(100), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (Index("ix_outbox_created", "created_at"),)
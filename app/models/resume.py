@@ -3,18 +3,21 @@ from __future__ import annotations
 import uuid
 
 from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text, func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.db.base import Base
-from app.models._types import GUID
+from app.models._types import GUID, utcnow
 
 
 class Resume(Base):
     id = Column(GUID, primary_key=True, default=uuid.uuid4)
     user_id = Column(GUID, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
     title = Column(String(200), nullable=False)
-    content = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Up to 50k chars: deferred so listings never load it; undefer where needed
+    content = deferred(Column(Text, nullable=False))
+    created_at = Column(
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
+    )
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
@@ -30,3 +33,5 @@ class Resume(Base):
     )
 
     __table_args__ = (Index("ix_resume_user_created", "user_id", "created_at"),)
+    # Read server-generated columns back with INSERT/UPDATE ... RETURNING, not a SELECT
+    __mapper_args__ = {"eager_defaults": True}
@@ -15,3 +15,5 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     __table_args__ = (Index("users_email_key", "email", unique=True),)
+    # Read server-generated columns back with INSERT/UPDATE ... RETURNING, not a SELECT
+    __mapper_args__ = {"eager_defaults": True}
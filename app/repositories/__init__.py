@@ -1,4 +1,6 @@
+from .circuit_breaker import CircuitBreakerRepository
 from .improvement import ImprovementRepository
+from .outbox import OutboxRepository
 from .resume import ResumeRepository
 from .user import UserRepository
 
@@ -6,4 +8,6 @@ __all__ = [
     "UserRepository",
     "ResumeRepository",
     "ImprovementRepository",
+    "OutboxRepository",
+    "CircuitBreakerRepository",
 ]
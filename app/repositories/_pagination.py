@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+"""Shared keyset/offset page query for listings ordered by ``(created_at, id)`` desc.
+
+Listing queries select plain columns, so pages hold `Row` objects rather than ORM
+entities (no identity-map bookkeeping, no large text columns).
+"""
+
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import Select, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.pagination import Page, encode_cursor
+
+
+async def fetch_page(
+    session: AsyncSession,
+    query: Select,
+    created_col: Any,
+    id_col: Any,
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[Tuple[datetime, Any]] = None,
+    with_total: bool = True,
+) -> Page:
+    """Run a listing query page by cursor (keyset) or by offset.
+
+    The keyset predicate is written as ``created_at <= :c AND (created_at < :c
+    OR id < :id)`` so the leading range condition can use ``(owner_id,
+    created_at)`` indexes. One extra row is fetched to know whether a next
+    page exists; the exact total is only counted when `with_total` is set.
+    """
+    rows_q = query
+    if cursor is not None:
+        created_at, last_id = cursor
+        rows_q = rows_q.where(
+            created_col <= created_at, or_(created_col < created_at, id_col < last_id)
+        )
+    rows_q = rows_q.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+    if cursor is None and offset:
+        rows_q = rows_q.offset(offset)
+    res = await session.execute(rows_q)
+    rows = list(res.all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+
+    total = None
+    if with_total:
+        total_res = await session.execute(select(func.count()).select_from(query.subquery()))
+        total = int(total_res.scalar_one())
+    return Page(items=rows, total=total, next_cursor=next_cursor)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+"""Repository for shared circuit breaker state."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Row, case, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import CircuitBreakerState
+
+
+class CircuitBreakerRepository:
+    """Data access layer for circuit breaker rows.
+
+    Transitions are single conditional UPDATEs, so concurrent workers never
+    overwrite each other's view of the breaker.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, name: str) -> Optional[Row]:
+        """Return ``(failures, open_until, probe_until)`` of a breaker, or None if never tripped."""
+        res = await self.session.execute(
+            select(
+                CircuitBreakerState.failures,
+                CircuitBreakerState.open_until,
+                CircuitBreakerState.probe_until,
+            ).where(CircuitBreakerState.name == name)
+        )
+        return res.one_or_none()
+
+    async def claim_probe(self, name: str, now: datetime, lease_until: datetime) -> bool:
+        """Take the half-open probe lease if the cooldown is over and nobody holds it."""
+        res = await self.session.execute(
+            update(CircuitBreakerState)
+            .where(
+                CircuitBreakerState.name == name,
+                CircuitBreakerState.open_until <= now,
+                or_(
+                    CircuitBreakerState.probe_until.is_(None),
+                    CircuitBreakerState.probe_until <= now,
+                ),
+            )
+            .values(probe_until=lease_until)
+            .returning(CircuitBreakerState.name)
+            .execution_options(synchronize_session=False)
+        )
+        return res.first() is not None
+
+    async def record_failure(
+        self, name: str, threshold: int, open_until: datetime, probe: bool = False
+    ) -> None:
+        """Count a failure; open (or re-open) the breaker once `threshold` is reached.
+
+        Only a failed `probe` drops the probe lease; a call that was already in
+        flight when the breaker went half-open leaves the current probe alone.
+        """
+        failures = CircuitBreakerState.failures + 1
+        stmt = (
+            update(CircuitBreakerState)
+            .where(CircuitBreakerState.name == name)
+            .values(
+                failures=failures,
+                open_until=case(
+                    (failures >= threshold, open_until), else_=CircuitBreakerState.open_until
+                ),
+            )
+        )
+        if probe:
+            stmt = stmt.values(probe_until=None)
+        res = await self.session.execute(
+            stmt.returning(CircuitBreakerState.name).execution_options(synchronize_session=False)
+        )
+        if res.first() is not None:
+            return
+        try:
+            async with self.session.begin_nested():
+                self.session.add(
+                    CircuitBreakerState(
+                        name=name, failures=1, open_until=open_until if threshold <= 1 else None
+                    )
+                )
+        except IntegrityError:
+            # Another worker created the row first; count on top of it
+            await self.record_failure(name, threshold, open_until, probe)
+
+    async def release_probe(self, name: str) -> None:
+        """Drop the probe lease without a verdict so another worker can probe."""
+        await self.session.execute(
+            update(CircuitBreakerState)
+            .where(CircuitBreakerState.name == name)
+            .values(probe_until=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def reset(self, name: str) -> None:
+        """Close the breaker and clear its failure count."""
+        await self.session.execute(
+            update(CircuitBreakerState)
+            .where(CircuitBreakerState.name == name)
+            .values(failures=0, open_until=None, probe_until=None)
+            .execution_options(synchronize_session=False)
+        )
@@ -2,12 +2,48 @@ from __future__ import annotations
 
 """Repository for `ResumeImprovement` aggregate."""
 
-from typing import List, Optional, Tuple
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, and_, func, literal, null, or_, select, true, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
 
+from app.db.functions import sha256_hex
 from app.models import ImprovementStatus, Resume, ResumeImprovement
+from app.models._types import utcnow
+from app.repositories._pagination import fetch_page
+from app.utils.hashing import content_hash
+from app.utils.pagination import Page
+
+# INSERT constructs with ON CONFLICT support, by dialect
+_DIALECT_INSERT = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+# Transaction-level advisory lock serializing fair and capped claims on PostgreSQL
+_CLAIM_LOCK_KEY = 0x524C_5155  # "RLQU"
+
+
+def _oldest_per_user(runnable, per_user: Optional[int]):
+    """Runnable jobs as ``(id, created_at, user_id)``; with `per_user`, only each user's oldest.
+
+    The bounded form needs LATERAL (PostgreSQL): each user with runnable work
+    gets an ordered scan that stops after `per_user` rows, so the window
+    function above it sees at most users x `per_user` rows.
+    """
+    columns = (ResumeImprovement.id, ResumeImprovement.created_at, Resume.user_id)
+    jobs = select(*columns).join(Resume, Resume.id == ResumeImprovement.resume_id).where(runnable)
+    if per_user is None:
+        return jobs.subquery()
+    users = jobs.with_only_columns(Resume.user_id).distinct().subquery()
+    oldest = (
+        jobs.where(Resume.user_id == users.c.user_id)
+        .order_by(ResumeImprovement.created_at, ResumeImprovement.id)
+        .limit(per_user)
+        .lateral()
+    )
+    return select(oldest).select_from(users.join(oldest, true())).subquery()
 
 
 class ImprovementRepository:
@@ -16,62 +52,460 @@ class ImprovementRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def create_queued(self, resume_id: str, old_content: str) -> ResumeImprovement:
+    async def create_queued(
+        self,
+        resume_id: str,
+        old_content: str,
+        task_id: Optional[str] = None,
+        dedup: bool = True,
+    ) -> ResumeImprovement:
         """Create a queued improvement for a resume.
 
+        `task_id` is the pre-generated Celery task id the job will be published with.
+        With `dedup` the content hash is stored, so the flush raises `IntegrityError`
+        if the same content is already queued or processing for this resume.
         Returns the newly created `ResumeImprovement` persisted to the DB.
         """
         imp = ResumeImprovement(
-            resume_id=resume_id, status=ImprovementStatus.queued, old_content=old_content
+            resume_id=resume_id,
+            status=ImprovementStatus.queued,
+            old_content=old_content,
+            content_hash=content_hash(old_content) if dedup else None,
+            task_id=task_id,
         )
         self.session.add(imp)
-        await self.session.flush()
-        await self.session.refresh(imp)
+        await self.session.flush()  # server defaults come back via RETURNING
         return imp
 
-    async def set_task_id(self, imp: ResumeImprovement, task_id: str) -> None:
-        """Attach Celery task id to improvement and persist."""
-        imp.task_id = task_id
-        self.session.add(imp)
-        await self.session.flush()
+    async def enqueue_owned(
+        self, resume_id: str, user_id: str, task_id: Optional[str], dedup: bool = True
+    ) -> Optional[uuid.UUID]:
+        """Queue an improvement of the user's resume in one ``INSERT ... SELECT`` statement.
+
+        The ownership check, the copy of the resume text, its content hash and
+        the pre-generated `task_id` all happen in the database. With `dedup`,
+        an active job with the same content makes the insert a no-op through
+        ``ON CONFLICT DO NOTHING`` on the partial unique index. Returns the new
+        id, or None when the resume is not the user's or the content is
+        already queued or processing.
+        """
+        new_id = uuid.uuid4()
+        source = select(
+            literal(new_id, ResumeImprovement.id.type),
+            Resume.id,
+            literal(task_id, ResumeImprovement.task_id.type),
+            literal(ImprovementStatus.queued, ResumeImprovement.status.type),
+            Resume.content,
+            sha256_hex(Resume.content) if dedup else null(),
+            literal(utcnow(), ResumeImprovement.created_at.type),
+        ).where(Resume.id == resume_id, Resume.user_id == user_id)
+        insert = _DIALECT_INSERT[self.session.get_bind().dialect.name]
+        stmt = (
+            insert(ResumeImprovement)
+            .from_select(
+                [
+                    "id",
+                    "resume_id",
+                    "task_id",
+                    "status",
+                    "old_content",
+                    "content_hash",
+                    "created_at",
+                ],
+                source,
+            )
+            # No conflict target: the active-content index is the only unique constraint a
+            # fresh uuid can hit, and SQLite would need its partial WHERE repeated verbatim
+            .on_conflict_do_nothing()
+            .returning(ResumeImprovement.id)
+        )
+        res = await self.session.execute(stmt)
+        return res.scalar_one_or_none()
 
     async def get_owned(self, improvement_id: str, user_id: str) -> Optional[ResumeImprovement]:
         """Fetch improvement by id ensuring it belongs to the user via resume ownership."""
         q = (
             select(ResumeImprovement)
+            .options(undefer_group("content"))
             .join(Resume, Resume.id == ResumeImprovement.resume_id)
             .where(ResumeImprovement.id == improvement_id, Resume.user_id == user_id)
         )
         res = await self.session.execute(q)
         return res.scalar_one_or_none()
 
+    async def is_owned(self, improvement_id: str, user_id: str) -> bool:
+        """Check that the improvement exists and belongs to the user without loading it."""
+        q = (
+            select(ResumeImprovement.id)
+            .join(Resume, Resume.id == ResumeImprovement.resume_id)
+            .where(ResumeImprovement.id == improvement_id, Resume.user_id == user_id)
+        )
+        res = await self.session.execute(q)
+        return res.first() is not None
+
     async def list_for_resume(
-        self, resume_id: str, limit: int, offset: int
-    ) -> Tuple[List[ResumeImprovement], int]:
-        """List improvements for a resume with total count for pagination."""
-        base = select(ResumeImprovement).where(ResumeImprovement.resume_id == resume_id)
-        total_res = await self.session.execute(select(func.count()).select_from(base.subquery()))
-        total = int(total_res.scalar_one())
-        rows_res = await self.session.execute(
-            base.order_by(ResumeImprovement.created_at.desc()).limit(limit).offset(offset)
+        self,
+        resume_id: str,
+        limit: int,
+        offset: int = 0,
+        cursor: Optional[Tuple[datetime, uuid.UUID]] = None,
+        with_total: bool = True,
+    ) -> Page[Row]:
+        """List improvements for a resume, newest first, by keyset `cursor` or by `offset`.
+
+        Rows carry only the listing columns, never `old_content`/`new_content`.
+        """
+        return await fetch_page(
+            self.session,
+            select(
+                ResumeImprovement.id,
+                ResumeImprovement.status,
+                ResumeImprovement.applied,
+                ResumeImprovement.created_at,
+            ).where(ResumeImprovement.resume_id == resume_id),
+            ResumeImprovement.created_at,
+            ResumeImprovement.id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            with_total=with_total,
         )
-        return list(rows_res.scalars().all()), total
 
     async def get_by_id(self, improvement_id: str) -> Optional[ResumeImprovement]:
         """Get improvement by primary key."""
         res = await self.session.execute(
-            select(ResumeImprovement).where(ResumeImprovement.id == improvement_id)
+            select(ResumeImprovement)
+            .options(undefer_group("content"))
+            .where(ResumeImprovement.id == improvement_id)
         )
         return res.scalar_one_or_none()
 
-    async def find_active_duplicate(
-        self, resume_id: str, old_content: str
-    ) -> Optional[ResumeImprovement]:
-        """Return queued/processing improvement for the same resume/content."""
-        q = select(ResumeImprovement).where(
+    async def supersede_queued(self, resume_id: str, keep: Optional[str] = None) -> List[Row]:
+        """Mark the resume's still-queued improvements, except `keep`, superseded in one statement.
+
+        Returns ``(id, task_id)`` rows of the superseded jobs so their tasks can be revoked.
+        """
+        q = update(ResumeImprovement).where(
             ResumeImprovement.resume_id == resume_id,
-            ResumeImprovement.old_content == old_content,
-            ResumeImprovement.status.in_([ImprovementStatus.queued, ImprovementStatus.processing]),
+            ResumeImprovement.status == ImprovementStatus.queued,
+        )
+        if keep is not None:
+            q = q.where(ResumeImprovement.id != keep)
+        res = await self.session.execute(
+            q.values(status=ImprovementStatus.superseded, finished_at=utcnow())
+            .returning(ResumeImprovement.id, ResumeImprovement.task_id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(res.all())
+
+    async def cancel_owned(self, improvement_id: str, user_id: str) -> Optional[Row]:
+        """Cancel a queued or processing improvement owned by the user in one statement.
+
+        Returns the ``(id, task_id)`` row, or None when the improvement does not
+        exist, is not the user's, or has already finished.
+        """
+        owned_resumes = select(Resume.id).where(Resume.user_id == user_id)
+        res = await self.session.execute(
+            update(ResumeImprovement)
+            .where(
+                ResumeImprovement.id == improvement_id,
+                ResumeImprovement.resume_id.in_(owned_resumes),
+                ResumeImprovement.status.in_(
+                    [ImprovementStatus.queued, ImprovementStatus.processing]
+                ),
+            )
+            .values(status=ImprovementStatus.cancelled, finished_at=utcnow())
+            .returning(ResumeImprovement.id, ResumeImprovement.task_id)
+            .execution_options(synchronize_session=False)
+        )
+        return res.one_or_none()
+
+    async def start_processing(
+        self, improvement_id: str, lease_seconds: float, attempt: Optional[int] = None
+    ) -> Optional[Row]:
+        """Claim a job for processing in one ``UPDATE ... RETURNING`` statement.
+
+        Queued jobs are claimed and leased for `lease_seconds`. A processing
+        job is claimed only when its lease ran out (its worker died and the
+        message was redelivered) or, with `attempt`, when the database job
+        queue already leased it for exactly this attempt; the lease is kept
+        then. A second delivery of a job that is still running gets None, as
+        does a job deleted, superseded, cancelled or finished meanwhile.
+        Returns ``(resume_id, old_content)``.
+        """
+        now = utcnow()
+        processing = ResumeImprovement.status == ImprovementStatus.processing
+        owned = and_(
+            processing,
+            or_(ResumeImprovement.lease_until.is_(None), ResumeImprovement.lease_until <= now),
+        )
+        values = {"status": ImprovementStatus.processing, "started_at": now}
+        if attempt is not None:
+            owned = or_(owned, and_(processing, ResumeImprovement.attempts == attempt))
+        else:
+            values["lease_until"] = now + timedelta(seconds=lease_seconds)
+        res = await self.session.execute(
+            update(ResumeImprovement)
+            .where(
+                ResumeImprovement.id == improvement_id,
+                or_(ResumeImprovement.status == ImprovementStatus.queued, owned),
+            )
+            .values(**values)
+            .returning(ResumeImprovement.resume_id, ResumeImprovement.old_content)
+            .execution_options(synchronize_session=False)
+        )
+        return res.one_or_none()
+
+    async def requeue(self, improvement_id: str) -> bool:
+        """Put a processing job back to queued, e.g. while it waits for the LLM circuit."""
+        res = await self.session.execute(
+            update(ResumeImprovement)
+            .where(
+                ResumeImprovement.id == improvement_id,
+                ResumeImprovement.status == ImprovementStatus.processing,
+            )
+            .values(status=ImprovementStatus.queued, started_at=None)
+            .returning(ResumeImprovement.id)
+            .execution_options(synchronize_session=False)
+        )
+        return res.first() is not None
+
+    async def complete(
+        self,
+        improvement_id: str,
+        new_content: str,
+        section_results: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Optional[uuid.UUID]:
+        """Mark a processing job done and applied; return its resume id.
+
+        Returns None, changing nothing, when the job was deleted, cancelled or
+        superseded while it was processing.
+        """
+        res = await self.session.execute(
+            update(ResumeImprovement)
+            .where(
+                ResumeImprovement.id == improvement_id,
+                ResumeImprovement.status == ImprovementStatus.processing,
+            )
+            .values(
+                status=ImprovementStatus.done,
+                new_content=new_content,
+                section_results=section_results,
+                applied=True,
+                finished_at=utcnow(),
+            )
+            .returning(ResumeImprovement.resume_id)
+            .execution_options(synchronize_session=False)
         )
-        res = await self.session.execute(q)
         return res.scalar_one_or_none()
+
+    async def mark_failed(self, improvement_id: str, error: str) -> bool:
+        """Fail a queued or processing job; a cancelled or finished one is left as is."""
+        res = await self.session.execute(
+            update(ResumeImprovement)
+            .where(
+                ResumeImprovement.id == improvement_id,
+                ResumeImprovement.status.in_(
+                    [ImprovementStatus.queued, ImprovementStatus.processing]
+                ),
+            )
+            .values(status=ImprovementStatus.failed, error=error, finished_at=utcnow())
+            .returning(ResumeImprovement.id)
+            .execution_options(synchronize_session=False)
+        )
+        return res.first() is not None
+
+    async def claim_batch(
+        self, limit: int, lease_seconds: float, fair: bool = True, per_user_limit: int = 0
+    ) -> List[Row]:
+        """Lease up to `limit` runnable jobs for the database job queue and mark them processing.
+
+        Runnable means queued or processing with no live lease, so a job whose
+        worker died becomes visible again once its lease expires. With `fair`,
+        users take turns: a job's turn is its user's running jobs plus its
+        place in that user's line, and lower turns go first, so a flood from
+        one user does not delay the others. Otherwise jobs go oldest first.
+        A positive `per_user_limit` caps a user's running jobs (processing
+        with a live lease) across all workers.
+
+        On PostgreSQL ``FOR UPDATE SKIP LOCKED`` lets concurrent oldest-first
+        claimers take disjoint batches without waiting on each other. Fair and
+        capped claims are serialized with an advisory lock instead: the ranking
+        cannot be locked, so concurrent claimers would rank the same top jobs
+        and all but one would skip them and come back empty, and two claimers
+        counting the same running jobs could together exceed the cap. Returns
+        ``(id, attempts)`` rows; `attempts` already counts this claim.
+
+        Only each user's oldest `limit` runnable jobs are ranked: a job further
+        back in its user's line has at least `limit` jobs ahead of it and can
+        never be picked. On PostgreSQL they are read per user with LATERAL, so
+        the ranking under the lock does not sort the whole backlog; other
+        backends rank every runnable job.
+        """
+        ranked = fair or per_user_limit > 0
+        postgresql = self.session.get_bind().dialect.name == "postgresql"
+        if ranked and postgresql:
+            await self.session.execute(select(func.pg_advisory_xact_lock(_CLAIM_LOCK_KEY)))
+        now = utcnow()
+        active = ResumeImprovement.status.in_(
+            [ImprovementStatus.queued, ImprovementStatus.processing]
+        )
+        runnable = and_(
+            active,
+            or_(ResumeImprovement.lease_until.is_(None), ResumeImprovement.lease_until <= now),
+        )
+        if ranked:
+            running = (
+                select(Resume.user_id, func.count().label("jobs"))
+                .join(ResumeImprovement, ResumeImprovement.resume_id == Resume.id)
+                .where(
+                    ResumeImprovement.status == ImprovementStatus.processing,
+                    ResumeImprovement.lease_until > now,
+                )
+                .group_by(Resume.user_id)
+                .subquery()
+            )
+            waiting = _oldest_per_user(runnable, limit if postgresql else None)
+            # A user's turn for each waiting job: jobs already running plus its place in line
+            turn = func.coalesce(running.c.jobs, 0) + func.row_number().over(
+                partition_by=waiting.c.user_id,
+                order_by=(waiting.c.created_at, waiting.c.id),
+            )
+            candidates = (
+                select(waiting.c.id, waiting.c.created_at, turn.label("turn"))
+                .outerjoin(running, running.c.user_id == waiting.c.user_id)
+                .subquery()
+            )
+            picked = select(candidates.c.id)
+            if per_user_limit > 0:
+                picked = picked.where(candidates.c.turn <= per_user_limit)
+            if fair:
+                picked = picked.order_by(candidates.c.turn, candidates.c.created_at)
+            else:
+                picked = picked.order_by(candidates.c.created_at)
+            # Window functions cannot be locked directly: lock the picked rows one level up
+            claimable = (
+                select(ResumeImprovement.id)
+                .where(ResumeImprovement.id.in_(picked.limit(limit).scalar_subquery()))
+                .with_for_update(skip_locked=True)
+            )
+        else:
+            claimable = (
+                select(ResumeImprovement.id)
+                .where(runnable)
+                .order_by(ResumeImprovement.created_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+        res = await self.session.execute(
+            update(ResumeImprovement)
+            # Re-checked under the row lock, so a row claimed meanwhile is not taken twice
+            .where(ResumeImprovement.id.in_(claimable.scalar_subquery()), runnable)
+            .values(
+                status=ImprovementStatus.processing,
+                lease_until=now + timedelta(seconds=lease_seconds),
+                attempts=ResumeImprovement.attempts + 1,
+            )
+            .returning(ResumeImprovement.id, ResumeImprovement.attempts)
+            .execution_options(synchronize_session=False)
+        )
+        return list(res.all())
+
+    async def extend_leases(self, improvement_ids: Iterable[str], lease_seconds: float) -> int:
+        """Push the lease of running jobs forward; return how many were extended.
+
+        Only ``processing`` rows are touched: a job just rescheduled by
+        `schedule_retry` is queued again, and its lease holds the backoff delay.
+        """
+        ids = list(improvement_ids)
+        if not ids:
+            return 0
+        res = await self.session.execute(
+            update(ResumeImprovement)
+            .where(
+                ResumeImprovement.id.in_(ids),
+                ResumeImprovement.status == ImprovementStatus.processing,
+            )
+            .values(lease_until=utcnow() + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        return res.rowcount
+
+    async def release_leases(self, improvement_ids: Iterable[str]) -> int:
+        """Hand interrupted jobs back to the queue at once, refunding the interrupted attempt."""
+        ids = list(improvement_ids)
+        if not ids:
+            return 0
+        res = await self.session.execute(
+            update(ResumeImprovement)
+            .where(
+                ResumeImprovement.id.in_(ids),
+                ResumeImprovement.status.in_(
+                    [ImprovementStatus.queued, ImprovementStatus.processing]
+                ),
+            )
+            .values(
+                status=ImprovementStatus.queued,
+                lease_until=None,
+                attempts=ResumeImprovement.attempts - 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return res.rowcount
+
+    async def schedule_retry(self, improvement_id: str, delay: float, attempts: int) -> bool:
+        """Queue an active job again, hidden from claimers for `delay` seconds.
+
+        `attempts` replaces the attempt count (the next claim adds one).
+        """
+        res = await self.session.execute(
+            update(ResumeImprovement)
+            .where(
+                ResumeImprovement.id == improvement_id,
+                ResumeImprovement.status.in_(
+                    [ImprovementStatus.queued, ImprovementStatus.processing]
+                ),
+            )
+            .values(
+                status=ImprovementStatus.queued,
+                lease_until=utcnow() + timedelta(seconds=delay),
+                attempts=attempts,
+            )
+            .returning(ResumeImprovement.id)
+            .execution_options(synchronize_session=False)
+        )
+        return res.first() is not None
+
+    async def last_section_results(self, resume_id: str) -> Optional[Dict[str, Optional[str]]]:
+        """Return the section memo of the resume's latest done improvement, if it has one."""
+        res = await self.session.execute(
+            select(ResumeImprovement.section_results)
+            .where(
+                ResumeImprovement.resume_id == resume_id,
+                ResumeImprovement.status == ImprovementStatus.done,
+                ResumeImprovement.section_results.is_not(None),
+            )
+            .order_by(ResumeImprovement.created_at.desc())
+            .limit(1)
+        )
+        return res.scalar_one_or_none()
+
+    async def set_sections_progress(
+        self, improvement_id: str, done: int, total: Optional[int] = None
+    ) -> None:
+        """Record section progress without loading the row.
+
+        Passing `total` starts a run and resets the counters. Otherwise
+        `sections_done` only moves forward.
+        """
+        q = update(ResumeImprovement).where(ResumeImprovement.id == improvement_id)
+        if total is not None:
+            q = q.values(sections_total=total, sections_done=done)
+        else:
+            q = q.where(
+                or_(
+                    ResumeImprovement.sections_done.is_(None),
+                    ResumeImprovement.sections_done < done,
+                )
+            ).values(sections_done=done)
+        await self.session.execute(q.execution_options(synchronize_session=False))
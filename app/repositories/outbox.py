@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+"""Repository for transactional outbox messages."""
+
+from typing import List, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import OutboxMessage
+
+OUTBOX_KIND_ENQUEUE = "enqueue"
+OUTBOX_KIND_REVOKE = "revoke"
+
+
+class OutboxRepository:
+    """Data access layer for outbox messages."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, kind: str, improvement_id: str, task_id: str) -> None:
+        """Record a message to publish once the current transaction commits."""
+        self.session.add(OutboxMessage(kind=kind, improvement_id=improvement_id, task_id=task_id))
+        await self.session.flush()
+
+    async def claim_batch(self, limit: int) -> List[OutboxMessage]:
+        """Lock and return the oldest pending messages.
+
+        `SKIP LOCKED` lets several relays drain the table concurrently on
+        PostgreSQL; other backends ignore the locking clause.
+        """
+        res = await self.session.execute(
+            select(OutboxMessage)
+            .order_by(OutboxMessage.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(res.scalars().all())
+
+    async def delete_many(self, ids: Sequence[str]) -> None:
+        """Delete published messages."""
+        await self.session.execute(delete(OutboxMessage).where(OutboxMessage.id.in_(ids)))
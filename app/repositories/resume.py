@@ -2,12 +2,17 @@ from __future__ import annotations
 
 """Repository for `Resume` aggregate."""
 
-from typing import List, Optional, Tuple
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.models import Resume
+from app.repositories._pagination import fetch_page
+from app.utils.pagination import Page
 
 
 class ResumeRepository:
@@ -20,41 +25,94 @@ class ResumeRepository:
         """Create and persist a resume for the given user."""
         resume = Resume(user_id=user_id, title=title, content=content)
         self.session.add(resume)
-        await self.session.flush()
-        await self.session.refresh(resume)
+        await self.session.flush()  # server timestamps come back via RETURNING
         return resume
 
     async def get_owned(self, resume_id: str, user_id: str) -> Optional[Resume]:
         """Fetch resume by id ensuring it belongs to the user."""
         result = await self.session.execute(
-            select(Resume).where(Resume.id == resume_id, Resume.user_id == user_id)
+            select(Resume)
+            .options(undefer(Resume.content))
+            .where(Resume.id == resume_id, Resume.user_id == user_id)
         )
         return result.scalar_one_or_none()
 
+    async def is_owned(self, resume_id: str, user_id: str) -> bool:
+        """Check that the resume exists and belongs to the user without loading it."""
+        res = await self.session.execute(
+            select(Resume.id).where(Resume.id == resume_id, Resume.user_id == user_id)
+        )
+        return res.first() is not None
+
     async def get_by_id(self, resume_id: str) -> Optional[Resume]:
         """Fetch resume by primary key."""
-        result = await self.session.execute(select(Resume).where(Resume.id == resume_id))
+        result = await self.session.execute(
+            select(Resume).options(undefer(Resume.content)).where(Resume.id == resume_id)
+        )
         return result.scalar_one_or_none()
 
-    async def list_owned(self, user_id: str, limit: int, offset: int) -> Tuple[List[Resume], int]:
-        """List resumes for a user along with total count for pagination."""
-        base = select(Resume).where(Resume.user_id == user_id)
-        total_res = await self.session.execute(select(func.count()).select_from(base.subquery()))
-        total = int(total_res.scalar_one())
-        rows_res = await self.session.execute(
-            base.order_by(Resume.created_at.desc()).limit(limit).offset(offset)
+    async def list_owned(
+        self,
+        user_id: str,
+        limit: int,
+        offset: int = 0,
+        cursor: Optional[Tuple[datetime, uuid.UUID]] = None,
+        with_total: bool = True,
+    ) -> Page[Row]:
+        """List resumes for a user, newest first, by keyset `cursor` or by `offset`.
+
+        Rows carry only the listing columns (id, title, timestamps), never `content`.
+        """
+        return await fetch_page(
+            self.session,
+            select(Resume.id, Resume.title, Resume.created_at, Resume.updated_at).where(
+                Resume.user_id == user_id
+            ),
+            Resume.created_at,
+            Resume.id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            with_total=with_total,
         )
-        return list(rows_res.scalars().all()), total
 
-    async def update(self, resume: Resume, title: str, content: str) -> Resume:
-        """Update title and content for a resume and persist changes."""
-        resume.title = title
-        resume.content = content
-        self.session.add(resume)
-        await self.session.flush()
-        await self.session.refresh(resume)
-        return resume
+    async def update_owned(
+        self, resume_id: str, user_id: str, title: str, content: str
+    ) -> Optional[Row]:
+        """Update a resume owned by the user in one ``UPDATE ... RETURNING`` statement.
 
-    async def delete(self, resume: Resume) -> None:
-        """Delete the given resume instance."""
-        await self.session.delete(resume)
+        Returns a row with ``id``, ``created_at`` and ``updated_at``, or None if
+        no resume with that id belongs to the user. The old content is never read.
+        """
+        res = await self.session.execute(
+            update(Resume)
+            .where(Resume.id == resume_id, Resume.user_id == user_id)
+            .values(title=title, content=content)
+            .returning(Resume.id, Resume.created_at, Resume.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        return res.one_or_none()
+
+    async def set_content(self, resume_id: str, content: str) -> bool:
+        """Replace the resume text without loading it; return whether the resume exists."""
+        res = await self.session.execute(
+            update(Resume)
+            .where(Resume.id == resume_id)
+            .values(content=content)
+            .returning(Resume.id)
+            .execution_options(synchronize_session=False)
+        )
+        return res.first() is not None
+
+    async def delete_owned(self, resume_id: str, user_id: str) -> bool:
+        """Delete a resume owned by the user in one statement; return whether it existed.
+
+        Improvements go with it through the database ``ON DELETE CASCADE``.
+        """
+        res = await self.session.execute(
+            delete(Resume)
+            .where(Resume.id == resume_id, Resume.user_id == user_id)
+            .returning(Resume.id)
+            .execution_options(synchronize_session=False)
+        )
+        return res.first() is not None
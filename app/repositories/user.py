@@ -4,14 +4,19 @@ from __future__ import annotations
 
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.auth_cache import auth_cache
 from app.models import User
 
 
 class UserRepository:
-    """Data access layer for users."""
+    """Data access layer for users.
+
+    Methods that delete users evict them from `auth_cache` themselves: Core
+    statements bypass the ORM ``after_delete`` hook.
+    """
 
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -30,6 +35,12 @@ class UserRepository:
         """Create and persist a new user with given email and password hash."""
         user = User(email=email, password_hash=password_hash)
         self.session.add(user)
-        await self.session.flush()
-        await self.session.refresh(user)
+        await self.session.flush()  # created_at comes back via RETURNING
         return user
+
+    async def delete(self, user_id: str) -> bool:
+        """Delete a user (their resumes cascade); return whether a row was removed."""
+        res = await self.session.execute(delete(User).where(User.id == user_id))
+        # Evicted before commit: a rollback only costs one extra SELECT on the next request
+        auth_cache.invalidate_user(str(user_id))
+        return res.rowcount > 0
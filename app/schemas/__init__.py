@@ -1,6 +1,7 @@
 from .auth import LoginRequest, RegisterRequest, TokenResponse, UserOut
 from .error import ErrorDetail, ErrorResponse
 from .improvement import (
+    ImprovementCancelledResponse,
     ImprovementListItem,
     ImprovementListResponse,
     ImprovementOut,
@@ -24,6 +25,7 @@ __all__ = [
     "ImprovementOut",
     "ImprovementStatusLiteral",
     "ImprovementQueuedResponse",
+    "ImprovementCancelledResponse",
     "ImprovementListItem",
     "ImprovementListResponse",
 ]
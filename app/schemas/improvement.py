@@ -5,7 +5,9 @@ from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
-ImprovementStatusLiteral = Literal["queued", "processing", "done", "failed"]
+ImprovementStatusLiteral = Literal[
+    "queued", "processing", "done", "failed", "superseded", "cancelled"
+]
 
 
 class ImprovementQueuedResponse(BaseModel):
@@ -13,6 +15,11 @@ class ImprovementQueuedResponse(BaseModel):
     status: ImprovementStatusLiteral
 
 
+class ImprovementCancelledResponse(BaseModel):
+    improvement_id: str
+    status: Literal["cancelled"]
+
+
 class ImprovementOut(BaseModel):
     id: str
     resume_id: str
@@ -24,6 +31,8 @@ class ImprovementOut(BaseModel):
     created_at: datetime
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
+    sections_total: Optional[int] = None
+    sections_done: Optional[int] = None
 
 
 class ImprovementListItem(BaseModel):
@@ -35,6 +44,7 @@ class ImprovementListItem(BaseModel):
 
 class ImprovementListResponse(BaseModel):
     items: List[ImprovementListItem]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -33,6 +33,7 @@ class ResumeListItem(BaseModel):
 
 class ResumeListResponse(BaseModel):
     items: List[ResumeListItem]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
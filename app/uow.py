@@ -7,7 +7,13 @@ from typing import AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import AsyncSessionLocal
-from app.repositories import ImprovementRepository, ResumeRepository, UserRepository
+from app.repositories import (
+    CircuitBreakerRepository,
+    ImprovementRepository,
+    OutboxRepository,
+    ResumeRepository,
+    UserRepository,
+)
 
 
 class UnitOfWork:
@@ -18,6 +24,8 @@ class UnitOfWork:
         self.users = UserRepository(session)
         self.resumes = ResumeRepository(session)
         self.improvements = ImprovementRepository(session)
+        self.outbox = OutboxRepository(session)
+        self.circuit_breakers = CircuitBreakerRepository(session)
 
     async def commit(self):
         """Commit the current transaction."""
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+"""Stable content hashing helpers."""
+
+import hashlib
+
+
+def content_hash(*parts: str) -> str:
+    """Return hex SHA-256 of the given text parts joined by NUL separators."""
+    digest = hashlib.sha256()
+    for i, part in enumerate(parts):
+        if i:
+            digest.update(b"\0")
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-"""Helpers for pagination parameters normalization."""
+"""Helpers for pagination parameters normalization and keyset cursors."""
 
-from typing import Tuple
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
 
 
 def parse_pagination(limit: int = 20, offset: int = 0) -> Tuple[int, int]:
@@ -14,3 +21,32 @@ def parse_pagination(limit: int = 20, offset: int = 0) -> Tuple[int, int]:
     limit = max(1, min(100, limit or 20))
     offset = max(0, offset or 0)
     return limit, offset
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a listing ordered by ``(created_at, id)`` descending.
+
+    `total` is None when the caller did not ask for an exact count;
+    `next_cursor` is None on the last page.
+    """
+
+    items: List[T]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(created_at: datetime, item_id: Any) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    raw = json.dumps([created_at.isoformat(), str(item_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by `encode_cursor`; raise ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), uuid.UUID(item_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("invalid cursor") from e
@@ -0,0 +1,33 @@
+"""Environment bootstrap shared by benchmarks; import before any `app` module."""
+
+from __future__ import annotations
+
+import atexit
+import os
+import tempfile
+
+_fd, DB_PATH = tempfile.mkstemp(prefix="bench_resumelab", suffix=".db")
+os.close(_fd)
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{DB_PATH}")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-not-for-production-use")
+os.environ.setdefault("RABBITMQ_URL", "memory://")
+os.environ.setdefault("CORS_ORIGINS", '["*"]')
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "true")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+
+@atexit.register
+def _cleanup() -> None:
+    try:
+        os.remove(DB_PATH)
+    except OSError:
+        pass
+
+
+async def create_schema() -> None:
+    """Create all tables in the benchmark database."""
+    from app.db.base import Base  # noqa: WPS433
+    from app.db.session import engine  # noqa: WPS433
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
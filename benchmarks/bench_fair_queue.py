@@ -0,0 +1,158 @@
+"""Benchmark: wait time of light users while a heavy user floods the database job queue.
+
+A simulation on the real queue: one heavy user enqueues ``--heavy`` jobs at
+once, then ``--light-users`` light users each enqueue ``--light-jobs`` jobs,
+one every ``--light-interval`` seconds. Each job sleeps for ``--llm-delay``
+seconds in place of the LLM call. A single worker with ``--concurrency``
+slots drains the queue. The run is repeated for three claim policies:
+
+* ``fifo``: oldest job first, the old single-queue behaviour;
+* ``fair``: users take turns (``DBQUEUE_FAIR``);
+* ``fair+cap``: turns plus a per-user running cap of ``--cap`` (``DBQUEUE_USER_CONCURRENCY``).
+
+For each policy the benchmark prints the light users' enqueue-to-start wait
+(p50/p95) and the time until the heavy user's backlog is done.
+
+Usage::
+
+    python -m benchmarks.bench_fair_queue --heavy 300 --light-users 5 --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+# isort: off
+from benchmarks._env import create_schema  # sets env defaults before app imports
+
+# isort: on
+from sqlalchemy import select
+
+from app.celery_app import tasks
+from app.celery_app.db_queue import DBQueueWorker
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, engine
+from app.models import ImprovementStatus, Resume, ResumeImprovement, User
+from app.uow import UnitOfWork
+
+POLICIES = {"fifo": (False, 0), "fair": (True, 0), "fair+cap": (True, None)}
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _create_user(jobs: int) -> List[tuple]:
+    """Create a user with `jobs` resumes; return ``(resume_id, user_id)`` pairs."""
+    async with AsyncSessionLocal() as session:
+        user = User(email=f"fair-{uuid.uuid4().hex}@example.com", password_hash="x")
+        session.add(user)
+        await session.flush()
+        resumes = [
+            Resume(user_id=user.id, title="CV", content=uuid.uuid4().hex) for _ in range(jobs)
+        ]
+        session.add_all(resumes)
+        await session.commit()
+        return [(str(r.id), str(user.id)) for r in resumes]
+
+
+async def _enqueue(pairs: List[tuple]) -> List[str]:
+    async with AsyncSessionLocal() as session:
+        uow = UnitOfWork(session)
+        ids = [
+            str(await uow.improvements.enqueue_owned(resume_id, user_id, None, dedup=False))
+            for resume_id, user_id in pairs
+        ]
+        await uow.commit()
+        return ids
+
+
+async def _timings(ids: List[str]) -> Dict[str, tuple]:
+    """Wait until all jobs are done; return ``id -> (created_at, started_at, finished_at)``."""
+    while True:
+        async with AsyncSessionLocal() as session:
+            res = await session.execute(
+                select(
+                    ResumeImprovement.id,
+                    ResumeImprovement.status,
+                    ResumeImprovement.created_at,
+                    ResumeImprovement.started_at,
+                    ResumeImprovement.finished_at,
+                ).where(ResumeImprovement.id.in_(ids))
+            )
+            rows = res.all()
+        if all(row.status == ImprovementStatus.done for row in rows):
+            return {str(row.id): (row.created_at, row.started_at, row.finished_at) for row in rows}
+        await asyncio.sleep(0.1)
+
+
+async def _run_policy(name: str, args) -> None:
+    fair, cap = POLICIES[name]
+    heavy_pairs = await _create_user(args.heavy)
+    light_pairs = [await _create_user(args.light_jobs) for _ in range(args.light_users)]
+    worker = DBQueueWorker(
+        concurrency=args.concurrency,
+        batch_size=args.concurrency,
+        poll_interval=0.2,
+        fair=fair,
+        per_user_limit=args.cap if cap is None else cap,
+    )
+
+    started = time.perf_counter()
+    heavy_ids = await _enqueue(heavy_pairs)
+    worker.start()
+    light_ids: List[str] = []
+    for i in range(args.light_jobs):
+        light_ids += await _enqueue([pairs[i] for pairs in light_pairs])
+        worker.notify()  # in-process wake-up, as in the embedded mode
+        await asyncio.sleep(args.light_interval)
+    timings = await _timings(heavy_ids + light_ids)
+    await worker.close()
+
+    waits = [(timings[i][1] - timings[i][0]).total_seconds() * 1000 for i in light_ids]
+    first = min(timings[i][0] for i in heavy_ids)
+    heavy_done = max(timings[i][2] for i in heavy_ids)
+    print(
+        f"{name:<10}{statistics.median(waits):>12.0f}{_percentile(waits, 0.95):>12.0f}"
+        f"{(heavy_done - first).total_seconds():>14.2f}{time.perf_counter() - started:>10.2f}"
+    )
+
+
+async def main(args) -> None:
+    async def _llm(text: str) -> str:
+        await asyncio.sleep(args.llm_delay)
+        return text
+
+    tasks._llm_improve = _llm
+    settings.IMPROVEMENT_CACHE_BACKEND = "none"
+    await create_schema()
+    print(
+        f"heavy user: {args.heavy} jobs at once; {args.light_users} light users x "
+        f"{args.light_jobs} jobs every {args.light_interval}s; {args.concurrency} slots, "
+        f"llm {args.llm_delay}s, cap {args.cap}, database {engine.dialect.name}"
+    )
+    print(f"{'policy':<10}{'light p50':>12}{'light p95':>12}{'heavy drain':>14}{'total':>10}")
+    print(f"{'':<10}{'ms':>12}{'ms':>12}{'s':>14}{'s':>10}")
+    for name in args.policies:
+        await _run_policy(name, args)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--heavy", type=int, default=300)
+    parser.add_argument("--light-users", type=int, default=5)
+    parser.add_argument("--light-jobs", type=int, default=10)
+    parser.add_argument("--light-interval", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--cap", type=int, default=4)
+    parser.add_argument("--llm-delay", type=float, default=0.05)
+    parser.add_argument("--policies", nargs="+", choices=list(POLICIES), default=list(POLICIES))
+    args = parser.parse_args()
+    asyncio.run(main(args))
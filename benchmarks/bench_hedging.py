@@ -0,0 +1,88 @@
+"""Benchmark: improvement tail latency with and without hedged LLM requests.
+
+Starts the local LLM stub with a heavy-tailed latency distribution
+(log-normal, large sigma) and sends the same load through `HTTPLLMClient`
+directly and wrapped in `HedgedLLMClient`. Prints p50/p95/p99/max latency and
+the hedge and win rates.
+
+Usage::
+
+    python -m benchmarks.bench_hedging --calls 600 --concurrency 16 --latency-ms 50 --sigma 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+# isort: off
+import benchmarks._env  # noqa: F401  sets env defaults before app imports
+
+# isort: on
+from app.llm import HedgedLLMClient, HTTPLLMClient, LLMClient
+from app.llm.stub_server import StubConfig, running_stub
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _run(base_url: str, name: str, args) -> None:
+    client: LLMClient = HTTPLLMClient(
+        base_url=base_url,
+        model="bench",
+        prompt_version="v1",
+        max_concurrency=args.concurrency * 2,
+        max_connections=args.concurrency * 2,
+        pool_shards=8,
+        connect_timeout=5,
+        read_timeout=60,
+    )
+    if name == "hedged":
+        client = HedgedLLMClient(
+            client, percentile=args.percentile, budget=args.budget, min_samples=20
+        )
+    sem = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+
+    async def _call(i: int) -> None:
+        async with sem:
+            started = time.perf_counter()
+            await client.improve(f"section {i}")
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(_call(i) for i in range(args.calls)))
+    await client.aclose()
+    line = (
+        f"{name:<8}{_percentile(latencies, 0.5):>9.1f}{_percentile(latencies, 0.95):>9.1f}"
+        f"{_percentile(latencies, 0.99):>9.1f}{max(latencies):>9.1f}"
+    )
+    if isinstance(client, HedgedLLMClient):
+        line += f"{client.stats.hedge_rate:>9.1%}{client.stats.win_rate:>9.1%}"
+    print(line)
+
+
+def main(args) -> None:
+    config = StubConfig(latency_ms=args.latency_ms, latency_sigma=args.sigma, seed=7)
+    with running_stub(config) as base_url:
+        print(
+            f"{args.calls} calls, concurrency {args.concurrency}, stub median "
+            f"{args.latency_ms:g}ms sigma {args.sigma:g}; latency in ms"
+        )
+        print(f"{'mode':<8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'hedged':>9}{'wins':>9}")
+        for name in ("plain", "hedged"):
+            asyncio.run(_run(base_url, name, args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--sigma", type=float, default=1.0)
+    parser.add_argument("--percentile", type=float, default=0.95)
+    parser.add_argument("--budget", type=float, default=0.1)
+    main(parser.parse_args())
@@ -0,0 +1,103 @@
+"""Benchmark: HTTP LLM client with pooled keep-alive connections vs a new connection per call.
+
+Starts the local LLM stub (`app.llm.stub_server`) on a free port and sends
+the same load through `HTTPLLMClient` three times: ``fresh`` (sharded pool,
+``max_keepalive_connections=0``), ``single`` (keep-alive, one pool) and
+``pooled`` (keep-alive, ``--shards`` pools). Reports throughput, tail latency,
+failures and how many TCP connections the stub accepted. All calls are submitted
+at once, so latency includes waiting for one of the `--concurrency` slots.
+
+Usage::
+
+    python -m benchmarks.bench_llm_client --calls 2000 --concurrency 64 --latency-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import List
+
+# isort: off
+import benchmarks._env  # noqa: F401  sets env defaults before app imports
+
+# isort: on
+import httpx
+
+from app.llm import HTTPLLMClient, LLMError
+from app.llm.stub_server import StubConfig, running_stub
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _run(base_url: str, name: str, args) -> None:
+    client = HTTPLLMClient(
+        base_url=base_url,
+        model="bench",
+        prompt_version="v1",
+        max_concurrency=args.concurrency,
+        max_connections=args.concurrency,
+        pool_shards=args.shards if name != "single" else 1,
+        connect_timeout=5,
+        read_timeout=args.read_timeout,
+        max_keepalive_connections=0 if name == "fresh" else None,
+    )
+    httpx.delete(f"{base_url}/stats")
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+
+    async def _call(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            await client.improve(f"section {i}")
+            outcomes["ok"] += 1
+        except LLMError as e:
+            outcomes[type(e).__name__] += 1
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_call(i) for i in range(args.calls)))
+    elapsed = time.perf_counter() - started
+    await client.aclose()
+    connections = httpx.get(f"{base_url}/stats").json().get("connections", 0)
+    print(
+        f"{name:<8}{args.calls / elapsed:>10.0f}{_percentile(latencies, 0.5):>9.1f}"
+        f"{_percentile(latencies, 0.95):>9.1f}{_percentile(latencies, 0.99):>9.1f}"
+        f"{connections:>8}   {dict(sorted(outcomes.items()))}"
+    )
+
+
+def main(args) -> None:
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=42,
+    )
+    with running_stub(config) as base_url:
+        print(
+            f"{args.calls} calls, concurrency {args.concurrency}, stub median "
+            f"{args.latency_ms:g}ms; latency in ms"
+        )
+        print(f"{'mode':<8}{'calls/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'conns':>8}   outcomes")
+        for name in ("fresh", "single", "pooled"):
+            asyncio.run(_run(base_url, name, args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.4)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--read-timeout", type=float, default=30.0)
+    parser.add_argument("--shards", type=int, default=8)
+    main(parser.parse_args())
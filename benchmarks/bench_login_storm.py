@@ -0,0 +1,114 @@
+"""Benchmark: latency of an unrelated endpoint during a login storm.
+
+Fires concurrent logins at the in-process ASGI app and probes ``GET /health``
+every few milliseconds at the same time. It runs once with hashing inline on
+the event loop (the old behaviour, ``PASSWORD_HASH_WORKERS=0``) and once on the
+bounded pool. With the pool the probe's p99 should stay flat, and logins
+beyond the queue limit are shed with 429.
+
+Usage::
+
+    python -m benchmarks.bench_login_storm --logins 200 --concurrency 50 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import List
+
+# isort: off
+from benchmarks._env import create_schema  # sets env defaults before app imports
+
+# isort: on
+import httpx
+
+from app.core import security
+from app.core.config import settings
+from app.main import app
+
+EMAIL = "storm@example.com"
+PASSWORD = "Passw0rd!"
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _probe(client: httpx.AsyncClient, stop: asyncio.Event, samples: List[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def _storm(client: httpx.AsyncClient, logins: int, concurrency: int) -> Counter:
+    statuses: Counter = Counter()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _login() -> None:
+        async with sem:
+            r = await client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+            statuses[r.status_code] += 1
+
+    await asyncio.gather(*(_login() for _ in range(logins)))
+    return statuses
+
+
+async def _run_mode(client: httpx.AsyncClient, name: str, args) -> None:
+    security.password_hasher = security.PasswordHasher(args.workers_for[name], args.queue_limit)
+    baseline: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(client, stop, baseline))
+    await asyncio.sleep(0.5)
+    stop.set()
+    await probe
+
+    during: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(client, stop, during))
+    started = time.perf_counter()
+    statuses = await _storm(client, args.logins, args.concurrency)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    security.password_hasher.shutdown()
+
+    print(
+        f"{name:<8}{statistics.median(baseline):>10.2f}{_percentile(baseline, 0.99):>10.2f}"
+        f"{statistics.median(during):>12.2f}{_percentile(during, 0.99):>12.2f}"
+        f"{args.logins / elapsed:>10.1f}   {dict(sorted(statuses.items()))}"
+    )
+
+
+async def main(args) -> None:
+    await create_schema()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/v1/auth/register", json={"email": EMAIL, "password": PASSWORD})
+        print(
+            f"{args.logins} logins, concurrency {args.concurrency}, "
+            f"scheme {settings.PASSWORD_HASH_SCHEME}, /health latency in ms"
+        )
+        print(
+            f"{'mode':<8}{'idle p50':>10}{'idle p99':>10}{'storm p50':>12}{'storm p99':>12}"
+            f"{'login/s':>10}   statuses"
+        )
+        for name in ("inline", "pool"):
+            await _run_mode(client, name, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS or 4)
+    parser.add_argument("--queue-limit", type=int, default=settings.PASSWORD_HASH_QUEUE_LIMIT)
+    args = parser.parse_args()
+    args.workers_for = {"inline": 0, "pool": args.workers}
+    asyncio.run(main(args))
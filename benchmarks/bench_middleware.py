@@ -0,0 +1,109 @@
+"""Benchmark: requests/sec through the middleware stack, BaseHTTPMiddleware vs pure ASGI.
+
+Runs the real app in-process twice. The ``legacy`` stack rebuilds the old
+layers: the request-id middleware and a no-op ``@app.middleware("http")``,
+both on `BaseHTTPMiddleware`. The ``asgi`` stack is the current one. Both
+variants are measured on ``GET /health`` and an authenticated
+``GET /api/v1/resume/{id}``.
+
+Usage::
+
+    python -m benchmarks.bench_middleware --requests 3000 --concurrency 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+
+# isort: off
+from benchmarks._env import create_schema  # sets env defaults before app imports
+
+# isort: on
+import httpx
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.main import app
+from app.middleware.request_id import request_id_ctx
+
+
+class _LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        req_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        token = request_id_ctx.set(req_id)
+        try:
+            response = await call_next(request)
+        finally:
+            request_id_ctx.reset(token)
+        response.headers["X-Request-ID"] = req_id
+        return response
+
+
+async def _noop(request, call_next):
+    return await call_next(request)
+
+
+def _use_stack(name: str, current: list) -> None:
+    if name == "legacy":
+        # add_middleware prepends, so the list is outermost first
+        app.user_middleware = [
+            Middleware(BaseHTTPMiddleware, dispatch=_noop),
+            *[m for m in current if m.cls.__name__ != "RequestIDMiddleware"],
+            Middleware(_LegacyRequestIDMiddleware),
+        ]
+    else:
+        app.user_middleware = list(current)
+    app.middleware_stack = None  # rebuilt on the next request
+
+
+async def _throughput(client: httpx.AsyncClient, url: str, headers, total: int, conc: int):
+    remaining = total
+
+    async def _worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            r = await client.get(url, headers=headers)
+            assert r.status_code == 200 and "x-request-id" in r.headers
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(conc)))
+    return total / (time.perf_counter() - started)
+
+
+async def main(total: int, concurrency: int) -> None:
+    await create_schema()
+    current = list(app.user_middleware)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        creds = {"email": "mw@example.com", "password": "Passw0rd!"}
+        await client.post("/api/v1/auth/register", json=creds)
+        token = (await client.post("/api/v1/auth/login", json=creds)).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        r = await client.post("/api/v1/resume", headers=auth, json={"title": "CV", "content": "x"})
+        targets = {
+            "/health": ({}, "/health"),
+            "/resume/{id}": (auth, f"/api/v1/resume/{r.json()['id']}"),
+        }
+
+        print(f"{total} requests per run, concurrency {concurrency}, requests/sec")
+        print(f"{'endpoint':<16}{'legacy':>10}{'asgi':>10}{'gain':>9}")
+        for label, (headers, url) in targets.items():
+            results = {}
+            for name in ("legacy", "asgi"):
+                _use_stack(name, current)
+                await _throughput(client, url, headers, total // 10, concurrency)  # warm-up
+                results[name] = await _throughput(client, url, headers, total, concurrency)
+            gain = (results["asgi"] / results["legacy"] - 1) * 100
+            print(f"{label:<16}{results['legacy']:>10.0f}{results['asgi']:>10.0f}{gain:>8.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
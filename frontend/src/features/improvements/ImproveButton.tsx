@@ -1,6 +1,6 @@
 import { useState, useRef, useEffect } from 'react'
 import { Button, Alert } from 'react-bootstrap'
-import { enqueueImprove, getImprovement } from './api'
+import { cancelImprovement, enqueueImprove, getImprovement, waitForImprovement } from './api'
 import { getResume } from '../resumes/api'
 import { useQueryClient } from '@tanstack/react-query'
 
@@ -11,6 +11,7 @@ export function ImproveButton({ resumeId }: { resumeId: string }) {
   const [status, setStatus] = useState<'idle' | 'running' | 'error'>('idle')
   const [error, setError] = useState<string | null>(null)
   const [message, setMessage] = useState<string | null>(null)
+  const [improvementId, setImprovementId] = useState<string | null>(null)
   const isMounted = useRef(true)
   const queryClient = useQueryClient()
 
@@ -18,6 +19,37 @@ export function ImproveButton({ resumeId }: { resumeId: string }) {
     isMounted.current = false
   }, [])
 
+  // Status updates are pushed over SSE; polling is only a fallback if the stream fails
+  const watch = async (improvementId: string) => {
+    const controller = new AbortController()
+    const timer = setTimeout(() => controller.abort(), DEFAULT_TIMEOUT)
+    try {
+      const last = await waitForImprovement(
+        improvementId,
+        (e) => {
+          if (isMounted.current && e.status === 'processing') setMessage('Улучшение выполняется…')
+        },
+        controller.signal,
+      )
+      if (last.status === 'done') {
+        await queryClient.invalidateQueries({ queryKey: ['resumes:detail', resumeId] })
+        return { ok: true }
+      }
+      if (last.status === 'superseded') {
+        return { ok: false, error: 'Заменено более новым запросом на улучшение' }
+      }
+      if (last.status === 'cancelled') {
+        return { ok: false, error: 'Улучшение отменено' }
+      }
+      return { ok: false, error: last.error || 'Улучшение завершилось с ошибкой' }
+    } catch (e: any) {
+      if (controller.signal.aborted) return { ok: false, error: 'Время ожидания истекло' }
+      return poll(improvementId)
+    } finally {
+      clearTimeout(timer)
+    }
+  }
+
   const poll = async (improvementId: string) => {
     const start = Date.now()
     while (Date.now() - start < DEFAULT_TIMEOUT) {
@@ -30,6 +62,12 @@ export function ImproveButton({ resumeId }: { resumeId: string }) {
         if (detail.status === 'failed') {
           return { ok: false, error: detail.error || 'Улучшение завершилось с ошибкой' }
         }
+        if (detail.status === 'superseded') {
+          return { ok: false, error: 'Заменено более новым запросом на улучшение' }
+        }
+        if (detail.status === 'cancelled') {
+          return { ok: false, error: 'Улучшение отменено' }
+        }
       } catch (e: any) {
         return { ok: false, error: 'Ошибка получения статуса улучшения' }
       }
@@ -44,7 +82,9 @@ export function ImproveButton({ resumeId }: { resumeId: string }) {
     setMessage('Идёт улучшение…')
     try {
       const res = await enqueueImprove(resumeId)
-      const out = await poll(res.improvement_id)
+      setImprovementId(res.improvement_id)
+      const out = await watch(res.improvement_id)
+      setImprovementId(null)
       if (!isMounted.current) return
       if (out.ok) {
         setStatus('idle')
@@ -71,6 +111,15 @@ export function ImproveButton({ resumeId }: { resumeId: string }) {
     }
   }
 
+  const onCancel = async () => {
+    if (!improvementId) return
+    try {
+      await cancelImprovement(improvementId)
+    } catch (e: any) {
+      // 409: already finished, the status stream reports the outcome
+    }
+  }
+
   return (
     <div className="my-3">
       {error && (
@@ -89,5 +138,10 @@ export function ImproveButton({ resumeId }: { resumeId: string }) {
       <Button onClick={onClick} disabled={status === 'running'}>
         {status === 'running' ? 'Улучшаем…' : 'Улучшить'}
       </Button>
+      {status === 'running' && improvementId && (
+        <Button variant="outline-secondary" onClick={onCancel} className="ms-2">
+          Отменить
+        </Button>
+      )}
     </div>
   )}
@@ -1,4 +1,6 @@
 import { api } from '../../shared/utils/axios'
+import { getToken } from '../auth/auth.store'
+import { newRequestId } from '../../shared/utils/requestId'
 
 export type EnqueueImproveResponse = { improvement_id: string; status: 'queued' | 'processing' }
 export type ImprovementStatus =
@@ -6,6 +8,11 @@ export type ImprovementStatus =
   | 'processing'
   | 'done'
   | 'failed'
+  | 'superseded'
+  | 'cancelled'
+
+// Statuses after which an improvement never changes again
+export const TERMINAL_STATUSES: ImprovementStatus[] = ['done', 'failed', 'superseded', 'cancelled']
 
 export type ImprovementDetail = {
   id: string
@@ -18,6 +25,8 @@ export type ImprovementDetail = {
   created_at: string
   started_at?: string | null
   finished_at?: string | null
+  sections_total?: number | null
+  sections_done?: number | null
 }
 
 export async function enqueueImprove(resumeId: string) {
@@ -25,8 +34,61 @@ export async function enqueueImprove(resumeId: string) {
   return res.data as EnqueueImproveResponse
 }
 
+export async function cancelImprovement(id: string) {
+  const res = await api.post(`/api/v1/improvements/${id}/cancel`)
+  return res.data as { improvement_id: string; status: 'cancelled' }
+}
+
 export async function getImprovement(id: string) {
   const res = await api.get(`/api/v1/improvements/${id}`)
   return res.data as ImprovementDetail
 }
 
+
+export type ImprovementEvent = { id: string; status: ImprovementStatus; error?: string | null }
+
+/**
+ * Subscribe to the SSE status stream of an improvement.
+ * Uses fetch (not EventSource) so the Authorization header can be sent.
+ * Resolves with the terminal event; rejects if the stream is unavailable.
+ */
+export async function waitForImprovement(
+  id: string,
+  onEvent: (e: ImprovementEvent) => void,
+  signal?: AbortSignal,
+): Promise<ImprovementEvent> {
+  const headers: Record<string, string> = { Accept: 'text/event-stream', 'X-Request-ID': newRequestId() }
+  const token = getToken()
+  if (token) headers['Authorization'] = `Bearer ${token}`
+  const res = await fetch(`${api.defaults.baseURL ?? ''}/api/v1/improvements/${id}/events`, {
+    headers,
+    signal,
+  })
+  if (!res.ok || !res.body) throw new Error(`stream unavailable: ${res.status}`)
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  let last: ImprovementEvent | null = null
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += value
+    let sep
+    while ((sep = buffer.indexOf('\n\n')) >= 0) {
+      const frame = buffer.slice(0, sep)
+      buffer = buffer.slice(sep + 2)
+      const data = frame
+        .split('\n')
+        .filter((l) => l.startsWith('data: '))
+        .map((l) => l.slice(6))
+        .join('\n')
+      if (!data) continue // heartbeat
+      last = JSON.parse(data) as ImprovementEvent
+      onEvent(last)
+    }
+  }
+  if (!last || !TERMINAL_STATUSES.includes(last.status)) {
+    throw new Error('stream closed before completion')
+  }
+  return last
+}
@@ -3,9 +3,10 @@ import { api } from '../../shared/utils/axios'
 export type ResumeListItem = { id: string; title: string; created_at: string; updated_at: string }
 export type ResumeListResponse = {
   items: ResumeListItem[]
-  total: number
+  total: number // present in offset mode (the default used here)
   limit: number
   offset: number
+  next_cursor?: string | null
 }
 export type ResumeDetail = { id: string; title: string; content: string; created_at: string; updated_at: string }
 
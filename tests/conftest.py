@@ -1,5 +1,6 @@
 import os
 import tempfile
+from typing import Optional
 
 import pytest
 
@@ -46,6 +47,32 @@ def client(app_instance):
         yield c
 
 
+@pytest.fixture()
+def queued_improvement(app_instance):
+    """Create queued improvements straight in the DB, bypassing the enqueue route.
+
+    ``queued_improvement(resume_id, content, task_id=None)`` returns the new id.
+    """
+    import asyncio
+
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    async def _insert(resume_id: str, content: str, task_id) -> str:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            imp = await uow.improvements.create_queued(
+                resume_id=resume_id, old_content=content, task_id=task_id
+            )
+            await uow.commit()
+            return str(imp.id)
+
+    def _create(resume_id: str, content: str, task_id: Optional[str] = None) -> str:
+        return asyncio.get_event_loop().run_until_complete(_insert(resume_id, content, task_id))
+
+    return _create
+
+
 def register_and_login(client, email: str, password: str = "Passw0rd!"):
     r = client.post("/api/v1/auth/register", json={"email": email, "password": password})
     assert r.status_code in (201, 409)
@@ -53,3 +80,40 @@ def register_and_login(client, email: str, password: str = "Passw0rd!"):
     assert r.status_code == 200
     token = r.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+
+class QueryCounter:
+    """Collects SQL statements executed on the app engine while active."""
+
+    def __init__(self):
+        self.statements = []
+        self._active = False
+
+    def __enter__(self):
+        self.statements.clear()
+        self._active = True
+        return self
+
+    def __exit__(self, *exc):
+        self._active = False
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._active:
+            self.statements.append(statement)
+
+
+@pytest.fixture()
+def query_counter(app_instance):
+    """Count statements per request: ``with query_counter as q: client.get(...)``."""
+    from sqlalchemy import event  # noqa: WPS433
+
+    from app.db.session import engine  # noqa: WPS433
+
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter._on_execute)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter._on_execute)
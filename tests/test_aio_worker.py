@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+import uuid
+
+from kombu import Connection
+
+from tests.conftest import register_and_login
+
+
+def test_async_worker_runs_improvements_concurrently(client, monkeypatch, queued_improvement):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.celery_app.aio_worker import AsyncImprovementWorker  # noqa: WPS433
+    from app.celery_app.worker import celery_app  # noqa: WPS433
+
+    async def _fast_llm(text: str, delay_seconds: float = 0.5) -> str:
+        await asyncio.sleep(delay_seconds)
+        return f"{text} [Improved]"
+
+    monkeypatch.setattr(tasks, "_llm_improve", _fast_llm)
+
+    headers = register_and_login(client, "aio@example.com")
+    jobs = 6
+    improvement_ids = []
+
+    for i in range(jobs):
+        r = client.post("/api/v1/resume", headers=headers, json={"title": f"CV{i}", "content": "T"})
+        improvement_ids.append(queued_improvement(r.json()["id"], "Text"))
+
+    conn = Connection("memory://")
+    task_queue = celery_app.amqp.queues[celery_app.conf.task_default_queue]
+    with conn.Producer() as producer:
+        for imp_id in improvement_ids:
+            msg = celery_app.amqp.as_task_v2(
+                str(uuid.uuid4()), "improve_resume_task", args=[imp_id]
+            )
+            producer.publish(
+                msg.body,
+                headers=msg.headers,
+                serializer="json",
+                exchange=task_queue.exchange,
+                routing_key=task_queue.routing_key,
+                declare=[task_queue],
+                **msg.properties,
+            )
+
+    worker = AsyncImprovementWorker(concurrency=jobs, connection=conn, poll_interval=0.05)
+    thread = threading.Thread(target=worker.run, daemon=True)
+    started = time.monotonic()
+    thread.start()
+
+    deadline = started + 10
+    statuses = []
+    while time.monotonic() < deadline:
+        statuses = [
+            client.get(f"/api/v1/improvements/{i}", headers=headers).json()["status"]
+            for i in improvement_ids
+        ]
+        if all(s == "done" for s in statuses):
+            break
+        time.sleep(0.05)
+    elapsed = time.monotonic() - started
+
+    worker.stop()
+    thread.join(timeout=5)
+
+    assert statuses == ["done"] * jobs
+    # Sequential processing would take jobs * 0.5s; concurrent should be about one call.
+    assert elapsed < jobs * 0.5
+    assert worker.inflight == 0
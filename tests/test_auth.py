@@ -1,3 +1,6 @@
+from tests.conftest import register_and_login
+
+
 def test_register_and_login_success(client):
     email = "user1@example.com"
     r = client.post("/api/v1/auth/register", json={"email": email, "password": "S3curePass!"})
@@ -24,3 +27,159 @@ def test_login_invalid_credentials(client):
     r = client.post("/api/v1/auth/login", json={"email": "nouser@example.com", "password": "x"})
     assert r.status_code == 401
     assert r.json()["error"]["code"] == "unauthorized"
+
+
+def test_current_user_served_from_cache(client, monkeypatch):
+    from app.repositories.user import UserRepository  # noqa: WPS433
+
+    headers = register_and_login(client, "authcache@example.com")
+    assert client.get("/api/v1/resume", headers=headers).status_code == 200
+
+    async def _no_db(self, user_id):
+        raise AssertionError("user loaded from DB on a cached request")
+
+    monkeypatch.setattr(UserRepository, "get_by_id", _no_db)
+    assert client.get("/api/v1/resume", headers=headers).status_code == 200
+
+
+def test_deleted_user_is_evicted_from_cache(client):
+    import asyncio  # noqa: WPS433
+
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    headers = register_and_login(client, "authdeleted@example.com")
+    assert client.get("/api/v1/resume", headers=headers).status_code == 200
+
+    async def _delete_user():
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            user = await uow.users.get_by_email("authdeleted@example.com")
+            await session.delete(user)
+            await uow.commit()
+
+    asyncio.get_event_loop().run_until_complete(_delete_user())
+    r = client.get("/api/v1/resume", headers=headers)
+    assert r.status_code == 401
+    assert r.json()["error"]["message"] == "User not found"
+
+
+def test_repository_delete_evicts_user_from_cache(client):
+    import asyncio  # noqa: WPS433
+
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    headers = register_and_login(client, "authbulkdelete@example.com")
+    assert client.get("/api/v1/resume", headers=headers).status_code == 200
+
+    async def _delete_user() -> bool:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            user = await uow.users.get_by_email("authbulkdelete@example.com")
+            deleted = await uow.users.delete(str(user.id))
+            await uow.commit()
+            return deleted
+
+    assert asyncio.get_event_loop().run_until_complete(_delete_user())
+    r = client.get("/api/v1/resume", headers=headers)
+    assert r.status_code == 401
+
+
+def test_stateless_mode_trusts_token_claims(client, monkeypatch):
+    from app.core.auth_cache import auth_cache  # noqa: WPS433
+    from app.core.config import settings  # noqa: WPS433
+    from app.core.jwt import create_access_token  # noqa: WPS433
+
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    token = create_access_token(subject="00000000-0000-4000-8000-000000000001")
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.get("/api/v1/resume", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["items"] == []
+    auth_cache.clear()
+
+    r = client.get("/api/v1/resume", headers={"Authorization": "Bearer not-a-jwt"})
+    assert r.status_code == 401
+
+
+def test_login_upgrades_outdated_password_hash(client, monkeypatch):
+    import asyncio  # noqa: WPS433
+
+    from app.core import security  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    email = "rehash@example.com"
+    register_and_login(client, email)
+    monkeypatch.setattr(security, "pwd_context", security.build_crypt_context("argon2"))
+
+    r = client.post("/api/v1/auth/login", json={"email": email, "password": "Passw0rd!"})
+    assert r.status_code == 200
+
+    async def _stored_hash() -> str:
+        async with AsyncSessionLocal() as session:
+            user = await UnitOfWork(session).users.get_by_email(email)
+            return user.password_hash
+
+    assert asyncio.get_event_loop().run_until_complete(_stored_hash()).startswith("$argon2id$")
+    r = client.post("/api/v1/auth/login", json={"email": email, "password": "Passw0rd!"})
+    assert r.status_code == 200
+
+
+def test_password_hasher_sheds_load_when_queue_is_full():
+    import asyncio  # noqa: WPS433
+    import threading  # noqa: WPS433
+
+    import pytest  # noqa: WPS433
+
+    from app.core.security import PasswordHasher, PasswordHasherBusy  # noqa: WPS433
+
+    hasher = PasswordHasher(workers=1, queue_limit=1)
+    release = threading.Event()
+
+    async def _scenario():
+        first = asyncio.ensure_future(hasher.run(release.wait))
+        second = asyncio.ensure_future(hasher.run(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.run(release.wait)
+        release.set()
+        return await asyncio.gather(first, second)
+
+    assert asyncio.get_event_loop().run_until_complete(_scenario()) == [True, True]
+    hasher.shutdown()
+
+
+def test_login_returns_429_when_hashing_is_overloaded(client, monkeypatch):
+    from app.core import security  # noqa: WPS433
+
+    register_and_login(client, "busy@example.com")
+
+    async def _busy(fn, *args):
+        raise security.PasswordHasherBusy()
+
+    monkeypatch.setattr(security.password_hasher, "run", _busy)
+    r = client.post(
+        "/api/v1/auth/login", json={"email": "busy@example.com", "password": "Passw0rd!"}
+    )
+    assert r.status_code == 429
+    assert r.json()["error"]["code"] == "too_many_requests"
+    assert r.headers["Retry-After"] == "1"
+
+
+def test_app_shutdown_stops_the_hash_pool(app_instance):
+    import threading  # noqa: WPS433
+
+    from fastapi.testclient import TestClient  # noqa: WPS433
+
+    def _pool_threads() -> list:
+        return [t for t in threading.enumerate() if t.name.startswith("pwhash")]
+
+    with TestClient(app_instance) as client:
+        register_and_login(client, "pool@example.com")
+        assert _pool_threads()
+    assert not _pool_threads()
+
+    with TestClient(app_instance) as client:  # the next start hashes on a fresh pool
+        register_and_login(client, "pool@example.com")
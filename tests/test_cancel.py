@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+
+from tests.conftest import register_and_login
+
+
+def test_cancel_queued_improvement_revokes_task(client, monkeypatch, queued_improvement):
+    from app.celery_app import outbox  # noqa: WPS433
+    from app.repositories.outbox import OUTBOX_KIND_REVOKE  # noqa: WPS433
+
+    revoked = []
+    monkeypatch.setattr(
+        outbox,
+        "_publish_batch",
+        lambda messages: revoked.extend(
+            m.task_id for m in messages if m.kind == OUTBOX_KIND_REVOKE
+        ),
+    )
+    headers = register_and_login(client, "cancel@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "keep"})
+    resume_id = r.json()["id"]
+    imp_id = queued_improvement(resume_id, "keep", "task-cancel")
+
+    r = client.post(f"/api/v1/improvements/{imp_id}/cancel", headers=headers)
+    assert r.status_code == 200
+    assert r.json() == {"improvement_id": imp_id, "status": "cancelled"}
+    assert revoked == ["task-cancel"]
+    assert client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()["status"] == (
+        "cancelled"
+    )
+
+    r = client.post(f"/api/v1/improvements/{imp_id}/cancel", headers=headers)
+    assert r.status_code == 409
+    assert r.json()["error"]["code"] == "not_cancellable"
+
+    other = register_and_login(client, "cancel-other@example.com")
+    r = client.post(f"/api/v1/improvements/{imp_id}/cancel", headers=other)
+    assert r.status_code == 404
+
+
+def test_cancel_aborts_running_llm_call(client, monkeypatch, queued_improvement):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.db.notifications import ImprovementStatusHub  # noqa: WPS433
+
+    hubs = {}
+
+    def _fast_hub() -> ImprovementStatusHub:
+        loop = asyncio.get_running_loop()
+        return hubs.setdefault(loop, ImprovementStatusHub(poll_interval=0.05))
+
+    async def _slow_llm(text: str, delay_seconds: float = 3.0) -> str:
+        await asyncio.sleep(30)
+        return f"{text} [Improved]"
+
+    monkeypatch.setattr(tasks, "_get_status_hub", _fast_hub)
+    monkeypatch.setattr(tasks, "_llm_improve", _slow_llm)
+
+    headers = register_and_login(client, "cancel-running@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "orig"})
+    resume_id = r.json()["id"]
+    imp_id = queued_improvement(resume_id, "orig", "task-running")
+
+    worker = threading.Thread(
+        target=tasks._run_async, args=(tasks._improve_resume_task_async(imp_id),), daemon=True
+    )
+    worker.start()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        data = client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()
+        if data["status"] == "processing":
+            break
+        time.sleep(0.02)
+    assert data["status"] == "processing"
+
+    started = time.monotonic()
+    r = client.post(f"/api/v1/improvements/{imp_id}/cancel", headers=headers)
+    assert r.status_code == 200
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert time.monotonic() - started < 2
+
+    data = client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()
+    assert data["status"] == "cancelled"
+    assert data["new_content"] is None
+    assert client.get(f"/api/v1/resume/{resume_id}", headers=headers).json()["content"] == "orig"
+
+
+def test_cancel_before_finalize_leaves_resume_untouched(client, monkeypatch, queued_improvement):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.celery_app.circuit_breaker import CircuitBreaker  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    headers = register_and_login(client, "cancel-finalize@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "keep"})
+    resume_id = r.json()["id"]
+    imp_id = queued_improvement(resume_id, "keep", "task-keep")
+
+    async def _cancel_then_return(improvement_id, coro):
+        # The cancel lands after the LLM answered but before the worker finalizes
+        coro.close()
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            resume = await uow.resumes.get_by_id(resume_id)
+            await uow.improvements.cancel_owned(improvement_id, str(resume.user_id))
+            await uow.commit()
+        return "overwritten", None
+
+    monkeypatch.setattr(tasks, "_run_cancellable", _cancel_then_return)
+    monkeypatch.setattr(tasks, "llm_breaker", CircuitBreaker("llm", 5, 30, 60, enabled=False))
+    asyncio.get_event_loop().run_until_complete(tasks._improve_resume_task_async(imp_id))
+
+    data = client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()
+    assert data["status"] == "cancelled"
+    assert data["new_content"] is None
+    assert client.get(f"/api/v1/resume/{resume_id}", headers=headers).json()["content"] == "keep"
+
+
+def test_eager_cancel_then_enqueue_without_broker(client, monkeypatch, queued_improvement):
+    from kombu.exceptions import OperationalError  # noqa: WPS433
+
+    from app.celery_app.worker import celery_app  # noqa: WPS433
+
+    def _no_broker(*args, **kwargs):
+        raise OperationalError("[Errno 111] Connection refused")
+
+    monkeypatch.setattr(celery_app.control, "revoke", _no_broker)
+    headers = register_and_login(client, "cancel-eager@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "eager"})
+    resume_id = r.json()["id"]
+    imp_id = queued_improvement(resume_id, "eager", "task-eager")
+
+    # Eager mode never broadcasts the revoke, so nothing is left behind in the outbox
+    r = client.post(f"/api/v1/improvements/{imp_id}/cancel", headers=headers)
+    assert r.status_code == 200
+    r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    assert r.status_code == 202
+    data = client.get(f"/api/v1/improvements/{r.json()['improvement_id']}", headers=headers).json()
+    assert data["status"] == "done"
@@ -0,0 +1,297 @@
+import asyncio
+import time
+
+from tests.conftest import register_and_login
+
+
+def _use_db_queue(monkeypatch):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.celery_app.circuit_breaker import CircuitBreaker  # noqa: WPS433
+    from app.core.config import settings  # noqa: WPS433
+
+    async def _fast_llm(text: str) -> str:
+        await asyncio.sleep(0.2)
+        return f"{text} [Improved]"
+
+    monkeypatch.setattr(settings, "IMPROVEMENT_BACKEND", "dbqueue")
+    monkeypatch.setattr(tasks, "_llm_improve", _fast_llm)
+    monkeypatch.setattr(tasks, "llm_breaker", CircuitBreaker("llm", 5, 30, 60, enabled=False))
+
+
+def _lease_leftovers() -> None:
+    """Hide runnable jobs left by other tests so claims here only see this test's jobs."""
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    async def _lease() -> None:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            await uow.improvements.claim_batch(10_000, 3600)
+            await uow.commit()
+
+    asyncio.get_event_loop().run_until_complete(_lease())
+
+
+def _status(client, headers, imp_id: str) -> str:
+    return client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()["status"]
+
+
+def test_enqueue_writes_no_outbox_and_worker_runs_job(client, monkeypatch):
+    from app.celery_app.db_queue import DBQueueWorker  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    _use_db_queue(monkeypatch)
+    _lease_leftovers()
+    headers = register_and_login(client, "dbqueue@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "Q"})
+    resume_id = r.json()["id"]
+    imp_id = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers).json()[
+        "improvement_id"
+    ]
+    assert _status(client, headers, imp_id) == "queued"
+
+    async def _outbox_size() -> int:
+        async with AsyncSessionLocal() as session:
+            return len(await UnitOfWork(session).outbox.claim_batch(100))
+
+    loop = asyncio.get_event_loop()
+    assert loop.run_until_complete(_outbox_size()) == 0
+
+    worker = DBQueueWorker(concurrency=4)
+    assert loop.run_until_complete(worker.run_once()) == 1
+    assert loop.run_until_complete(worker.run_once()) == 0
+    assert _status(client, headers, imp_id) == "done"
+    assert client.get(f"/api/v1/resume/{resume_id}", headers=headers).json()["content"] == (
+        "Q [Improved]"
+    )
+
+
+def test_claims_are_leased_and_expired_leases_reclaimed(client, monkeypatch):
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    _use_db_queue(monkeypatch)
+    _lease_leftovers()
+    headers = register_and_login(client, "dbqueue-lease@example.com")
+    ids = set()
+    for i in range(3):
+        r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": f"L{i}"})
+        r = client.post(f"/api/v1/resume/{r.json()['id']}/improve", headers=headers)
+        ids.add(r.json()["improvement_id"])
+
+    async def _claim(limit: int, lease: float):
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            rows = await uow.improvements.claim_batch(limit, lease)
+            await uow.commit()
+            return {str(row.id): row.attempts for row in rows if str(row.id) in ids}
+
+    async def _retry_later(imp_id: str, delay: float, attempts: int) -> bool:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            found = await uow.improvements.schedule_retry(imp_id, delay, attempts)
+            await uow.commit()
+            return found
+
+    loop = asyncio.get_event_loop()
+    first = loop.run_until_complete(_claim(2, 60))
+    rest = loop.run_until_complete(_claim(10, 0.3))
+    assert len(first) == 2 and set(rest) == ids - set(first)  # leased rows are skipped
+    assert loop.run_until_complete(_claim(10, 60)) == {}
+
+    time.sleep(0.4)  # the short lease runs out: the job is visible again
+    assert loop.run_until_complete(_claim(10, 60)) == {imp_id: 2 for imp_id in rest}
+
+    async def _heartbeat(imp_id: str) -> int:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            extended = await uow.improvements.extend_leases([imp_id], 60)
+            await uow.commit()
+            return extended
+
+    retried = next(iter(first))
+    assert loop.run_until_complete(_retry_later(retried, 0.3, 1))
+    # A heartbeat racing the retry must not stretch the backoff to a full lease
+    assert loop.run_until_complete(_heartbeat(retried)) == 0
+    assert loop.run_until_complete(_claim(10, 60)) == {}
+    time.sleep(0.4)
+    assert loop.run_until_complete(_claim(10, 60)) == {retried: 2}
+
+
+def test_worker_loop_runs_jobs_concurrently_and_stops_cleanly(client, monkeypatch):
+    from app.celery_app.db_queue import DBQueueWorker  # noqa: WPS433
+    from app.db.notifications import ImprovementStatusHub  # noqa: WPS433
+
+    _use_db_queue(monkeypatch)
+    _lease_leftovers()
+    headers = register_and_login(client, "dbqueue-loop@example.com")
+    ids = []
+    for i in range(6):
+        r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": f"W{i}"})
+        r = client.post(f"/api/v1/resume/{r.json()['id']}/improve", headers=headers)
+        ids.append(r.json()["improvement_id"])
+
+    async def _run() -> float:
+        worker = DBQueueWorker(concurrency=6, batch_size=3, poll_interval=0.05)
+        started = time.monotonic()
+        worker.start()
+        hub = ImprovementStatusHub()
+        while [await hub.snapshot(imp_id) for imp_id in ids] != [
+            {"id": imp_id, "status": "done"} for imp_id in ids
+        ]:
+            await asyncio.sleep(0.05)
+        elapsed = time.monotonic() - started
+        await worker.close()
+        return elapsed
+
+    elapsed = asyncio.get_event_loop().run_until_complete(_run())
+    assert all(_status(client, headers, imp_id) == "done" for imp_id in ids)
+    assert elapsed < 6 * 0.2  # two batches of three overlap instead of running one by one
+
+
+def test_embedded_mode_runs_jobs_in_the_api_process(app_instance, monkeypatch):
+    from fastapi.testclient import TestClient  # noqa: WPS433
+
+    from app.core.config import settings  # noqa: WPS433
+
+    _use_db_queue(monkeypatch)
+    monkeypatch.setattr(settings, "IMPROVEMENT_BACKEND", "embedded")
+    _lease_leftovers()
+    with TestClient(app_instance) as client:  # the lifespan starts the embedded worker
+        headers = register_and_login(client, "embedded@example.com")
+        r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "E"})
+        resume_id = r.json()["id"]
+        r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+        imp_id = r.json()["improvement_id"]
+        deadline = time.monotonic() + 5
+        while _status(client, headers, imp_id) != "done" and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert _status(client, headers, imp_id) == "done"
+        resume = client.get(f"/api/v1/resume/{resume_id}", headers=headers).json()
+        assert resume["content"] == "E [Improved]"
+
+
+def test_embedded_shutdown_requeues_unfinished_jobs(app_instance, monkeypatch):
+    from fastapi.testclient import TestClient  # noqa: WPS433
+
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.celery_app.db_queue import DBQueueWorker  # noqa: WPS433
+    from app.core.config import settings  # noqa: WPS433
+
+    async def _slow_llm(text: str) -> str:
+        await asyncio.sleep(30)
+        return text
+
+    _use_db_queue(monkeypatch)
+    monkeypatch.setattr(settings, "IMPROVEMENT_BACKEND", "embedded")
+    monkeypatch.setattr(settings, "IMPROVEMENT_EMBEDDED_SHUTDOWN_GRACE", 0.2)
+    monkeypatch.setattr(tasks, "_llm_improve", _slow_llm)
+    _lease_leftovers()
+    with TestClient(app_instance) as client:
+        headers = register_and_login(client, "embedded-restart@example.com")
+        r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "R"})
+        resume_id = r.json()["id"]
+        r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+        imp_id = r.json()["improvement_id"]
+        deadline = time.monotonic() + 5
+        while _status(client, headers, imp_id) != "processing" and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert _status(client, headers, imp_id) == "processing"
+    # Shutdown gave up on the job and released its lease: the next worker runs it at once
+    _use_db_queue(monkeypatch)
+    assert asyncio.get_event_loop().run_until_complete(DBQueueWorker().run_once()) == 1
+    with TestClient(app_instance) as client:
+        headers = register_and_login(client, "embedded-restart@example.com")
+        assert _status(client, headers, imp_id) == "done"
+
+
+def test_claims_take_turns_between_users_and_respect_the_cap(client, monkeypatch):
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    _use_db_queue(monkeypatch)
+    _lease_leftovers()
+
+    def _enqueue(headers, content: str) -> str:
+        r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": content})
+        return client.post(f"/api/v1/resume/{r.json()['id']}/improve", headers=headers).json()[
+            "improvement_id"
+        ]
+
+    heavy_headers = register_and_login(client, "dbqueue-heavy@example.com")
+    light_headers = register_and_login(client, "dbqueue-light@example.com")
+    heavy = [_enqueue(heavy_headers, f"H{i}") for i in range(4)]
+    light = [_enqueue(light_headers, f"L{i}") for i in range(2)]
+
+    async def _claim(limit: int, **kwargs):
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            rows = await uow.improvements.claim_batch(limit, 60, **kwargs)
+            await uow.rollback()  # only look at the pick
+            return {str(row.id) for row in rows}
+
+    async def _claim_for_real(limit: int) -> None:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            await uow.improvements.claim_batch(limit, 60, fair=False)
+            await uow.commit()
+
+    loop = asyncio.get_event_loop()
+    assert loop.run_until_complete(_claim(2, fair=False)) == set(heavy[:2])  # plain FIFO
+    assert loop.run_until_complete(_claim(2)) == {heavy[0], light[0]}  # one turn each
+    assert loop.run_until_complete(_claim(4)) == {heavy[0], light[0], heavy[1], light[1]}
+
+    # Two heavy jobs are running: the light user goes next, and with a cap of two only
+    # the light user's jobs are claimable
+    loop.run_until_complete(_claim_for_real(2))
+    assert loop.run_until_complete(_claim(1)) == {light[0]}  # running jobs count as turns taken
+    assert loop.run_until_complete(_claim(10, per_user_limit=2)) == set(light)
+    assert loop.run_until_complete(_claim(10, per_user_limit=3)) == {heavy[2], *light}
+
+
+def test_concurrent_fair_claims_take_disjoint_batches(client, monkeypatch):
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    _use_db_queue(monkeypatch)
+    _lease_leftovers()
+    headers = register_and_login(client, "dbqueue-concurrent@example.com")
+    ids = set()
+    for i in range(6):
+        r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": f"C{i}"})
+        r = client.post(f"/api/v1/resume/{r.json()['id']}/improve", headers=headers)
+        ids.add(r.json()["improvement_id"])
+
+    async def _claim() -> set:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            rows = await uow.improvements.claim_batch(3, 60)
+            await uow.commit()
+            return {str(row.id) for row in rows}
+
+    async def _race():
+        return await asyncio.gather(_claim(), _claim())
+
+    first, second = asyncio.get_event_loop().run_until_complete(_race())
+    # Both claimers rank the same backlog; the second must not come back empty
+    assert len(first) == len(second) == 3
+    assert first | second == ids
+
+
+def test_fair_ranking_window_is_bounded_per_user_on_postgres():
+    from sqlalchemy import select  # noqa: WPS433
+    from sqlalchemy.dialects import postgresql  # noqa: WPS433
+
+    from app.models import ImprovementStatus, ResumeImprovement  # noqa: WPS433
+    from app.repositories.improvement import _oldest_per_user  # noqa: WPS433
+
+    runnable = ResumeImprovement.status == ImprovementStatus.queued
+    bounded = str(
+        select(_oldest_per_user(runnable, 8)).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert "JOIN LATERAL" in bounded
+    assert "LIMIT 8" in bounded
+    assert "LATERAL" not in str(select(_oldest_per_user(runnable, None)))
@@ -35,3 +35,58 @@ def test_improvement_dedup_enabled(client):
     assert r2.status_code == 409
     body = r2.json()
     assert body["error"]["code"] == "duplicate"
+
+
+def _create_resume_with_active_job(client, email: str, content: str):
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    headers = register_and_login(client, email)
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": content})
+    resume_id = r.json()["id"]
+
+    async def _create_active():
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            await uow.improvements.create_queued(resume_id=resume_id, old_content=content)
+            await uow.commit()
+
+    asyncio.get_event_loop().run_until_complete(_create_active())
+    return headers, resume_id
+
+
+def test_enqueue_statement_skips_duplicates_and_foreign_resumes(client):
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    headers, resume_id = _create_resume_with_active_job(client, "dedup-race@example.com", "Race")
+    register_and_login(client, "dedup-race-other@example.com")
+
+    async def _user_id(email: str) -> str:
+        async with AsyncSessionLocal() as session:
+            return str((await UnitOfWork(session).users.get_by_email(email)).id)
+
+    async def _enqueue(owner_id: str):
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            new_id = await uow.improvements.enqueue_owned(resume_id, owner_id, "task-x")
+            await uow.commit()
+            return new_id
+
+    loop = asyncio.get_event_loop()
+    user_id = loop.run_until_complete(_user_id("dedup-race@example.com"))
+    other_id = loop.run_until_complete(_user_id("dedup-race-other@example.com"))
+    # The index rejects the copy even if a concurrent request has already passed any check
+    assert loop.run_until_complete(_enqueue(user_id)) is None
+    assert loop.run_until_complete(_enqueue(other_id)) is None
+    r = client.get(f"/api/v1/resume/{resume_id}/improvements", headers=headers)
+    assert r.json()["total"] == 1
+
+
+def test_dedup_disabled_allows_duplicates(client, monkeypatch):
+    from app.core.config import settings  # noqa: WPS433
+
+    headers, resume_id = _create_resume_with_active_job(client, "dedup-off@example.com", "Off")
+    monkeypatch.setattr(settings, "IMPROVEMENT_DEDUP_ENABLED", False)
+    r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    assert r.status_code == 202
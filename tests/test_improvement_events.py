@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+
+from tests.conftest import register_and_login
+
+
+def _read_events(response):
+    events = []
+    for line in response.iter_lines():
+        if line.startswith("data: "):
+            events.append(json.loads(line[len("data: ") :]))
+    return events
+
+
+def test_events_stream_pushes_transitions(client, monkeypatch, queued_improvement):
+    from app.db.notifications import improvement_status_hub  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.models import ImprovementStatus  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    monkeypatch.setattr(improvement_status_hub, "poll_interval", 0.05)
+    headers = register_and_login(client, "events@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "SSE"})
+    resume_id = r.json()["id"]
+
+    async def _set_status(status: ImprovementStatus):
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            imp = await uow.improvements.get_by_id(imp_id)
+            imp.status = status
+            await uow.commit()
+
+    def _worker():
+        for status in (ImprovementStatus.processing, ImprovementStatus.done):
+            threading.Event().wait(0.3)
+            asyncio.run(_set_status(status))
+
+    imp_id = queued_improvement(resume_id, "SSE")
+    threading.Thread(target=_worker, daemon=True).start()
+
+    with client.stream("GET", f"/api/v1/improvements/{imp_id}/events", headers=headers) as r:
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/event-stream")
+        events = _read_events(r)
+
+    assert [e["status"] for e in events] == ["queued", "processing", "done"]
+    assert all(e["id"] == imp_id for e in events)
+
+
+def test_events_stream_requires_ownership(client):
+    headers_a = register_and_login(client, "events-a@example.com")
+    headers_b = register_and_login(client, "events-b@example.com")
+    r = client.post("/api/v1/resume", headers=headers_a, json={"title": "CV", "content": "Own"})
+    resume_id = r.json()["id"]
+    r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers_a)
+    imp_id = r.json()["improvement_id"]
+
+    r = client.get(f"/api/v1/improvements/{imp_id}/events", headers=headers_b)
+    assert r.status_code == 404
+
+    # Already finished: a single terminal event, then the stream closes
+    with client.stream("GET", f"/api/v1/improvements/{imp_id}/events", headers=headers_a) as r:
+        events = _read_events(r)
+    assert [e["status"] for e in events] == ["done"]
+
+
+def test_status_feed_restarts_and_resyncs_after_losing_listen(
+    client, monkeypatch, queued_improvement
+):
+    from types import SimpleNamespace  # noqa: WPS433
+
+    from app.db import notifications  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.models import ImprovementStatus  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    headers = register_and_login(client, "events-restart@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "Lost"})
+    resume_id = r.json()["id"]
+
+    async def _finish() -> None:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            imp = await uow.improvements.get_by_id(imp_id)
+            imp.status = ImprovementStatus.done
+            await uow.commit()
+
+    listens = []
+
+    async def _flaky_listen(on_payload, on_listening=None):
+        listens.append(True)
+        on_listening()
+        if len(listens) == 1:
+            await _finish()  # committed while the connection drops: its NOTIFY is lost
+            raise ConnectionError("LISTEN connection lost")
+        await asyncio.Future()
+
+    monkeypatch.setattr(notifications, "listen_improvement_status", _flaky_listen)
+    monkeypatch.setattr(
+        notifications, "engine", SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+    )
+    imp_id = queued_improvement(resume_id, "Lost")
+    hub = notifications.ImprovementStatusHub(poll_interval=0.05)
+
+    async def _next_event() -> dict:
+        queue = hub.subscribe(imp_id)
+        try:
+            return await asyncio.wait_for(queue.get(), timeout=2)
+        finally:
+            hub.unsubscribe(imp_id, queue)
+
+    event = asyncio.get_event_loop().run_until_complete(_next_event())
+    assert event == {"id": imp_id, "status": "done"}
+    assert len(listens) == 2
+
+
+def test_stream_snapshots_only_after_the_feed_listens(client, monkeypatch, queued_improvement):
+    from types import SimpleNamespace  # noqa: WPS433
+
+    from app.api.routes.improvements import _improvement_events  # noqa: WPS433
+    from app.db import notifications  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.models import ImprovementStatus  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    headers = register_and_login(client, "events-ready@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "Ready"})
+    resume_id = r.json()["id"]
+
+    async def _finish() -> None:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            imp = await uow.improvements.get_by_id(imp_id)
+            imp.status = ImprovementStatus.done
+            await uow.commit()
+
+    async def _slow_listen(on_payload, on_listening=None):
+        await _finish()  # committed before LISTEN is registered: no notification arrives
+        on_listening()
+        await asyncio.Future()
+
+    monkeypatch.setattr(notifications, "listen_improvement_status", _slow_listen)
+    monkeypatch.setattr(
+        notifications, "engine", SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+    )
+    imp_id = queued_improvement(resume_id, "Ready")
+
+    async def _collect() -> list:
+        return [frame async for frame in _improvement_events(imp_id)]
+
+    frames = asyncio.get_event_loop().run_until_complete(asyncio.wait_for(_collect(), 2))
+    assert [json.loads(f.split("data: ")[1])["status"] for f in frames] == ["done"]
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+
+def _client(transport=None, base_url="http://stub", **kwargs):
+    from app.llm import HTTPLLMClient  # noqa: WPS433
+
+    options = dict(
+        model="m",
+        prompt_version="v1",
+        max_concurrency=8,
+        max_connections=8,
+        connect_timeout=2,
+        read_timeout=5,
+    )
+    options.update(kwargs)
+    return HTTPLLMClient(base_url=base_url, transport=transport, **options)
+
+
+def test_http_client_maps_backend_responses():
+    from app.llm import LLMRequestError, LLMUnavailableError  # noqa: WPS433
+    from app.llm.stub_server import StubConfig, create_stub_app  # noqa: WPS433
+
+    loop = asyncio.get_event_loop()
+
+    ok = _client(httpx.ASGITransport(app=create_stub_app(StubConfig(latency_ms=1))))
+    assert loop.run_until_complete(ok.improve("CV")) == "CV [Improved]"
+
+    failing = _client(
+        httpx.ASGITransport(app=create_stub_app(StubConfig(latency_ms=1, error_rate=1)))
+    )
+    with pytest.raises(LLMUnavailableError):
+        loop.run_until_complete(failing.improve("CV"))
+
+    throttled = _client(
+        httpx.ASGITransport(app=create_stub_app(StubConfig(latency_ms=1, throttle_rate=1)))
+    )
+    with pytest.raises(LLMUnavailableError) as exc_info:
+        loop.run_until_complete(throttled.improve("CV"))
+    assert exc_info.value.retry_after == 1
+
+    rejecting = _client(httpx.MockTransport(lambda request: httpx.Response(400)))
+    with pytest.raises(LLMRequestError):
+        loop.run_until_complete(rejecting.improve("CV"))
+
+    for client in (ok, failing, throttled, rejecting):
+        loop.run_until_complete(client.aclose())
+
+
+def test_http_client_reuses_pooled_connections():
+    from app.llm.stub_server import StubConfig, running_stub  # noqa: WPS433
+
+    loop = asyncio.get_event_loop()
+    with running_stub(StubConfig(latency_ms=1, latency_sigma=0)) as base_url:
+        client = _client(base_url=base_url)
+
+        async def _calls() -> None:
+            for i in range(20):
+                assert await client.improve(f"t{i}") == f"t{i} [Improved]"
+            await client.aclose()
+
+        loop.run_until_complete(_calls())
+        stats = httpx.get(f"{base_url}/stats").json()
+
+    assert stats["requests"] == 20
+    assert stats["connections"] == 1
+
+
+def test_client_limits_calls_in_flight():
+    from app.llm import MockLLMClient  # noqa: WPS433
+
+    client = MockLLMClient(delay=0.1, max_concurrency=2)
+
+    async def _run() -> float:
+        started = time.monotonic()
+        results = await asyncio.gather(*(client.improve(str(i)) for i in range(6)))
+        assert results == [f"{i} [Improved]" for i in range(6)]
+        return time.monotonic() - started
+
+    assert asyncio.get_event_loop().run_until_complete(_run()) >= 0.3
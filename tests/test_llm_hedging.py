@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+
+def _scripted_client(delays, failing_text=None):
+    from app.llm import LLMClient, LLMUnavailableError  # noqa: WPS433
+
+    class _Scripted(LLMClient):
+        """Answers after the next scripted delay; records cancelled calls."""
+
+        def __init__(self):
+            super().__init__(max_concurrency=10)
+            self.delays = list(delays)
+            self.cancelled = 0
+
+        async def _improve(self, text: str) -> str:
+            try:
+                await asyncio.sleep(self.delays.pop(0))
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            if text == failing_text:
+                raise LLMUnavailableError("overloaded")
+            return f"{text} [Improved]"
+
+    return _Scripted()
+
+
+def test_slow_call_is_hedged_and_loser_cancelled():
+    from app.llm import HedgedLLMClient  # noqa: WPS433
+
+    # 20 fast calls set the p95, then a stuck call is raced by a fast hedge
+    backend = _scripted_client([0.01] * 20 + [5.0, 0.01])
+    client = HedgedLLMClient(backend, percentile=0.95, budget=1.0, min_samples=20)
+
+    async def _run() -> float:
+        for i in range(20):
+            await client.improve(str(i))
+        started = time.monotonic()
+        assert await client.improve("slow") == "slow [Improved]"
+        return time.monotonic() - started
+
+    elapsed = asyncio.get_event_loop().run_until_complete(_run())
+
+    assert elapsed < 1
+    assert backend.cancelled == 1
+    assert client.stats.calls == 21
+    assert client.stats.hedged == 1 and client.stats.hedge_wins == 1
+    assert client.stats.win_rate == 1.0
+
+
+def test_hedging_respects_budget():
+    from app.llm import HedgedLLMClient  # noqa: WPS433
+
+    backend = _scripted_client([0.01] * 20 + [0.2] * 4)
+    client = HedgedLLMClient(backend, percentile=0.5, budget=0.0, min_samples=20)
+
+    async def _run() -> None:
+        for i in range(24):
+            await client.improve(str(i))
+
+    asyncio.get_event_loop().run_until_complete(_run())
+
+    assert client.stats.hedged == 0
+    assert backend.cancelled == 0
+
+
+def test_primary_error_waits_for_hedge():
+    from app.llm import HedgedLLMClient  # noqa: WPS433
+
+    primary = _scripted_client([0.01] * 20 + [0.1], failing_text="fail")
+    alternate = _scripted_client([0.2])  # answers after the primary has failed
+    client = HedgedLLMClient(
+        primary, percentile=0.5, budget=1.0, min_samples=20, alternate=alternate
+    )
+
+    async def _run() -> str:
+        for i in range(20):
+            await client.improve(str(i))
+        return await client.improve("fail")
+
+    assert asyncio.get_event_loop().run_until_complete(_run()) == "fail [Improved]"
+    assert client.stats.hedge_wins == 1
@@ -0,0 +1,105 @@
+import asyncio
+
+from tests.conftest import register_and_login
+
+
+def test_enqueue_writes_outbox_and_relay_publishes(client, monkeypatch):
+    from app.celery_app import outbox  # noqa: WPS433
+
+    published = []
+    monkeypatch.setattr(
+        outbox,
+        "_publish_batch",
+        lambda messages: published.extend((str(m.improvement_id), m.task_id) for m in messages),
+    )
+
+    headers = register_and_login(client, "outbox@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "Outbox"})
+    resume_id = r.json()["id"]
+
+    r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    assert r.status_code == 202
+    imp_id = r.json()["improvement_id"]
+
+    # Eager mode relays inline; the message was published once and removed
+    assert [p[0] for p in published] == [imp_id]
+    assert published[0][1]
+    assert asyncio.get_event_loop().run_until_complete(outbox.outbox_relay.drain_once()) == 0
+
+
+def test_relay_keeps_messages_when_publish_fails(client, monkeypatch):
+    from app.celery_app import outbox  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.repositories.outbox import OUTBOX_KIND_ENQUEUE  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    headers = register_and_login(client, "outbox-fail@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "Fail"})
+    resume_id = r.json()["id"]
+
+    async def _create_with_message() -> str:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            imp = await uow.improvements.create_queued(
+                resume_id=resume_id, old_content="Fail", task_id="task-1"
+            )
+            await uow.outbox.add(OUTBOX_KIND_ENQUEUE, str(imp.id), "task-1")
+            await uow.commit()
+            return str(imp.id)
+
+    def _broker_down(messages):
+        raise ConnectionError("broker unavailable")
+
+    loop = asyncio.get_event_loop()
+    imp_id = loop.run_until_complete(_create_with_message())
+    relay = outbox.OutboxRelay(batch_size=10)
+
+    monkeypatch.setattr(outbox, "_publish_batch", _broker_down)
+    try:
+        loop.run_until_complete(relay.drain_once())
+    except ConnectionError:
+        pass
+
+    published = []
+    monkeypatch.setattr(
+        outbox,
+        "_publish_batch",
+        lambda messages: published.extend(str(m.improvement_id) for m in messages),
+    )
+    assert loop.run_until_complete(relay.drain_once()) == 1
+    assert published == [imp_id]
+
+
+def test_enqueue_succeeds_when_inline_relay_fails(client, monkeypatch):
+    from app.celery_app import outbox  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    def _broker_down(messages):
+        raise ConnectionError("broker unavailable")
+
+    monkeypatch.setattr(outbox, "_publish_batch", _broker_down)
+    headers = register_and_login(client, "outbox-inline-fail@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "Later"})
+    r = client.post(f"/api/v1/resume/{r.json()['id']}/improve", headers=headers)
+    # The job and its message are committed: the client gets 202, the relay retries later
+    assert r.status_code == 202
+    imp_id = r.json()["improvement_id"]
+    assert client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()["status"] == (
+        "queued"
+    )
+
+    async def _pending() -> list:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            ids = [str(m.improvement_id) for m in await uow.outbox.claim_batch(1000)]
+            await uow.rollback()
+            return ids
+
+    loop = asyncio.get_event_loop()
+    assert imp_id in loop.run_until_complete(_pending())
+
+    published = []
+    monkeypatch.setattr(outbox, "_publish_batch", lambda messages: published.extend(messages))
+    loop.run_until_complete(outbox.outbox_relay.drain_once())
+    assert imp_id not in loop.run_until_complete(_pending())
@@ -0,0 +1,69 @@
+from tests.conftest import register_and_login
+
+
+def test_resume_keyset_pagination(client):
+    headers = register_and_login(client, "pages@example.com")
+    created = []
+    for i in range(5):
+        r = client.post(
+            "/api/v1/resume", headers=headers, json={"title": f"CV {i}", "content": "x"}
+        )
+        created.append(r.json()["id"])
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/api/v1/resume", headers=headers, params=params)
+        assert r.status_code == 200
+        body = r.json()
+        seen.extend(item["id"] for item in body["items"])
+        pages += 1
+        if cursor:
+            assert body["total"] is None  # no COUNT(*) in cursor mode by default
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert seen == list(reversed(created))
+
+    # Offset mode stays compatible and counts the total
+    r = client.get("/api/v1/resume", headers=headers, params={"limit": 2, "offset": 4})
+    body = r.json()
+    assert body["total"] == 5
+    assert [i["id"] for i in body["items"]] == [created[0]]
+    assert body["next_cursor"] is None
+
+    r = client.get(
+        "/api/v1/resume", headers=headers, params={"cursor": cursor or "x", "include_total": True}
+    )
+    assert r.status_code == 400
+    assert r.json()["error"]["code"] == "invalid_cursor"
+
+
+def test_improvement_keyset_pagination(client):
+    headers = register_and_login(client, "imp-pages@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "P"})
+    resume_id = r.json()["id"]
+    for _ in range(3):
+        r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+        assert r.status_code == 202
+
+    r = client.get(f"/api/v1/resume/{resume_id}/improvements", headers=headers, params={"limit": 2})
+    first = r.json()
+    assert first["total"] == 3 and len(first["items"]) == 2 and first["next_cursor"]
+
+    r = client.get(
+        f"/api/v1/resume/{resume_id}/improvements",
+        headers=headers,
+        params={"limit": 2, "cursor": first["next_cursor"], "include_total": True},
+    )
+    second = r.json()
+    assert second["total"] == 3
+    assert len(second["items"]) == 1 and second["next_cursor"] is None
+    ids = [i["id"] for i in first["items"] + second["items"]]
+    assert len(set(ids)) == 3
@@ -0,0 +1,105 @@
+import asyncio
+
+from tests.conftest import register_and_login
+
+
+def test_writes_are_single_statements(client, query_counter):
+    headers = register_and_login(client, "queries@example.com")
+    client.get("/api/v1/resume", headers=headers)  # warm the auth cache
+
+    with query_counter as q:
+        r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "A"})
+    assert r.status_code == 201
+    assert r.json()["created_at"] and r.json()["updated_at"]
+    assert q.count == 1, q.statements
+    assert "RETURNING" in q.statements[0]
+    resume_id = r.json()["id"]
+
+    with query_counter as q:
+        r = client.get(f"/api/v1/resume/{resume_id}", headers=headers)
+    assert r.status_code == 200
+    assert q.count == 1, q.statements
+
+    with query_counter as q:
+        r = client.put(
+            f"/api/v1/resume/{resume_id}", headers=headers, json={"title": "CV", "content": "B"}
+        )
+    assert r.status_code == 200
+    assert r.json()["content"] == "B"
+    assert q.count == 1, q.statements
+    assert "RETURNING" in q.statements[0]
+
+    with query_counter as q:
+        r = client.delete(f"/api/v1/resume/{resume_id}", headers=headers)
+    assert r.status_code == 204
+    assert q.count == 1, q.statements
+
+    with query_counter as q:
+        r = client.delete(f"/api/v1/resume/{resume_id}", headers=headers)
+    assert r.status_code == 404
+    assert q.count == 1, q.statements
+
+
+def test_register_is_lookup_plus_insert(client, query_counter):
+    with query_counter as q:
+        r = client.post(
+            "/api/v1/auth/register",
+            json={"email": "queries-reg@example.com", "password": "Passw0rd!"},
+        )
+    assert r.status_code == 201
+    assert r.json()["created_at"]
+    assert q.count == 2, q.statements
+
+
+def test_enqueue_is_one_guarded_insert(client, query_counter, monkeypatch):
+    from app.core.config import settings  # noqa: WPS433
+
+    monkeypatch.setattr(settings, "CELERY_TASK_ALWAYS_EAGER", False)  # no inline relay
+    headers = register_and_login(client, "queries-enqueue@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "A"})
+    resume_id = r.json()["id"]
+
+    with query_counter as q:
+        r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    assert r.status_code == 202
+    # INSERT ... SELECT (ownership + dedup), supersede older queued jobs, outbox message
+    assert q.count == 3, q.statements
+    assert q.statements[0].lstrip().startswith("INSERT INTO resumeimprovement")
+    assert "ON CONFLICT DO NOTHING" in q.statements[0]
+
+    monkeypatch.setattr(settings, "IMPROVEMENT_SUPERSEDE_ENABLED", False)
+    with query_counter as q:
+        r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    assert r.status_code == 409
+    assert q.count == 2, q.statements  # the no-op insert, then the 404-vs-409 probe
+
+
+def test_worker_claims_and_finalizes_without_selects(client, query_counter, monkeypatch):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.celery_app.circuit_breaker import CircuitBreaker  # noqa: WPS433
+    from app.core.config import settings  # noqa: WPS433
+
+    async def _fast_llm(text: str) -> str:
+        return text + " (improved)"
+
+    monkeypatch.setattr(settings, "CELERY_TASK_ALWAYS_EAGER", False)
+    monkeypatch.setattr(tasks, "_llm_improve", _fast_llm)
+    monkeypatch.setattr(tasks, "llm_breaker", CircuitBreaker("llm", 5, 30, 60, enabled=False))
+    headers = register_and_login(client, "queries-worker@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "W"})
+    resume_id = r.json()["id"]
+    imp_id = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers).json()[
+        "improvement_id"
+    ]
+
+    with query_counter as q:
+        asyncio.get_event_loop().run_until_complete(tasks._improve_resume_task_async(imp_id))
+    # Claim, section memo lookup, then the two guarded UPDATEs of finalize
+    writes = [s for s in q.statements if "resumeimprovement" in s or "UPDATE resume " in s]
+    assert len(writes) == 4, q.statements
+    assert writes[0].lstrip().startswith("UPDATE resumeimprovement")
+    assert "RETURNING" in writes[0]
+    assert not [s for s in writes if s.lstrip().startswith("SELECT resumeimprovement.id")]
+    assert client.get(f"/api/v1/resume/{resume_id}", headers=headers).json()["content"] == (
+        "W (improved)"
+    )
@@ -0,0 +1,37 @@
+import uuid
+
+
+def test_request_id_is_echoed(client):
+    r = client.get("/health", headers={"X-Request-ID": "req-123"})
+    assert r.status_code == 200
+    assert r.headers["X-Request-ID"] == "req-123"
+
+
+def test_request_id_is_generated_for_every_response(client):
+    r = client.get("/health")
+    uuid.UUID(r.headers["X-Request-ID"])
+
+    r = client.get("/api/v1/resume")
+    assert r.status_code == 401
+    uuid.UUID(r.headers["X-Request-ID"])
+
+
+def test_request_id_visible_to_log_context(client):
+    import logging  # noqa: WPS433
+
+    from app.middleware.request_id import get_request_id  # noqa: WPS433
+
+    seen = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            seen.append(get_request_id())
+
+    handler = _Capture()
+    logger = logging.getLogger("app.api.error_handlers")
+    logger.addHandler(handler)
+    try:
+        client.get("/api/v1/resume", headers={"X-Request-ID": "ctx-1"})
+    finally:
+        logger.removeHandler(handler)
+    assert seen == ["ctx-1"]
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+from tests.conftest import register_and_login
+
+
+def test_memory_backend_lru_and_ttl():
+    from app.celery_app.result_cache import MemoryLRUBackend  # noqa: WPS433
+
+    backend = MemoryLRUBackend(max_entries=2, ttl=60)
+    backend.set("a", "A")
+    backend.set("b", "B")
+    assert backend.get("a") == "A"  # "a" becomes most recently used
+    backend.set("c", "C")
+    assert backend.get("b") is None
+    assert backend.get("a") == "A" and backend.get("c") == "C"
+
+    short = MemoryLRUBackend(max_entries=2, ttl=0.01)
+    short.set("a", "A")
+    time.sleep(0.02)
+    assert short.get("a") is None
+
+
+def test_sqlite_backend_shared_between_instances(tmp_path):
+    from app.celery_app.result_cache import SQLiteBackend  # noqa: WPS433
+
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SQLiteBackend(path, max_entries=2, ttl=60)
+    reader = SQLiteBackend(path, max_entries=2, ttl=60)
+    writer.set("a", "A")
+    assert reader.get("a") == "A"
+
+    writer.set("b", "B")
+    writer.set("c", "C")
+    assert reader.get("a") is None  # trimmed to max_entries, LRU first
+    assert reader.get("c") == "C"
+    writer.close()
+    reader.close()
+
+
+def test_sqlite_backend_reads_do_not_write(tmp_path):
+    from app.celery_app.result_cache import SQLiteBackend  # noqa: WPS433
+
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SQLiteBackend(path, max_entries=2, ttl=60)
+    backend.set("a", "A")
+    backend.set("b", "B")
+    changes = backend._conn.total_changes
+    for _ in range(10):
+        assert backend.get("a") == "A"
+    assert backend._conn.total_changes == changes  # access times wait in memory
+
+    backend.set("c", "C")  # flushes them first, so "a" counts as recently used
+    assert backend.get("a") == "A"
+    assert backend.get("b") is None
+    backend.close()
+
+
+def test_cache_key_depends_on_model_and_prompt_version():
+    from app.celery_app.result_cache import ImprovementResultCache, NullBackend  # noqa: WPS433
+
+    a = ImprovementResultCache(NullBackend(), model="m1", prompt_version="v1")
+    b = ImprovementResultCache(NullBackend(), model="m1", prompt_version="v2")
+    assert a.key_for("text") == a.key_for("text")
+    assert a.key_for("text") != b.key_for("text")
+
+
+def test_cache_hit_finalizes_without_llm(client, monkeypatch):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.celery_app.result_cache import get_result_cache  # noqa: WPS433
+
+    cache = get_result_cache()
+    asyncio.get_event_loop().run_until_complete(cache.put("Cached text", "Cached text [Cached]"))
+
+    async def _llm_must_not_run(text: str, delay_seconds: float = 3.0) -> str:
+        raise AssertionError("LLM called on cache hit")
+
+    monkeypatch.setattr(tasks, "_llm_improve", _llm_must_not_run)
+
+    headers = register_and_login(client, "cache@example.com")
+    r = client.post(
+        "/api/v1/resume", headers=headers, json={"title": "CV", "content": "Cached text"}
+    )
+    resume_id = r.json()["id"]
+    hits_before = cache.stats.hits
+
+    r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    assert r.status_code == 202
+    imp_id = r.json()["improvement_id"]
+
+    r = client.get(f"/api/v1/improvements/{imp_id}", headers=headers)
+    data = r.json()
+    assert data["status"] == "done"
+    assert data["new_content"] == "Cached text [Cached]"
+    assert cache.stats.hits == hits_before + 1
+
+
+def test_cache_hit_keeps_section_results(client, monkeypatch):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.celery_app.result_cache import get_result_cache  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    sections = {"memo-key": "Sectioned [Improved]"}
+    cache = get_result_cache()
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(cache.put("Sectioned", "Sectioned [Improved]"))
+    loop.run_until_complete(cache.put_sections("Sectioned", sections))
+
+    async def _llm_must_not_run(text: str, delay_seconds: float = 3.0) -> str:
+        raise AssertionError("LLM called on cache hit")
+
+    monkeypatch.setattr(tasks, "_llm_improve", _llm_must_not_run)
+
+    headers = register_and_login(client, "cache-sections@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "Sectioned"})
+    resume_id = r.json()["id"]
+    r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    assert r.status_code == 202
+
+    async def _memo():
+        async with AsyncSessionLocal() as session:
+            return await UnitOfWork(session).improvements.last_section_results(resume_id)
+
+    assert loop.run_until_complete(_memo()) == sections
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from tests.conftest import register_and_login
+
+
+def test_decide_retry_classifies_errors():
+    from app.celery_app.circuit_breaker import CircuitOpen  # noqa: WPS433
+    from app.celery_app.retry_policy import decide_retry  # noqa: WPS433
+
+    assert decide_retry(ValueError("bad input"), 0, 3) is None
+    assert decide_retry(KeyError("resume"), 0, 3) is None
+
+    decision = decide_retry(ConnectionError("reset"), 1, 3)
+    assert decision is not None and decision.retries == 2
+    assert decide_retry(TimeoutError(), 3, 3) is None
+
+    parked = decide_retry(CircuitOpen("llm", 10.0), 3, 3)
+    assert parked is not None and parked.retries == 3 and parked.countdown >= 10.0
+    assert decide_retry(CircuitOpen("llm", 10.0), 3, 3, can_park=False) is None
+
+
+def test_circuit_breaker_opens_probes_and_closes(app_instance):
+    from app.celery_app.circuit_breaker import CircuitBreaker, CircuitOpen  # noqa: WPS433
+
+    breaker = CircuitBreaker("test-cycle", failure_threshold=2, cooldown=0.3, probe_timeout=5)
+    loop = asyncio.get_event_loop()
+
+    permit = loop.run_until_complete(breaker.acquire())
+    loop.run_until_complete(breaker.record_failure(permit))
+    permit = loop.run_until_complete(breaker.acquire())  # one failure: still closed
+    assert permit.failures == 1 and not permit.probe
+    loop.run_until_complete(breaker.record_failure(permit))
+
+    with pytest.raises(CircuitOpen):
+        loop.run_until_complete(breaker.acquire())
+
+    time.sleep(0.35)
+    probe = loop.run_until_complete(breaker.acquire())
+    assert probe.probe
+    with pytest.raises(CircuitOpen):
+        loop.run_until_complete(breaker.acquire())  # only one probe at a time
+
+    loop.run_until_complete(breaker.record_success(probe))
+    permit = loop.run_until_complete(breaker.acquire())
+    assert permit == type(permit)(probe=False, failures=0)
+
+
+def test_straggler_failure_keeps_the_probe_lease(app_instance):
+    from app.celery_app.circuit_breaker import CircuitBreaker, CircuitOpen  # noqa: WPS433
+
+    breaker = CircuitBreaker("test-straggler", failure_threshold=1, cooldown=0.3, probe_timeout=5)
+    loop = asyncio.get_event_loop()
+
+    straggler = loop.run_until_complete(breaker.acquire())  # in flight while the breaker trips
+    loop.run_until_complete(breaker.record_failure(loop.run_until_complete(breaker.acquire())))
+    time.sleep(0.35)
+    probe = loop.run_until_complete(breaker.acquire())
+    assert probe.probe
+
+    # The straggler fails mid-probe: it re-opens the breaker but must not free the lease
+    loop.run_until_complete(breaker.record_failure(straggler))
+    time.sleep(0.35)
+    with pytest.raises(CircuitOpen):
+        loop.run_until_complete(breaker.acquire())
+
+    loop.run_until_complete(breaker.record_failure(probe))  # a failed probe does free it
+    time.sleep(0.35)
+    assert loop.run_until_complete(breaker.acquire()).probe
+
+
+def test_permanent_error_fails_on_first_attempt(client, monkeypatch, queued_improvement):
+    from app.celery_app import tasks  # noqa: WPS433
+
+    calls = []
+
+    async def _rejecting_llm(text: str, delay_seconds: float = 3.0) -> str:
+        calls.append(text)
+        raise ValueError("prompt rejected")
+
+    monkeypatch.setattr(tasks, "_llm_improve", _rejecting_llm)
+    headers = register_and_login(client, "permanent@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "bad"})
+    imp_id = queued_improvement(r.json()["id"], "bad")
+
+    tasks.improve_resume_task.apply(args=[imp_id])
+
+    assert calls == ["bad"]
+    data = client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()
+    assert data["status"] == "failed"
+    assert data["error"] == "prompt rejected"
+
+
+def test_open_circuit_parks_job_without_calling_llm(client, monkeypatch, queued_improvement):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.celery_app.circuit_breaker import CircuitBreaker, CircuitOpen  # noqa: WPS433
+
+    calls = []
+
+    async def _down_llm(text: str, delay_seconds: float = 3.0) -> str:
+        calls.append(text)
+        raise ConnectionError("backend down")
+
+    breaker = CircuitBreaker("test-park", failure_threshold=1, cooldown=30, probe_timeout=5)
+    monkeypatch.setattr(tasks, "llm_breaker", breaker)
+    monkeypatch.setattr(tasks, "_llm_improve", _down_llm)
+    headers = register_and_login(client, "park@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "x"})
+    resume_id = r.json()["id"]
+    first, second = queued_improvement(resume_id, "one"), queued_improvement(resume_id, "two")
+
+    loop = asyncio.get_event_loop()
+    with pytest.raises(ConnectionError):
+        loop.run_until_complete(tasks._improve_resume_task_async(first))
+    with pytest.raises(CircuitOpen) as exc_info:
+        loop.run_until_complete(tasks._improve_resume_task_async(second))
+
+    assert calls == ["one"]
+    assert 0 < exc_info.value.retry_after <= 30
+    data = client.get(f"/api/v1/improvements/{second}", headers=headers).json()
+    assert data["status"] == "queued"
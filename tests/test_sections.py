@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+from tests.conftest import register_and_login
+
+RESUME = (
+    "Иван Иванов\nBackend developer\n\n"
+    "## Опыт\n- FastAPI\n- Postgres\n\n\n"
+    "## Навыки\nPython, SQL\n"
+    "# Образование\nМГУ\n"
+)
+
+
+def test_split_sections_roundtrip_and_boundaries():
+    from app.celery_app.sections import join_sections, split_sections  # noqa: WPS433
+
+    for text in (RESUME, "", "\n\nlead", "tail\n\n", "a\n\n\n\nb", "# a\n# b\n"):
+        sections = split_sections(text)
+        assert join_sections([s.body for s in sections], sections) == text
+
+    bodies = [s.body for s in split_sections(RESUME)]
+    assert bodies == [
+        "Иван Иванов\nBackend developer",
+        "## Опыт\n- FastAPI\n- Postgres",
+        "## Навыки\nPython, SQL",
+        "# Образование\nМГУ",
+    ]
+    # Short blocks merge forward, but never swallow a heading
+    merged = split_sections("a\n\nb\n\nc\n\n## H\nd", min_chars=5)
+    assert [s.body for s in merged] == ["a\n\nb\n\nc", "## H\nd"]
+
+
+def test_improve_sections_runs_concurrently_in_order():
+    from app.celery_app.sections import improve_sections, split_sections  # noqa: WPS433
+
+    async def _slow_improve(text: str) -> str:
+        await asyncio.sleep(0.2)
+        return text.upper()
+
+    progress = []
+
+    async def _on_progress(done: int) -> None:
+        progress.append(done)
+
+    sections = split_sections(RESUME)
+    started = time.perf_counter()
+    bodies = asyncio.get_event_loop().run_until_complete(
+        improve_sections(sections, _slow_improve, concurrency=8, on_progress=_on_progress)
+    )
+    assert time.perf_counter() - started < 0.6  # ~one section, not the sum of four
+    assert bodies == [s.body.upper() for s in sections]
+    assert progress == [1, 2, 3, 4]
+
+
+def test_long_resume_is_improved_per_section(client, monkeypatch):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.core.config import settings  # noqa: WPS433
+
+    calls = []
+
+    async def _fast_llm(text: str, delay_seconds: float = 3.0) -> str:
+        calls.append(text)
+        return f"{text} [Improved]"
+
+    monkeypatch.setattr(tasks, "_llm_improve", _fast_llm)
+    monkeypatch.setattr(settings, "IMPROVEMENT_SECTION_THRESHOLD", 10)
+    monkeypatch.setattr(settings, "IMPROVEMENT_SECTION_MIN_CHARS", 0)
+
+    headers = register_and_login(client, "sections@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": RESUME})
+    resume_id = r.json()["id"]
+    r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    imp_id = r.json()["improvement_id"]
+
+    data = client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()
+    assert data["status"] == "done"
+    assert len(calls) == 4
+    assert data["sections_total"] == 4 and data["sections_done"] == 4
+    assert data["new_content"] == (
+        "Иван Иванов\nBackend developer [Improved]\n\n"
+        "## Опыт\n- FastAPI\n- Postgres [Improved]\n\n\n"
+        "## Навыки\nPython, SQL [Improved]\n"
+        "# Образование\nМГУ [Improved]\n"
+    )
+
+
+def test_reimprovement_only_sends_changed_sections(client, monkeypatch):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.core.config import settings  # noqa: WPS433
+
+    calls = []
+
+    async def _fast_llm(text: str, delay_seconds: float = 3.0) -> str:
+        calls.append(text)
+        return f"{text} [Improved]"
+
+    monkeypatch.setattr(tasks, "_llm_improve", _fast_llm)
+    monkeypatch.setattr(settings, "IMPROVEMENT_SECTION_THRESHOLD", 10)
+    monkeypatch.setattr(settings, "IMPROVEMENT_SECTION_MIN_CHARS", 0)
+
+    headers = register_and_login(client, "incremental@example.com")
+    original = "# Incremental\nAnna\n\n## Jobs\nACME\n\n## Skills\nGo"
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": original})
+    resume_id = r.json()["id"]
+    client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    assert len(calls) == 3
+
+    # The user edits one section of the improved resume and improves again
+    improved = client.get(f"/api/v1/resume/{resume_id}", headers=headers).json()["content"]
+    edited = improved.replace("Go [Improved]", "Go, Rust")
+    client.put(
+        f"/api/v1/resume/{resume_id}", headers=headers, json={"title": "CV", "content": edited}
+    )
+    calls.clear()
+    r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    data = client.get(f"/api/v1/improvements/{r.json()['improvement_id']}", headers=headers).json()
+
+    assert calls == ["## Skills\nGo, Rust"]
+    assert data["new_content"] == (
+        "# Incremental\nAnna [Improved]\n\n## Jobs\nACME [Improved]\n\n"
+        "## Skills\nGo, Rust [Improved]"
+    )
@@ -0,0 +1,90 @@
+import asyncio
+
+from tests.conftest import register_and_login
+
+
+def test_new_request_supersedes_queued_and_revokes(client, monkeypatch, queued_improvement):
+    from app.celery_app import outbox  # noqa: WPS433
+    from app.repositories.outbox import OUTBOX_KIND_REVOKE  # noqa: WPS433
+
+    revoked = []
+    publish = outbox._publish_batch
+
+    def _recording_publish(messages):
+        revoked.extend(m.task_id for m in messages if m.kind == OUTBOX_KIND_REVOKE)
+        publish(messages)
+
+    monkeypatch.setattr(outbox, "_publish_batch", _recording_publish)
+    headers = register_and_login(client, "supersede@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "v3"})
+    resume_id = r.json()["id"]
+    old_ids = [
+        queued_improvement(resume_id, "v1", "task-v1"),
+        queued_improvement(resume_id, "v2", "task-v2"),
+    ]
+
+    r = client.post(f"/api/v1/resume/{resume_id}/improve", headers=headers)
+    assert r.status_code == 202
+    new_id = r.json()["improvement_id"]
+
+    for imp_id in old_ids:
+        data = client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()
+        assert data["status"] == "superseded"
+        assert data["new_content"] is None
+    assert sorted(revoked) == ["task-v1", "task-v2"]
+    assert client.get(f"/api/v1/improvements/{new_id}", headers=headers).json()["status"] == "done"
+
+
+def test_worker_skips_superseded_job_without_llm(client, monkeypatch, queued_improvement):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    headers = register_and_login(client, "supersede-skip@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "skip"})
+    resume_id = r.json()["id"]
+    imp_id = queued_improvement(resume_id, "stale", "task-stale")
+
+    async def _supersede():
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            await uow.improvements.supersede_queued(resume_id)
+            await uow.commit()
+
+    async def _llm_must_not_run(text: str, delay_seconds: float = 3.0) -> str:
+        raise AssertionError("LLM called for a superseded job")
+
+    monkeypatch.setattr(tasks, "_llm_improve", _llm_must_not_run)
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(_supersede())
+    loop.run_until_complete(tasks._improve_resume_task_async(imp_id))
+
+    data = client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()
+    assert data["status"] == "superseded"
+    assert client.get(f"/api/v1/resume/{resume_id}", headers=headers).json()["content"] == "skip"
+
+
+def test_second_delivery_of_a_running_job_is_not_claimed(client, queued_improvement):
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    headers = register_and_login(client, "double-delivery@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "once"})
+    imp_id = queued_improvement(r.json()["id"], "once", "task-once")
+
+    async def _start(lease: float, attempt=None) -> bool:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            claimed = await uow.improvements.start_processing(imp_id, lease, attempt)
+            await uow.commit()
+            return claimed is not None
+
+    loop = asyncio.get_event_loop()
+    assert loop.run_until_complete(_start(60))
+    assert not loop.run_until_complete(_start(60))  # redelivered while the original runs
+    assert loop.run_until_complete(_start(60, attempt=0))  # the lease holder's own attempt
+    assert not loop.run_until_complete(_start(60, attempt=1))
+
+    imp_id = queued_improvement(r.json()["id"], "crashed", "task-crashed")
+    assert loop.run_until_complete(_start(0))  # its worker dies; the lease runs out at once
+    assert loop.run_until_complete(_start(60))  # so the redelivered message takes it over
@@ -0,0 +1,81 @@
+import asyncio
+import signal
+
+import pytest
+
+from tests.conftest import register_and_login
+
+
+def test_llm_stage_deadline_cancels_call(client, monkeypatch):
+    from app.celery_app import tasks  # noqa: WPS433
+    from app.celery_app.circuit_breaker import CircuitBreaker  # noqa: WPS433
+    from app.core.config import settings  # noqa: WPS433
+    from app.db.session import AsyncSessionLocal  # noqa: WPS433
+    from app.uow import UnitOfWork  # noqa: WPS433
+
+    cancelled = []
+
+    async def _hanging_llm(text: str, delay_seconds: float = 3.0) -> str:
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append(text)
+            raise
+        return text
+
+    monkeypatch.setattr(tasks, "_llm_improve", _hanging_llm)
+    monkeypatch.setattr(settings, "IMPROVEMENT_LLM_TIMEOUT", 0.2)
+    monkeypatch.setattr(tasks, "llm_breaker", CircuitBreaker("llm", 5, 30, 60, enabled=False))
+
+    headers = register_and_login(client, "deadline@example.com")
+    r = client.post("/api/v1/resume", headers=headers, json={"title": "CV", "content": "slow"})
+    resume_id = r.json()["id"]
+
+    async def _create() -> str:
+        async with AsyncSessionLocal() as session:
+            uow = UnitOfWork(session)
+            imp = await uow.improvements.create_queued(resume_id=resume_id, old_content="slow")
+            await uow.commit()
+            return str(imp.id)
+
+    loop = asyncio.get_event_loop()
+    imp_id = loop.run_until_complete(_create())
+    with pytest.raises(tasks.ImprovementStageTimeout) as exc_info:
+        loop.run_until_complete(tasks._improve_resume_task_async(imp_id))
+
+    assert exc_info.value.stage == "llm"
+    assert cancelled == ["slow"]
+    # Back to queued so the Celery retry can claim it
+    assert client.get(f"/api/v1/improvements/{imp_id}", headers=headers).json()["status"] == (
+        "queued"
+    )
+    assert client.get(f"/api/v1/resume/{resume_id}", headers=headers).json()["content"] == "slow"
+
+
+def test_soft_time_limit_cancels_coroutine_before_returning():
+    from celery.exceptions import SoftTimeLimitExceeded  # noqa: WPS433
+
+    from app.celery_app import tasks  # noqa: WPS433
+
+    cleaned_up = []
+
+    async def _stuck() -> None:
+        try:
+            await asyncio.sleep(30)
+        finally:
+            await asyncio.sleep(0.1)  # e.g. returning a DB connection
+            cleaned_up.append(True)
+
+    def _raise_soft_limit(signum, frame):
+        raise SoftTimeLimitExceeded()
+
+    previous = signal.signal(signal.SIGALRM, _raise_soft_limit)
+    signal.setitimer(signal.ITIMER_REAL, 0.2)
+    try:
+        with pytest.raises(SoftTimeLimitExceeded):
+            tasks._run_async(_stuck())
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+    assert cleaned_up == [True]